@@ -0,0 +1,70 @@
+"""
+Memory retained by action bindings after creating and discarding service instances,
+compared with the previous descriptor which cached actions by `id(instance)` forever.
+
+    python benchmark/action_binding.py [--instances 100000]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from plank.decorator.action import action
+from plank.descriptor.action import ActionDescriptor
+from plank.serving.service import Service
+
+
+class LegacyActionDescriptor(ActionDescriptor):
+    def __init__(self, path, end_point, **kwargs):
+        super().__init__(path=path, end_point=end_point, **kwargs)
+        self.__actions = {}
+
+    def __get__(self, instance, owner):
+        key = id(instance)
+        if key not in self.__actions.keys():
+            action = self.make_action(instance, owner)
+            self.__actions[key] = action
+        return self.__actions[key]
+
+
+class TenantService(Service):
+    @action(path="score")
+    def score(self, value: int) -> int:
+        return value
+
+
+class LegacyTenantService(Service):
+    @action(path="score", wrapper_descriptor_type=LegacyActionDescriptor)
+    def score(self, value: int) -> int:
+        return value
+
+
+def measure(service_type, instances: int):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    for index in range(instances):
+        service = service_type(name=f"tenant{index}", serving_path=f"tenant{index}")
+        service.score(index)
+        service.score(index)
+        del service
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return retained, peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--instances", type=int, default=100000)
+    options = parser.parse_args()
+
+    for name, service_type in [("legacy (id keyed)", LegacyTenantService), ("instance local", TenantService)]:
+        retained, peak, elapsed = measure(service_type, options.instances)
+        print(f"{name:>18}: retained {retained / 2 ** 20:>8.2f} MiB | peak {peak / 2 ** 20:>8.2f} MiB | "
+              f"{elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Encoded size and round trip time of the request payloads with the JSON codec and the binary codec.
+
+    python benchmark/codec.py [--iterations 20000]
+"""
+import argparse
+import time
+from typing import List
+
+from pydantic import BaseModel
+
+from plank.server.codec import Codec
+from plank.server.codec.binary import BinaryCodec
+from plank.server.message import SlottedRequest
+
+
+class Item(BaseModel):
+    sku: str
+    quantity: int
+    price: float
+    tags: List[str] = []
+
+
+def payloads():
+    item = Item(sku="A-1024", quantity=3, price=9.99, tags=["new", "sale"])
+    return {
+        "scalars": SlottedRequest(method="call", arguments={"a": 1, "b": 2}),
+        "models": SlottedRequest(method="call", arguments={"items": [item] * 20}),
+        "bytes 1MiB": SlottedRequest(method="call", arguments={"data": b"x" * (1024 * 1024)}),
+    }
+
+
+def measure(codec: Codec, request: SlottedRequest, iterations: int):
+    payload = codec.dumps_request("/service/action", request)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        codec.loads_request(codec.dumps_request("/service/action", request))
+    return len(payload), (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20000)
+    options = parser.parse_args()
+
+    codecs = {"json": Codec.named("json"), "binary": Codec.named("binary"),
+              "zero-copy": BinaryCodec(zero_copy=True)}
+    for name, request in payloads().items():
+        # the bytes payload is 1000 times bigger than the others.
+        iterations = max(options.iterations // 1000, 10) if name.startswith("bytes") else options.iterations
+        for codec_name, codec in codecs.items():
+            size, elapsed = measure(codec, request, iterations)
+            print(f"{name:>10} | {codec_name:>9} | {size:>9,} B | {elapsed * 1e6:>9.1f} µs per round trip")
+
+
+if __name__ == "__main__":
+    main()
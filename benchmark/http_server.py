@@ -0,0 +1,86 @@
+"""
+Requests/sec and latency of `HTTPServer` on loopback, the server runs in a child process.
+Every connection is kept alive and sends `--pipeline` requests at a time.
+
+    python benchmark/http_server.py [--connections 32] [--requests 100000] [--pipeline 1]
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import socket
+import time
+
+from plank.app import Application
+from plank.metrics.histogram import Histogram
+from plank.server import BindAddress
+from plank.server.action.wrapper import WrapperAction
+from plank.server.http import HTTPServer
+
+
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+def serve(sock: socket.socket):
+    app = Application(delegate=Application.Delegate(), configuration=None)
+    server = HTTPServer(application=app)
+    server.add_action(WrapperAction(path="/add", end_point=add))
+    server.run(sock=sock)
+
+
+async def connection(port: int, requests: int, pipeline: int, histogram: Histogram):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps({"a": 1, "b": 2}).encode("utf-8")
+    request = b"POST /add HTTP/1.1\r\nHost: bench\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n%s" % (
+        len(body), body)
+    sent = 0
+    while sent < requests:
+        batch = min(pipeline, requests - sent)
+        start = time.perf_counter_ns()
+        writer.write(request * batch)
+        for _ in range(batch):
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = int(head.lower().split(b"content-length: ", 1)[1].split(b"\r\n", 1)[0])
+            await reader.readexactly(length)
+            histogram.record(time.perf_counter_ns() - start)
+        sent += batch
+    writer.close()
+
+
+async def load(port: int, connections: int, requests: int, pipeline: int) -> Histogram:
+    histograms = [Histogram() for _ in range(connections)]
+    per_connection = requests // connections
+    await asyncio.gather(*(connection(port, per_connection, pipeline, histogram) for histogram in histograms))
+    return Histogram.merged(histograms)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=100000)
+    parser.add_argument("--pipeline", type=int, default=1)
+    options = parser.parse_args()
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(1024)
+    port = sock.getsockname()[1]
+    process = multiprocessing.get_context("fork").Process(target=serve, args=(sock,), daemon=True)
+    process.start()
+    try:
+        asyncio.run(load(port, options.connections, 1000, options.pipeline))
+        start = time.perf_counter()
+        histogram = asyncio.run(load(port, options.connections, options.requests, options.pipeline))
+        elapsed = time.perf_counter() - start
+    finally:
+        process.terminate()
+        process.join()
+
+    summary = histogram.summary()
+    print(f"{histogram.count / elapsed:>10,.0f} req/s | p50 {summary['p50'] / 1e6:.3f} ms | "
+          f"p99 {summary['p99'] / 1e6:.3f} ms | {options.connections} connections x pipeline {options.pipeline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Per-call latency and event loop creations of `LoopRunner.run_sync`,
+compared with creating a loop per call through `asyncio.run`.
+
+    python benchmark/loop_runner.py [--calls 20000]
+"""
+import argparse
+import asyncio
+import time
+
+from plank.app.runner import LoopRunner
+
+
+async def handler(value: int) -> int:
+    await asyncio.sleep(0)
+    return value
+
+
+class CountingPolicy(asyncio.DefaultEventLoopPolicy):
+    created = 0
+
+    def new_event_loop(self):
+        CountingPolicy.created += 1
+        return super().new_event_loop()
+
+
+def measure(run, calls: int) -> float:
+    start = time.perf_counter_ns()
+    for index in range(calls):
+        run(handler(index))
+    return (time.perf_counter_ns() - start) / calls / 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=20000)
+    options = parser.parse_args()
+
+    asyncio.set_event_loop_policy(CountingPolicy())
+    latency = measure(asyncio.run, options.calls)
+    print(f"{'asyncio.run':>22}: {latency:>8.2f} us/call | loops created: {CountingPolicy.created}")
+
+    for name, runner in [("LoopRunner(background)", LoopRunner(background=True)),
+                         ("LoopRunner(main)", LoopRunner(background=False))]:
+        latency = measure(runner.run_sync, options.calls)
+        print(f"{name:>22}: {latency:>8.2f} us/call | loops created: {runner.loops_created}")
+        runner.stop()
+
+
+if __name__ == "__main__":
+    main()
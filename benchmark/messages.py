@@ -0,0 +1,64 @@
+"""
+Round trip latency and allocations of inline calls with the pydantic messages and with the slotted messages.
+
+    python benchmark/messages.py [--requests 100000]
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from plank.app import Application
+from plank.server import BindAddress
+from plank.server.action.wrapper import WrapperAction
+from plank.server.connector import Connector
+from plank.server.inline import InlineServer
+from plank.server.message import Request, SlottedRequest
+
+
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+async def measure(connector: Connector, make_request, requests: int):
+    for index in range(1000):
+        await connector.send_async(make_request(index))
+
+    start = time.perf_counter()
+    for index in range(requests):
+        await connector.send_async(make_request(index))
+    elapsed = time.perf_counter() - start
+
+    # the footprint of the messages, kept alive by the list.
+    messages = []
+    tracemalloc.start()
+    for index in range(1000):
+        request = make_request(index)
+        messages.append((request, await connector.send_async(request)))
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, retained / 1000, peak / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=100000)
+    options = parser.parse_args()
+
+    app = Application(delegate=Application.Delegate(), configuration=None)
+    server = InlineServer(application=app)
+    server.add_action(WrapperAction(path="/add", end_point=add))
+    server.listen(address=BindAddress("local", None))
+    connector = Connector.connect("inline://local/add")
+
+    for name, make_request in [
+        ("pydantic", lambda index: Request(method="call", arguments={"a": index, "b": 1})),
+        ("slotted", lambda index: SlottedRequest(method="call", arguments={"a": index, "b": 1})),
+    ]:
+        elapsed, retained, peak = asyncio.run(measure(connector, make_request, options.requests))
+        print(f"{name:>8}: {elapsed / options.requests * 1e6:>7.2f} us/call | "
+              f"messages {retained:>6.0f} B/call | peak {peak:>6.0f} B/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Cost of resolving `Plugin.current()`: the context variable set around dispatch,
+the cached frame walk used as fallback, and the previous `inspect.getouterframes` walk.
+
+    python benchmark/plugin_current.py [--calls 20000] [--depth 30]
+"""
+import argparse
+import inspect
+import sys
+import time
+import types
+
+from plank.plugin import Plugin
+from plank.plugin.module import ModulePlugin
+
+PLUGIN_PACKAGE = "bench_plugin"
+
+
+class BenchPlugin(ModulePlugin):
+    def __init__(self):
+        pass
+
+    def _name(self) -> str:
+        return PLUGIN_PACKAGE
+
+
+def legacy_caller_plugin():
+    currentframe = inspect.currentframe()
+    getouterframes = inspect.getouterframes(currentframe, 2)
+    modules = map(lambda frameinfo: inspect.getmodule(frameinfo.frame), getouterframes)
+    filtered = filter(
+        lambda module: module is not None and hasattr(module, "__package__") and str(module.__package__).startswith(
+            PLUGIN_PACKAGE), modules
+    )
+    try:
+        module = next(filtered)
+        return ModulePlugin.plugin_by_module(module=module)
+    except:
+        return None
+
+
+def plugin_module(name: str) -> types.ModuleType:
+    # a module of the plugin which calls the resolver under `depth` frames of framework code.
+    module = types.ModuleType(name)
+    module.__package__ = PLUGIN_PACKAGE
+    module.__file__ = __file__
+    sys.modules[name] = module
+    exec("def handler(resolve, nested):\n    return nested(resolve)\n", module.__dict__)
+    return module
+
+
+def nested_calls(depth: int):
+    def nested(resolve, level=depth):
+        if level == 0:
+            return resolve()
+        return nested(resolve, level - 1)
+
+    return nested
+
+
+def measure(resolve, handler, nested, calls: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        handler(resolve, nested)
+    return (time.perf_counter_ns() - start) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--depth", type=int, default=30)
+    options = parser.parse_args()
+
+    plugin = BenchPlugin()
+    ModulePlugin.__package_name_mappings__[PLUGIN_PACKAGE] = plugin
+    module = plugin_module(f"{PLUGIN_PACKAGE}.handlers")
+    nested = nested_calls(options.depth)
+
+    assert module.handler(legacy_caller_plugin, nested) is plugin
+    assert module.handler(ModulePlugin.current, nested) is plugin
+    baseline = measure(lambda: None, module.handler, nested, options.calls)
+    legacy = measure(legacy_caller_plugin, module.handler, nested, max(options.calls // 100, 10))
+    fallback = measure(ModulePlugin.current, module.handler, nested, options.calls)
+    with Plugin.activated(plugin):
+        assert Plugin.current() is plugin
+        contextual = measure(Plugin.current, module.handler, nested, options.calls)
+
+    print(f"frames below the plugin handler: {options.depth}, call overhead excluded: {baseline:,.0f} ns")
+    print(f"{'inspect walk (legacy)':>24}: {legacy - baseline:>12,.0f} ns/call")
+    print(f"{'cached frame walk':>24}: {fallback - baseline:>12,.0f} ns/call")
+    print(f"{'context variable':>24}: {contextual - baseline:>12,.0f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Lookup latency of the `RouteTable` with 10k registered routes,
+half of them static and half of them with `{param}` segments.
+
+    python benchmark/route_table.py [--routes 10000] [--lookups 200000]
+"""
+import argparse
+import random
+import time
+
+from plank.server.action import Action
+from plank.server.route import RouteTable
+
+
+class BenchAction(Action):
+    def __init__(self, path: str):
+        self.__path = path
+
+    def routing_path(self) -> str:
+        return self.__path
+
+
+def measure(table: RouteTable, paths, lookups: int) -> float:
+    match = table.match
+    count = len(paths)
+    start = time.perf_counter_ns()
+    for index in range(lookups):
+        match(paths[index % count])
+    return (time.perf_counter_ns() - start) / lookups
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--routes", type=int, default=10000)
+    parser.add_argument("--lookups", type=int, default=200000)
+    options = parser.parse_args()
+
+    table = RouteTable()
+    static_paths, dynamic_paths = [], []
+    for index in range(options.routes // 2):
+        static_path = f"/service{index % 100}/static{index}/action"
+        table.add(static_path, BenchAction(static_path))
+        static_paths.append(static_path)
+
+        dynamic_path = f"/service{index % 100}/orders{index}/{{id}}/items/{{item}}"
+        table.add(dynamic_path, BenchAction(dynamic_path))
+        dynamic_paths.append(dynamic_path.replace("{id}", str(index)).replace("{item}", "x"))
+
+    random.shuffle(static_paths)
+    random.shuffle(dynamic_paths)
+    missing_paths = [f"/missing{index}/path" for index in range(1000)]
+
+    print(f"routes: {len(table)}")
+    for name, paths in [("static", static_paths), ("param", dynamic_paths), ("miss", missing_paths)]:
+        print(f"{name:>8}: {measure(table, paths, options.lookups):>8.0f} ns/lookup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Requests/sec of `ServingAction.receive` with the compiled `ArgumentBinder`,
+compared with the previous implementation that inspected `perform` on every request,
+and with the `validate` binding mode which validates the arguments by the precomputed schema.
+
+    python benchmark/serving_action.py [--requests 200000]
+"""
+import argparse
+import asyncio
+import inspect
+import time
+from functools import reduce
+
+from pydantic import BaseModel
+
+from plank.server.action.binder import ArgumentBinder
+from plank.server.action.serving import ServingAction
+from plank.server.message import Request, Response
+from plank.serving import Serving
+
+
+class Item(BaseModel):
+    name: str
+    count: int = 0
+
+
+class ModelServing(Serving):
+    def name(self) -> str:
+        return "model"
+
+    def perform(self, item: Item):
+        return item.count
+
+
+class ParametersServing(Serving):
+    def name(self) -> str:
+        return "parameters"
+
+    def perform(self, item: Item, factor: int):
+        return item.count * factor
+
+
+class LegacyServingAction(ServingAction):
+    async def receive(self, request: Request) -> Response:
+        sig = inspect.signature(self.serving.perform)
+        parameter_names = sig.parameters.keys()
+
+        def handle(args, parameter: inspect.Parameter):
+            arg = args[parameter.name]
+            if isinstance(arg, dict) and issubclass(parameter.annotation, BaseModel):
+                return parameter.annotation.construct(**arg)
+            else:
+                return arg
+
+        if len(parameter_names) == 1:
+            parameter_name = list(parameter_names)[0]
+            parameter = sig.parameters[parameter_name]
+            if issubclass(parameter.annotation, BaseModel):
+                argument_count = len(request.arguments.keys())
+                model_keys = parameter.annotation.schema(by_alias=True).keys()
+                if argument_count > 0:
+                    keys_compared = reduce(lambda result, item: result and (item in model_keys),
+                                           request.arguments.keys(), True)
+                    if keys_compared:
+                        model = parameter.annotation.construct(**request.arguments)
+                    else:
+                        model = parameter.annotation.construct(**request.arguments[parameter_name])
+                else:
+                    model = parameter.annotation.construct()
+                response_value = self.serving.perform(model)
+            else:
+                response_value = self.serving.perform(**request.arguments)
+        else:
+            pass_arguments = {
+                name: handle(request.arguments, parameter)
+                for name, parameter in sig.parameters.items()
+            }
+            response_value = self.serving.perform(**pass_arguments)
+
+        if inspect.isawaitable(response_value):
+            response_value = await response_value
+        return Response(value=response_value)
+
+
+async def measure(action, request: Request, count: int) -> float:
+    receive = action.receive
+    start = time.perf_counter()
+    for _ in range(count):
+        await receive(request)
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200000)
+    options = parser.parse_args()
+
+    cases = [
+        ("model", ModelServing(), Request(method="post", arguments={"item": {"name": "a", "count": 1}})),
+        ("parameters", ParametersServing(),
+         Request(method="post", arguments={"item": {"name": "a", "count": 1}, "factor": 2})),
+    ]
+    for name, serving, request in cases:
+        legacy = asyncio.run(measure(LegacyServingAction(path="/bench", serving=serving), request, options.requests))
+        compiled = asyncio.run(measure(ServingAction(path="/bench", serving=serving), request, options.requests))
+        validated = asyncio.run(measure(ServingAction(path="/bench", serving=serving,
+                                                      binding=ArgumentBinder.Mode.VALIDATE), request, options.requests))
+        print(f"{name:>12}: legacy {legacy:>12,.0f} req/s | compiled {compiled:>12,.0f} req/s | x{compiled / legacy:.2f}"
+              f" | validated {validated:>12,.0f} req/s")
+
+
+if __name__ == "__main__":
+    main()
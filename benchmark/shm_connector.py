@@ -0,0 +1,106 @@
+"""
+Latency and throughput of `ShmConnector` against `UnixConnector` for small calls and for large bytes,
+the servers run in child processes.
+
+    python benchmark/shm_connector.py [--requests 20000] [--concurrency 64] [--large 1048576]
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+from urllib.parse import quote
+
+from plank.app import Application
+from plank.app.runner import LoopRunner
+from plank.metrics.histogram import Histogram
+from plank.server import BindAddress
+from plank.server.action.wrapper import WrapperAction
+from plank.server.codec.binary import BinaryCodec
+from plank.server.connector import Connector
+from plank.server.message import SlottedRequest
+from plank.server.shm import ShmServer
+from plank.server.unix import UnixServer
+
+
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+def size(data: memoryview) -> int:
+    return len(data)
+
+
+def serve(server_type, path: str):
+    app = Application(delegate=Application.Delegate(), configuration=None)
+    server = server_type(application=app, codec=BinaryCodec(zero_copy=True))
+    server.add_action(WrapperAction(path="/add", end_point=add))
+    server.add_action(WrapperAction(path="/size", end_point=size))
+    server.listen(address=BindAddress(path, None))
+    server.run()
+
+
+async def latency(connector: Connector, request: SlottedRequest, requests: int) -> Histogram:
+    histogram = Histogram()
+    for _ in range(requests):
+        start = time.perf_counter_ns()
+        await connector.send_async(request)
+        histogram.record(time.perf_counter_ns() - start)
+    return histogram
+
+
+async def throughput(connector: Connector, request: SlottedRequest, requests: int, concurrency: int) -> float:
+    start = time.perf_counter()
+    await connector.send_many_async([request] * requests, concurrency=concurrency)
+    return requests / (time.perf_counter() - start)
+
+
+def measure(name: str, connector: Connector, runner: LoopRunner, request: SlottedRequest, requests: int,
+            concurrency: int):
+    async def _measure():
+        await latency(connector, request, min(requests, 1000))
+        histogram = await latency(connector, request, requests)
+        return histogram, await throughput(connector, request, requests, concurrency)
+
+    histogram, rate = runner.run_sync(_measure())
+    summary = histogram.summary()
+    print(f"{name:>12} | p50 {summary['p50'] / 1e3:>8.1f} µs | p99 {summary['p99'] / 1e3:>8.1f} µs | "
+          f"{rate:>10,.0f} req/s x {concurrency}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--large", type=int, default=1024 * 1024)
+    options = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    paths = {"unix": os.path.join(directory, "unix.sock"), "shm": os.path.join(directory, "shm.sock")}
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=serve, args=(server_type, paths[scheme]), daemon=True)
+                 for scheme, server_type in (("unix", UnixServer), ("shm", ShmServer))]
+    for process in processes:
+        process.start()
+    try:
+        while not all(os.path.exists(path) for path in paths.values()):
+            time.sleep(0.01)
+
+        app = Application(delegate=Application.Delegate(), configuration=None)
+        small = SlottedRequest(method="call", arguments={"a": 1, "b": 2})
+        large = SlottedRequest(method="call", arguments={"data": os.urandom(options.large)})
+        for scheme, path in paths.items():
+            url = f"{scheme}://{quote(path, safe='')}"
+            measure(f"{scheme} small", Connector.connect(f"{url}/add", runner=app.runner), app.runner, small,
+                    options.requests, options.concurrency)
+            measure(f"{scheme} large", Connector.connect(f"{url}/size", runner=app.runner), app.runner, large,
+                    max(options.requests // 100, 10), 4)
+        app.runner.stop()
+    finally:
+        for process in processes:
+            process.terminate()
+            process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Per-call overhead of the `timing` decorator in nanoseconds, compared with the previous
+implementation which formatted and logged one message per call.
+
+    python benchmark/timing.py [--calls 200000]
+"""
+import argparse
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from plank.decorator.timing import timing, TimingRegistry
+
+
+def legacy_timing(func):
+    @contextmanager
+    def wrapping_logic():
+        start_ts = time.time()
+        yield
+        dur = (time.time() - start_ts) * 1000.0
+        logging.info('{:s} function took {:.3f} ms'.format(func.__name__, (dur)))
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with wrapping_logic():
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def work(value):
+    return value + 1
+
+
+async def async_work(value):
+    return value + 1
+
+
+def measure(func, calls: int) -> float:
+    start = time.perf_counter_ns()
+    for index in range(calls):
+        func(index)
+    return (time.perf_counter_ns() - start) / calls
+
+
+async def measure_async(func, calls: int) -> float:
+    start = time.perf_counter_ns()
+    for index in range(calls):
+        await func(index)
+    return (time.perf_counter_ns() - start) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200000)
+    options = parser.parse_args()
+
+    # the legacy decorator logs every call, keep the handlers out of the measurement.
+    logging.getLogger().handlers = [logging.NullHandler()]
+    logging.getLogger().setLevel(logging.INFO)
+    registry = TimingRegistry(flush_interval=None)
+
+    baseline = measure(work, options.calls)
+    results = [
+        ("legacy (log per call)", measure(legacy_timing(work), options.calls)),
+        ("timing", measure(timing(work, registry=registry), options.calls)),
+        ("timing sample_rate=0.01", measure(timing(work, sample_rate=0.01, registry=registry), options.calls)),
+    ]
+    async_baseline = asyncio.run(measure_async(async_work, options.calls))
+    async_results = [
+        ("timing (async)", asyncio.run(measure_async(timing(async_work, registry=registry), options.calls))),
+        ("timing (async) sample_rate=0.01",
+         asyncio.run(measure_async(timing(async_work, sample_rate=0.01, registry=registry), options.calls))),
+    ]
+
+    for name, cost in results:
+        print(f"{name:>32}: {cost - baseline:>8.0f} ns/call overhead")
+    for name, cost in async_results:
+        print(f"{name:>32}: {cost - async_baseline:>8.0f} ns/call overhead")
+    for name, summary in registry.stats().items():
+        print(f"{name}: count={summary['count']}, p50={summary['p50']} ns, p99={summary['p99']} ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Latency and throughput of `UnixConnector` against `InlineConnector` for the same action,
+the unix server runs in a child process.
+
+    python benchmark/unix_connector.py [--requests 20000] [--concurrency 64] [--socket /tmp/plank-bench.sock]
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import multiprocessing
+import os
+import time
+from urllib.parse import quote
+
+from plank.app import Application
+from plank.app.runner import LoopRunner
+from plank.metrics.histogram import Histogram
+from plank.server import BindAddress
+from plank.server.action.wrapper import WrapperAction
+from plank.server.connector import Connector
+from plank.server.inline import InlineServer
+from plank.server.message import SlottedRequest
+from plank.server.unix import UnixServer
+
+
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+def serve(path: str):
+    app = Application(delegate=Application.Delegate(), configuration=None)
+    server = UnixServer(application=app)
+    server.add_action(WrapperAction(path="/add", end_point=add))
+    server.listen(address=BindAddress(path, None))
+    server.run()
+
+
+async def latency(connector: Connector, requests: int) -> Histogram:
+    histogram = Histogram()
+    request = SlottedRequest(method="call", arguments={"a": 1, "b": 2})
+    for _ in range(requests):
+        start = time.perf_counter_ns()
+        await connector.send_async(request)
+        histogram.record(time.perf_counter_ns() - start)
+    return histogram
+
+
+async def throughput(connector: Connector, requests: int, concurrency: int) -> float:
+    request = SlottedRequest(method="call", arguments={"a": 1, "b": 2})
+    start = time.perf_counter()
+    await connector.send_many_async([request] * requests, concurrency=concurrency)
+    return requests / (time.perf_counter() - start)
+
+
+def measure(name: str, connector: Connector, runner: LoopRunner, requests: int, concurrency: int):
+    async def _measure():
+        await latency(connector, 1000)
+        histogram = await latency(connector, requests)
+        return histogram, await throughput(connector, requests, concurrency)
+
+    histogram, rate = runner.run_sync(_measure())
+    summary = histogram.summary()
+    print(f"{name:>7} | p50 {summary['p50'] / 1e3:>7.1f} µs | p99 {summary['p99'] / 1e3:>7.1f} µs | "
+          f"{rate:>10,.0f} req/s x {concurrency}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--socket", default="/tmp/plank-bench.sock")
+    options = parser.parse_args()
+
+    process = multiprocessing.get_context("fork").Process(target=serve, args=(options.socket,), daemon=True)
+    process.start()
+    try:
+        while not os.path.exists(options.socket):
+            time.sleep(0.01)
+
+        app = Application(delegate=Application.Delegate(), configuration=None)
+        server = InlineServer(application=app)
+        server.add_action(WrapperAction(path="/add", end_point=add))
+        server.listen(address=BindAddress("local", None))
+        with contextlib.redirect_stdout(io.StringIO()):
+            inline = Connector.connect("inline://local/add")
+        unix = Connector.connect(f"unix://{quote(options.socket, safe='')}/add", runner=app.runner)
+
+        measure("inline", inline, app.runner, options.requests, options.concurrency)
+        measure("unix", unix, app.runner, options.requests, options.concurrency)
+        app.runner.stop()
+    finally:
+        process.terminate()
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
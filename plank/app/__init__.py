@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+import asyncio
+import functools
+import importlib
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List, Any, Dict, Type, Union, TYPE_CHECKING
+from typing import Optional, List, Any, Dict, Type, Union, Tuple, Callable, TYPE_CHECKING
 
 from plank import logger
 from plank.context import Context
 from plank.configuration import Configuration
+from plank.app.runner import LoopRunner
+from plank.app.executor import ExecutorManager
 from plank.serving.interface import ServiceManagerable
 from plank.serving.service import Service
 
@@ -69,6 +76,14 @@ class Application(ServiceManagerable):
     def delegate(self) -> Application.Delegate:
         return self.__delegate
 
+    @property
+    def runner(self) -> LoopRunner:
+        return self.__runner
+
+    @property
+    def executors(self) -> ExecutorManager:
+        return self.__executors
+
     @property
     def plugins(self) -> List[Plugin]:
         return self.__installed_plugins or []
@@ -79,6 +94,13 @@ class Application(ServiceManagerable):
     def loaded(self):
         return self.__loaded
 
+    @property
+    def plugin_timings(self) -> Dict[str, Dict[str, float]]:
+        """
+        The seconds spent to install, preload and load each plugin, by plugin name.
+        """
+        return self.__plugin_timings
+
     @classmethod
     def main(cls) -> Application:
         if not hasattr(cls, _Application__singleton_key):
@@ -86,11 +108,30 @@ class Application(ServiceManagerable):
                 f"Application had no an instance. please get instance by Application(delegate=...) first.")
         return getattr(cls, _Application__singleton_key)
 
-    def __init__(self, delegate: Application.Delegate, configuration: Configuration) -> None:
+    def __init__(self, delegate: Application.Delegate, configuration: Configuration,
+                 runner: Optional[LoopRunner] = None, plugin_workers: Optional[int] = None,
+                 executors: Optional[ExecutorManager] = None) -> None:
         self.__delegate = delegate
         self.__configuration = configuration
+        self.__runner = runner or LoopRunner()
+        self.__executors = executors or ExecutorManager()
+        self.__plugin_workers = plugin_workers
         self.__loaded = False
         self.__installed_plugins = []
+        self.__plugin_timings = {}
+
+    @classmethod
+    def construct_from_configuration(cls, configuration: Configuration, **kwargs) -> Application:
+        """
+        The application with the delegate of `app.delegate` formatted with {module}:{class_name} in configuration.
+        """
+        delegate_str = configuration.app.delegate
+        if delegate_str:
+            module_str, class_str = delegate_str.split(":")
+            delegate = getattr(importlib.import_module(module_str), class_str)()
+        else:
+            delegate = cls.Delegate()
+        return cls(delegate=delegate, configuration=configuration, **kwargs)
 
     def as_main(self):
         setattr(Application, _Application__singleton_key, self)
@@ -98,30 +139,91 @@ class Application(ServiceManagerable):
     def _load_plugin(self):
         plugin_prefixes = self.configuration.plugin.prefix
         plugins = []
+        plugin_types = {}
         for prefix in plugin_prefixes:
             plugin_type = self.delegate.application_using_plugin_type(self, prefix=prefix)
             if hasattr(plugin_type, "discover"):
-                plugins += (plugin_type.discover(plugin_prefix=prefix) or [])
+                discovered = plugin_type.discover(plugin_prefix=prefix) or []
+                plugin_types.update((id(plugin), plugin_type) for plugin in discovered)
+                plugins += discovered
 
         if len(plugins) > 0:
             self.delegate.application_did_discover_plugins(app=self, plugins=plugins)
+
+        from plank.plugin import Plugin
+        ordered_plugins = Plugin.sort_by_dependencies(plugins)
+        installed, loading = self.__install_plugins(ordered_plugins, plugin_types)
+        self.__installed_plugins += installed
+        self.runner.run_sync(self.__preload_plugins(loading))
+        for plugin in loading:
+            self.__timed(plugin, "load", plugin.load)
+            self.delegate.application_did_load_plugin(app=self, plugin=plugin)
+        for plugin in installed:
+            logger.info(f"plugin did boot: {plugin.name}, " + ", ".join(
+                f"{phase}: {seconds * 1000.0:.3f} ms" for phase, seconds in self.__plugin_timings[plugin.name].items()))
+
+    def __install_plugins(self, plugins: List[Plugin],
+                          plugin_types: Dict[int, Type[Plugin]]) -> Tuple[List[Plugin], List[Plugin]]:
+        """
+        Install plugins in order on the calling thread, returns the installed plugins and the ones to load.
+        A plugin is skipped if any of its dependencies isn't installed.
+        """
+        installed: List[Plugin] = []
+        installed_names = set()
+        loading: List[Plugin] = []
         for plugin in plugins:
-            try:
-                if self.delegate.application_should_install_plugin(app=self, plugin=plugin):
-                    plugin_type.install(plugin=plugin)
-                    self.__installed_plugins.append(plugin)
-                    self.delegate.application_did_install_plugin(app=self, plugin=plugin)
-                    # load plugin if installed, otherwise passing.
-                    if self.delegate.application_should_load_plugin(app=self, plugin=plugin):
-                        plugin.load()
-                        self.delegate.application_did_load_plugin(app=self, plugin=plugin)
-            except Exception as e:
-                logger.error(f"The error happened on loading plugin: {plugin.name}.")
-                raise e
+            missing = [name for name in plugin.dependencies if name not in installed_names]
+            if len(missing) > 0:
+                logger.warn(f"plugin {plugin.name} is skipped without its dependencies: {', '.join(missing)}.")
+                continue
+            if not self.delegate.application_should_install_plugin(app=self, plugin=plugin):
+                continue
+            self.__timed(plugin, "install", functools.partial(plugin_types[id(plugin)].install, plugin=plugin))
+            installed.append(plugin)
+            installed_names.add(plugin.name)
+            self.delegate.application_did_install_plugin(app=self, plugin=plugin)
+            # load plugin if installed, otherwise passing.
+            if self.delegate.application_should_load_plugin(app=self, plugin=plugin):
+                loading.append(plugin)
+        return installed, loading
+
+    async def __preload_plugins(self, plugins: List[Plugin]):
+        """
+        Preload plugins concurrently in the thread pool, e.g. import their modules,
+        a plugin starts after all of its dependencies were preloaded. The hooks aren't called by `preload`.
+        """
+        loop = asyncio.get_running_loop()
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def _preload_after_dependencies(plugin: Plugin, executor: ThreadPoolExecutor):
+            dependencies = [tasks[name] for name in plugin.dependencies if name in tasks]
+            if len(dependencies) > 0:
+                await asyncio.gather(*dependencies)
+            await loop.run_in_executor(executor, self.__timed, plugin, "preload", plugin.preload)
+
+        with ThreadPoolExecutor(max_workers=self.__plugin_workers, thread_name_prefix="plank-plugin") as executor:
+            for plugin in plugins:
+                tasks[plugin.name] = loop.create_task(_preload_after_dependencies(plugin, executor))
+            results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    def __timed(self, plugin: Plugin, phase: str, func: Callable[[], Any]):
+        start = time.perf_counter()
+        try:
+            func()
+        except Exception as e:
+            logger.error(f"The error happened on loading plugin: {plugin.name}.")
+            raise e
+        self.__plugin_timings.setdefault(plugin.name, {})[phase] = time.perf_counter() - start
 
     def unload(self):
         for plugin in self.plugins:
             plugin.unload()
+        self.__executors.shutdown()
+        self.__runner.stop()
         self.__loaded = False
 
     def launch(self, **options):
@@ -139,7 +241,7 @@ class Application(ServiceManagerable):
 
         self._load_plugin()
         for plugin in self.plugins:
-            plugin.delegate.application_did_launch(plugin=plugin, launch_options=options)
+            plugin.notify("application_did_launch", launch_options=options)
 
         self.__loaded = True
 
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import os
+import threading
+import weakref
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+_ExecutorManager__shared_key = "__shared"
+_ExecutorManager__managers = weakref.WeakSet()
+
+
+class ExecutorManager:
+    """
+    The bounded, named executors used to run actions off the event loop, e.g. `@action(execution="thread", executor="io")`.
+    An executor is created on its first use and lives until `shutdown`.
+    """
+    THREAD = "thread"
+    PROCESS = "process"
+
+    @classmethod
+    def shared(cls) -> ExecutorManager:
+        from plank.app import Application
+        try:
+            return Application.main().executors
+        except RuntimeError:
+            pass
+        if not hasattr(cls, _ExecutorManager__shared_key):
+            setattr(cls, _ExecutorManager__shared_key, cls())
+        return getattr(cls, _ExecutorManager__shared_key)
+
+    @classmethod
+    def default_max_workers(cls, kind: str) -> int:
+        cpu_count = os.cpu_count() or 1
+        return cpu_count if kind == ExecutorManager.PROCESS else min(32, cpu_count + 4)
+
+    @classmethod
+    def shutdown_all(cls, wait: bool = True):
+        """
+        Shut down the executors of all managers, e.g. before forking, they're created again on their next use.
+        """
+        for manager in list(_ExecutorManager__managers):
+            manager.shutdown(wait=wait)
+
+    def __init__(self, max_workers: Optional[Dict[str, int]] = None):
+        """
+        `max_workers` sets the size of executors by name, the others use the default size of their kind.
+        """
+        self.__max_workers = max_workers or {}
+        self.__executors: Dict[Tuple[str, str], Executor] = {}
+        self.__lock = threading.Lock()
+        _ExecutorManager__managers.add(self)
+
+    def reset_after_fork(self):
+        """
+        Forget the executors inherited by a forked child, their workers didn't survive the fork.
+        """
+        self.__executors = {}
+        self.__lock = threading.Lock()
+
+    def executors(self) -> Dict[Tuple[str, str], Executor]:
+        return dict(self.__executors)
+
+    def get(self, kind: str, name: Optional[str] = None, max_workers: Optional[int] = None) -> Executor:
+        name = name or "default"
+        key = (kind, name)
+        executor = self.__executors.get(key)
+        if executor is not None:
+            return executor
+        with self.__lock:
+            executor = self.__executors.get(key)
+            if executor is None:
+                max_workers = self.__max_workers.get(name) or max_workers or self.default_max_workers(kind)
+                if kind == ExecutorManager.THREAD:
+                    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"plank-{name}")
+                elif kind == ExecutorManager.PROCESS:
+                    executor = ProcessPoolExecutor(max_workers=max_workers)
+                else:
+                    raise ValueError(f"The kind of executor should be `thread` or `process`, but {kind} given.")
+                self.__executors[key] = executor
+            return executor
+
+    def shutdown(self, wait: bool = True):
+        with self.__lock:
+            executors, self.__executors = self.__executors, {}
+        for executor in executors.values():
+            executor.shutdown(wait=wait)
+
+
+def _reset_managers_after_fork():
+    for manager in list(_ExecutorManager__managers):
+        manager.reset_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_managers_after_fork)
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import weakref
+from typing import Optional, Awaitable, TypeVar
+
+T = TypeVar("T")
+
+_LoopRunner__shared_key = "__shared"
+_LoopRunner__runners = weakref.WeakSet()
+
+
+async def _await(awaitable: Awaitable[T]) -> T:
+    return await awaitable
+
+
+class LoopRunner:
+    """
+    A long-lived event loop to bridge synchronous callers into coroutines without creating a loop per call.
+    The loop runs on a background thread by default, or on the calling thread with `background=False`.
+    """
+
+    @classmethod
+    def shared(cls) -> LoopRunner:
+        from plank.app import Application
+        try:
+            return Application.main().runner
+        except RuntimeError:
+            pass
+        if not hasattr(cls, _LoopRunner__shared_key):
+            setattr(cls, _LoopRunner__shared_key, cls())
+        return getattr(cls, _LoopRunner__shared_key)
+
+    @property
+    def background(self) -> bool:
+        return self.__background
+
+    @classmethod
+    def stop_all(cls):
+        """
+        Stop the loops of all runners, e.g. before forking, a runner starts a new loop on its next call.
+        """
+        for runner in list(_LoopRunner__runners):
+            runner.stop()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self.__ensure_loop()
+
+    @property
+    def loops_created(self) -> int:
+        return self.__loops_created
+
+    @property
+    def calls(self) -> int:
+        return self.__calls
+
+    @property
+    def is_started(self) -> bool:
+        return self.__loop is not None and not self.__loop.is_closed()
+
+    def __init__(self, background: bool = True, name: str = "plank-loop"):
+        self.__background = background
+        self.__name = name
+        self.__loop: Optional[asyncio.AbstractEventLoop] = None
+        self.__thread: Optional[threading.Thread] = None
+        self.__lock = threading.Lock()
+        self.__loops_created = 0
+        self.__calls = 0
+        # runs the coroutines of `run_sync` called on the thread of this loop, e.g. by a synchronous action.
+        self.__nested: Optional[LoopRunner] = None
+        _LoopRunner__runners.add(self)
+
+    def reset_after_fork(self):
+        """
+        Forget the loop inherited by a forked child, its thread didn't survive the fork.
+        The next call starts a new loop, the inherited one is left unclosed since it's still marked as running.
+        """
+        self.__loop = None
+        self.__thread = None
+        self.__nested = None
+        self.__lock = threading.Lock()
+
+    def start(self) -> LoopRunner:
+        self.__ensure_loop()
+        return self
+
+    def __ensure_loop(self) -> asyncio.AbstractEventLoop:
+        loop = self.__loop
+        if loop is not None and not loop.is_closed():
+            return loop
+        with self.__lock:
+            if self.__loop is None or self.__loop.is_closed():
+                self.__loop = asyncio.new_event_loop()
+                self.__loops_created += 1
+                if self.__background:
+                    started = threading.Event()
+                    self.__thread = threading.Thread(target=self.__run_forever, args=(self.__loop, started),
+                                                     name=self.__name, daemon=True)
+                    self.__thread.start()
+                    started.wait()
+            return self.__loop
+
+    @staticmethod
+    def __run_forever(loop: asyncio.AbstractEventLoop, started: threading.Event):
+        asyncio.set_event_loop(loop)
+        loop.call_soon(started.set)
+        loop.run_forever()
+
+    def run_sync(self, coro: Awaitable[T]) -> T:
+        if not asyncio.iscoroutine(coro):
+            coro = _await(coro)
+        loop = self.__ensure_loop()
+        self.__calls += 1
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is loop:
+            # the loop can't run the coroutine while its thread waits, so another loop runs it meanwhile.
+            # the coroutine shouldn't wait for this loop, e.g. for a server listening on it.
+            return self.__nested_runner().run_sync(coro)
+
+        if self.__background or loop.is_running():
+            return asyncio.run_coroutine_threadsafe(coro, loop).result()
+        return loop.run_until_complete(coro)
+
+    def __nested_runner(self) -> LoopRunner:
+        with self.__lock:
+            if self.__nested is None:
+                self.__nested = LoopRunner(background=True, name=f"{self.__name}-nested")
+            return self.__nested
+
+    def stop(self):
+        with self.__lock:
+            loop = self.__loop
+            self.__loop = None
+            thread = self.__thread
+            self.__thread = None
+            nested = self.__nested
+            self.__nested = None
+        if nested is not None:
+            nested.stop()
+        if loop is None or loop.is_closed():
+            return
+
+        async def _shutdown():
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await loop.shutdown_asyncgens()
+
+        if thread is not None:
+            asyncio.run_coroutine_threadsafe(_shutdown(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+        elif not loop.is_running():
+            loop.run_until_complete(_shutdown())
+        loop.close()
+
+
+def _reset_runners_after_fork():
+    for runner in list(_LoopRunner__runners):
+        runner.reset_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_runners_after_fork)
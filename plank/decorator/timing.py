@@ -1,28 +1,116 @@
+from __future__ import annotations
+
 import asyncio
+import random
+import threading
 import time
-from contextlib import contextmanager
 from functools import wraps
+from typing import Optional, Dict, Callable
 
-import nest_asyncio
 from plank import logger
+from plank.metrics import Metrics
+
+_TimingRegistry__default_key = "__default"
+_TimingRegistry__metric_name = "timing"
+
+
+class TimingRegistry:
+    """
+    Aggregates the durations recorded by `timing` in memory, and logs the statistics every `flush_interval` seconds.
+    """
+
+    @classmethod
+    def default(cls) -> TimingRegistry:
+        if not hasattr(cls, _TimingRegistry__default_key):
+            setattr(cls, _TimingRegistry__default_key, cls())
+        return getattr(cls, _TimingRegistry__default_key)
+
+    @property
+    def flush_interval(self) -> Optional[float]:
+        return self.__flush_interval
+
+    def __init__(self, flush_interval: Optional[float] = 60.0):
+        self.__flush_interval = flush_interval
+        self.__metrics = Metrics()
+        self.__flusher: Optional[threading.Thread] = None
+        self.__stopped = threading.Event()
+        self.__lock = threading.Lock()
+
+    def record(self, name: str, duration_ns: int):
+        self.__metrics.observe(_TimingRegistry__metric_name, name, duration_ns)
+        if self.__flusher is None and self.__flush_interval is not None:
+            self.start()
+
+    def stats(self) -> Dict[str, Dict[str, Optional[float]]]:
+        return self.__metrics.snapshot()["histograms"].get(_TimingRegistry__metric_name, {})
+
+    def flush(self) -> Dict[str, Dict[str, Optional[float]]]:
+        # the statistics of the detached shards, so the durations recorded meanwhile are kept for the next flush.
+        shards = self.__metrics.detach()
+        stats = self.__metrics.snapshot(shards)["histograms"].get(_TimingRegistry__metric_name, {})
+        for name, summary in sorted(stats.items()):
+            logger.info(
+                "{:s} function took count: {:d}, min: {:.3f} ms, max: {:.3f} ms, p50: {:.3f} ms, p99: {:.3f} ms".format(
+                    name, summary["count"], summary["min"] / 1e6, summary["max"] / 1e6, summary["p50"] / 1e6,
+                    summary["p99"] / 1e6))
+        return stats
+
+    def start(self):
+        with self.__lock:
+            if self.__flusher is not None:
+                return
+            self.__stopped.clear()
+            self.__flusher = threading.Thread(target=self.__flush_periodically, name="plank-timing", daemon=True)
+            self.__flusher.start()
+
+    def stop(self):
+        with self.__lock:
+            flusher, self.__flusher = self.__flusher, None
+        if flusher is not None:
+            self.__stopped.set()
+            flusher.join()
+        self.flush()
+
+    def __flush_periodically(self):
+        while not self.__stopped.wait(self.__flush_interval):
+            self.flush()
+
+
+def timing(func: Optional[Callable] = None, *, name: Optional[str] = None, sample_rate: float = 1.0,
+           registry: Optional[TimingRegistry] = None):
+    """
+    Record the duration of `func` into the registry, used as `@timing` or `@timing(sample_rate=0.01)`.
+    Only `sample_rate` of calls are measured, coroutine functions are measured until they finished.
+    """
+    if func is None:
+        return lambda f: timing(f, name=name, sample_rate=sample_rate, registry=registry)
 
-nest_asyncio.apply()
+    name = name or func.__qualname__
+    registry = registry or TimingRegistry.default()
+    sampling = sample_rate < 1.0
+    perf_counter_ns = time.perf_counter_ns
 
+    if asyncio.iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            if sampling and random.random() >= sample_rate:
+                return await func(*args, **kwargs)
+            start = perf_counter_ns()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                registry.record(name, perf_counter_ns() - start)
 
-def timing(func):
-    @contextmanager
-    def wrapping_logic():
-        start_ts = time.time()
-        yield
-        dur = (time.time() - start_ts) * 1000.0
-        logger.info('{:s} function took {:.3f} ms'.format(func.__name__, (dur)))
+        return async_wrapper
 
     @wraps(func)
     def wrapper(*args, **kwargs):
-        if not asyncio.iscoroutinefunction(func):
-            with wrapping_logic():
-                return func(*args, **kwargs)
-        else:
-            return asyncio.run(func(*args, **kwargs))
+        if sampling and random.random() >= sample_rate:
+            return func(*args, **kwargs)
+        start = perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            registry.record(name, perf_counter_ns() - start)
 
     return wrapper
@@ -1,18 +1,97 @@
 from __future__ import annotations
 
+import inspect
+import pickle
+import weakref
 from copy import copy
-from typing import Type, Callable, Dict, Any, TYPE_CHECKING
+from typing import Type, Callable, Dict, Any, Optional, TYPE_CHECKING
 
+from plank.server.action.batching import BatchPolicy
+from plank.server.action.binder import ArgumentBinder
+from plank.server.action.caching import CachePolicy
+from plank.server.action.execution import ExecutionPolicy
 from plank.server.action.wrapper import WrapperAction
 from plank.serving.service import Service
 from plank.utils.path import clearify
 
 if TYPE_CHECKING:
+    from plank.plugin import Plugin
     from plank.server.action import Action
 
 
+def _dereference(reference: weakref.ref, name: str) -> Service:
+    instance = reference()
+    if instance is None:
+        raise ReferenceError(f"The service of action {name} was released.")
+    return instance
+
+
+def _weakly_bound(function: Callable, instance: Service, owner: Type[Service]) -> Callable:
+    """
+    `function` bound to `instance` at each call, without keeping the instance alive.
+    """
+    reference = weakref.ref(instance)
+    name = getattr(function, "__name__", repr(function))
+    if inspect.iscoroutinefunction(function):
+        async def end_point(*args, **kwargs):
+            return await function.__get__(_dereference(reference, name), owner)(*args, **kwargs)
+    else:
+        def end_point(*args, **kwargs):
+            return function.__get__(_dereference(reference, name), owner)(*args, **kwargs)
+    for attribute in ("__module__", "__name__", "__qualname__", "__doc__"):
+        if hasattr(function, attribute):
+            setattr(end_point, attribute, getattr(function, attribute))
+    end_point.__annotations__ = dict(getattr(function, "__annotations__", {}))
+    # the globals of the function resolve its type hints, and the signature is the bound one.
+    end_point.__wrapped__ = function
+    end_point.__signature__ = inspect.signature(function.__get__(instance, owner))
+    return end_point
+
+
+def _weak_plugin_provider(instance: Service) -> Callable[[], Optional[Plugin]]:
+    reference = weakref.ref(instance)
+
+    def plugin() -> Optional[Plugin]:
+        instance = reference()
+        return None if instance is None else instance.plugin()
+
+    return plugin
+
+
 class ActionDescriptor:
 
+    class ProcessEndPoint:
+        """
+        The end point of a service sent to a process pool. A bound method can't be pickled since it's unpickled
+        through the descriptor, so the function is looked up in the manifest of the service type instead.
+        """
+
+        def __init__(self, owner: Type[Service], name: str, instance: Service, weak: bool = False):
+            """
+            A `weak` end point doesn't keep the instance alive, e.g. in the action cached on the instance,
+            the unpickled one in a worker process keeps its own copy of instance.
+            """
+            self.owner = owner
+            self.name = name
+            self.__instance = weakref.ref(instance) if weak else None
+            self.__strong_instance = None if weak else instance
+            function = owner.__action_manifest__[name].unbound_end_point
+            self.__name__ = getattr(function, "__name__", name)
+            self.__signature__ = inspect.signature(function.__get__(instance, owner))
+
+        @property
+        def instance(self) -> Service:
+            if self.__instance is None:
+                return self.__strong_instance
+            return _dereference(self.__instance, self.name)
+
+        def __reduce__(self):
+            return ActionDescriptor.ProcessEndPoint, (self.owner, self.name, self.instance)
+
+        def __call__(self, *args, **kwargs):
+            function = self.owner.__action_manifest__[self.name].unbound_end_point
+            return function(self.instance, *args, **kwargs)
+
     def __init__(self,
                  path: str,
                  end_point: Callable,
@@ -21,17 +100,64 @@ class ActionDescriptor:
         self.__path = path
         self.__action_args = kwargs
         self.__unbound_end_point = end_point
-        self.__actions = {}
+        self.__name = getattr(end_point, "__name__", None)
+        self.__binder: Optional[ArgumentBinder] = None
+        self.__execution = ExecutionPolicy.from_action_args(kwargs)
+        self.__batch = BatchPolicy.from_action_args(kwargs)
+        self.__cache = CachePolicy.from_action_args(kwargs)
+        self.__coalesce = bool(kwargs.get("coalesce", False))
+        self.__stream_buffer = kwargs.get("stream_buffer", 16)
+        self.__binding = ArgumentBinder.Mode(kwargs.get("binding", ArgumentBinder.Mode.NONE.value))
+
+    @property
+    def execution(self) -> ExecutionPolicy:
+        return self.__execution
+
+    @property
+    def batch(self) -> Optional[BatchPolicy]:
+        return self.__batch
+
+    @property
+    def cache(self) -> Optional[CachePolicy]:
+        return self.__cache
 
-    def __get__(self, instance: Service, owner: Type[Service]) -> WrapperAction:
-        key = id(instance)
-        if key not in self.__actions.keys():
-            action = self.make_action(instance, owner)
-            self.__actions[key] = action
-        return self.__actions[key]
+    @property
+    def coalesce(self) -> bool:
+        return self.__coalesce
+
+    @property
+    def name(self) -> Optional[str]:
+        return self.__name
+
+    @property
+    def unbound_end_point(self) -> Callable:
+        return self.__unbound_end_point
+
+    def __set_name__(self, owner: Type[Service], name: str):
+        self.__name = name
+
+    def __get__(self, instance: Optional[Service], owner: Type[Service]) -> WrapperAction:
+        if instance is None:
+            return self
+        action = self.make_action(instance, owner)
+        # the descriptor defines no __set__, so the action stored on the instance shadows it from now on,
+        # and it's released together with the instance, the action refers to the instance weakly.
+        instance_dict = getattr(instance, "__dict__", None)
+        if instance_dict is not None and self.__name is not None:
+            instance_dict[self.__name] = action
+        return action
 
     def end_point(self, instance: Service, owner: Type[Service]) -> Callable:
-        return self.__unbound_end_point.__get__(instance, owner)
+        if self.__execution.kind is ExecutionPolicy.Kind.PROCESS and \
+                not inspect.iscoroutinefunction(self.__unbound_end_point):
+            end_point = ActionDescriptor.ProcessEndPoint(owner=owner, name=self.__name, instance=instance, weak=True)
+            try:
+                pickle.dumps(end_point)
+            except Exception as e:
+                raise TypeError(f"The action {self.__name} of {owner.__qualname__} runs in a process pool, "
+                                f"but its service can't be pickled: {e}") from e
+            return end_point
+        return _weakly_bound(self.__unbound_end_point, instance, owner)
 
     def serving_path(self, instance: Service, owner: Type[Service]):
         instance_serving_path = instance.serving_path()
@@ -47,5 +173,12 @@ class ActionDescriptor:
     def make_action(self, instance: Service, owner: Type[Service]) -> Action:
         end_point = self.end_point(instance=instance, owner=owner)
         path = self.serving_path(instance=instance, owner=owner)
-        action = WrapperAction(path=path, end_point=end_point)
+        if self.__binder is None:
+            # the bound end points of every instance share the same signature.
+            self.__binder = ArgumentBinder.compile(end_point, batched=self.__batch is not None, mode=self.__binding)
+        plugin_provider = _weak_plugin_provider(instance) if hasattr(instance, "plugin") else None
+        action = WrapperAction(path=path, end_point=end_point, plugin_provider=plugin_provider,
+                               binder=self.__binder, execution=self.__execution, batch=self.__batch,
+                               cache=self.__cache, coalesce=self.__coalesce,
+                               stream_buffer=self.__stream_buffer)
         return action
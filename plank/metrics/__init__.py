@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, Optional, List, Tuple
+
+from plank.metrics.histogram import Histogram
+
+_Metrics__default_key = "__default"
+
+
+class ActionStats:
+    __slots__ = ("count", "errors", "in_flight", "latency")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.in_flight = 0
+        # nanoseconds
+        self.latency = Histogram()
+
+
+class MetricsShard:
+    """
+    The metrics recorded by one thread, only the owner thread writes into it.
+    """
+    __slots__ = ("actions", "histograms", "counters", "busy", "detached")
+
+    def __init__(self):
+        self.actions: Dict[str, ActionStats] = {}
+        self.histograms: Dict[Tuple[str, str], Histogram] = {}
+        self.counters: Dict[Tuple[str, str], int] = {}
+        # the owner is writing into it, `detach` waits for the write to finish.
+        self.busy = False
+        # swapped out by `detach`, the owner writes into a new shard instead.
+        self.detached = False
+
+
+class Metrics:
+    """
+    Request level metrics of actions by routing path.
+    Every thread records into its own shard without locking, the shards are merged by `snapshot`.
+    """
+
+    @classmethod
+    def default(cls) -> Metrics:
+        if not hasattr(cls, _Metrics__default_key):
+            setattr(cls, _Metrics__default_key, cls())
+        return getattr(cls, _Metrics__default_key)
+
+    @property
+    def enabled(self) -> bool:
+        return self.__enabled
+
+    @enabled.setter
+    def enabled(self, new_value: bool):
+        self.__enabled = new_value
+
+    def __init__(self, enabled: bool = True):
+        self.__enabled = enabled
+        self.__local = threading.local()
+        self.__shards: List[MetricsShard] = []
+        self.__lock = threading.Lock()
+
+    def shard(self) -> MetricsShard:
+        try:
+            return self.__local.shard
+        except AttributeError:
+            shard = MetricsShard()
+            # paired under the lock, so a shard created during `detach` isn't left out of both sets of shards.
+            with self.__lock:
+                self.__shards.append(shard)
+                self.__local.shard = shard
+            return shard
+
+    def __writing(self) -> MetricsShard:
+        # the flag is set before `detached` is checked, and `detach` sets `detached` before it checks the flag,
+        # so either the write goes into a new shard or `detach` waits for it.
+        while True:
+            shard = self.shard()
+            shard.busy = True
+            if not shard.detached:
+                return shard
+            shard.busy = False
+
+    def begin(self, path: str) -> int:
+        """
+        Mark a request of `path` in flight, returns the start timestamp for `end`.
+        """
+        if not self.__enabled:
+            return 0
+        shard = self.__writing()
+        actions = shard.actions
+        stats = actions.get(path)
+        if stats is None:
+            stats = actions[path] = ActionStats()
+        stats.in_flight += 1
+        shard.busy = False
+        return time.perf_counter_ns()
+
+    def end(self, path: str, start: int, error: bool = False):
+        if not self.__enabled or start == 0:
+            return
+        elapsed = time.perf_counter_ns() - start
+        shard = self.__writing()
+        actions = shard.actions
+        stats = actions.get(path)
+        if stats is None:
+            stats = actions[path] = ActionStats()
+        stats.in_flight -= 1
+        stats.count += 1
+        if error:
+            stats.errors += 1
+        stats.latency.record(elapsed)
+        shard.busy = False
+
+    def observe(self, name: str, path: str, value: int):
+        if not self.__enabled:
+            return
+        shard = self.__writing()
+        histograms = shard.histograms
+        key = (name, path)
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = Histogram()
+        histogram.record(value)
+        shard.busy = False
+
+    def increase(self, name: str, path: str, amount: int = 1):
+        if not self.__enabled:
+            return
+        shard = self.__writing()
+        counters = shard.counters
+        key = (name, path)
+        counters[key] = counters.get(key, 0) + amount
+        shard.busy = False
+
+    def reset(self):
+        self.detach()
+
+    def detach(self) -> List[MetricsShard]:
+        """
+        Swap the shards for empty ones at once and return the old shards, the threads record into new shards after.
+        """
+        with self.__lock:
+            shards, self.__shards = self.__shards, []
+            self.__local = threading.local()
+            for shard in shards:
+                shard.detached = True
+        # the writes begun before the swap are finished, so no sample is recorded into the shards after returned.
+        while any(shard.busy for shard in shards):
+            time.sleep(0)
+        return shards
+
+    def merged(self, shards: Optional[List[MetricsShard]] = None) -> MetricsShard:
+        if shards is None:
+            with self.__lock:
+                shards = list(self.__shards)
+        merged = MetricsShard()
+        for shard in shards:
+            for path, stats in tuple(shard.actions.items()):
+                merged_stats = merged.actions.get(path)
+                if merged_stats is None:
+                    merged_stats = merged.actions[path] = ActionStats()
+                merged_stats.count += stats.count
+                merged_stats.errors += stats.errors
+                merged_stats.in_flight += stats.in_flight
+                merged_stats.latency.merge(stats.latency)
+            for key, histogram in tuple(shard.histograms.items()):
+                merged.histograms.setdefault(key, Histogram()).merge(histogram)
+            for key, value in tuple(shard.counters.items()):
+                merged.counters[key] = merged.counters.get(key, 0) + value
+        return merged
+
+    def snapshot(self, shards: Optional[List[MetricsShard]] = None) -> Dict[str, Any]:
+        """
+        The merged metrics of all shards, or of the given ones, e.g. detached by `detach`.
+        """
+        merged = self.merged(shards)
+        histograms = {}
+        for (name, path), histogram in merged.histograms.items():
+            histograms.setdefault(name, {})[path] = histogram.summary()
+        counters = {}
+        for (name, path), value in merged.counters.items():
+            counters.setdefault(name, {})[path] = value
+        return {
+            "actions": {
+                path: {
+                    "count": stats.count,
+                    "errors": stats.errors,
+                    "in_flight": stats.in_flight,
+                    "latency_ns": stats.latency.summary()
+                }
+                for path, stats in merged.actions.items()
+            },
+            "histograms": histograms,
+            "counters": counters
+        }
+
+    def exposition(self, namespace: str = "plank") -> str:
+        """
+        The snapshot in the text exposition format of Prometheus.
+        """
+        merged = self.merged()
+        lines = []
+
+        def _label(path: str) -> str:
+            escaped = path.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+            return f'path="{escaped}"'
+
+        def _histogram(metric: str, path: str, histogram: Histogram, scale: float):
+            cumulative = 0
+            for upper, count in histogram.buckets():
+                cumulative += count
+                lines.append(f'{metric}_bucket{{{_label(path)},le="{upper * scale:.9g}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{{_label(path)},le="+Inf"}} {histogram.count}')
+            lines.append(f"{metric}_sum{{{_label(path)}}} {histogram.total * scale:.9g}")
+            lines.append(f"{metric}_count{{{_label(path)}}} {histogram.count}")
+
+        actions = sorted(merged.actions.items())
+        for metric, metric_type, attribute in [("action_requests_total", "counter", "count"),
+                                               ("action_errors_total", "counter", "errors"),
+                                               ("action_in_flight", "gauge", "in_flight")]:
+            lines.append(f"# TYPE {namespace}_{metric} {metric_type}")
+            for path, stats in actions:
+                lines.append(f"{namespace}_{metric}{{{_label(path)}}} {getattr(stats, attribute)}")
+
+        metric = f"{namespace}_action_latency_seconds"
+        lines.append(f"# TYPE {metric} histogram")
+        for path, stats in actions:
+            _histogram(metric, path, stats.latency, 1e-9)
+
+        for name in sorted({name for name, _ in merged.counters.keys()}):
+            lines.append(f"# TYPE {namespace}_{name} counter")
+            for (counter_name, path), value in sorted(merged.counters.items()):
+                if counter_name == name:
+                    lines.append(f"{namespace}_{name}{{{_label(path)}}} {value}")
+
+        for name in sorted({name for name, _ in merged.histograms.keys()}):
+            lines.append(f"# TYPE {namespace}_{name} histogram")
+            for (histogram_name, path), histogram in sorted(merged.histograms.items()):
+                if histogram_name == name:
+                    _histogram(f"{namespace}_{name}", path, histogram, 1.0)
+
+        return "\n".join(lines) + "\n"
+
+    def serve(self, host: str = "127.0.0.1", port: int = 9464, path: str = "/metrics") -> ThreadingHTTPServer:
+        """
+        Serve the exposition on a local endpoint from a daemon thread.
+        """
+        metrics = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != path:
+                    self.send_error(404)
+                    return
+                body = metrics.exposition().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any):
+                pass
+
+        server = ThreadingHTTPServer((host, port), _Handler)
+        thread = threading.Thread(target=server.serve_forever, name="plank-metrics", daemon=True)
+        thread.start()
+        return server
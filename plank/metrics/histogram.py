@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from typing import Dict, Optional, Iterable, List, Tuple
+
+# 2 ** SUB_BUCKET_BITS linear sub-buckets per power of two, the relative error of a bucket is below 1 / 2 ** SUB_BUCKET_BITS.
+SUB_BUCKET_BITS = 3
+_SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+_EXACT_LIMIT = _SUB_BUCKET_COUNT << 1
+
+
+def bucket_index(value: int) -> int:
+    if value < _EXACT_LIMIT:
+        return value if value > 0 else 0
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    return (shift << SUB_BUCKET_BITS) + (value >> shift)
+
+
+def bucket_bounds(index: int) -> Tuple[int, int]:
+    if index < _EXACT_LIMIT:
+        return index, index
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    mantissa = index - (shift << SUB_BUCKET_BITS)
+    return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+
+class Histogram:
+    """
+    A log-linear (HDR style) histogram of non-negative integers, e.g. latencies in nanoseconds.
+    It is not thread-safe, every thread records into its own histogram and they are merged on reading.
+    """
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    def record(self, value: int):
+        value = int(value)
+        index = bucket_index(value)
+        counts = self.counts
+        counts[index] = counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other: Histogram):
+        for index, count in tuple(other.counts.items()):
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    @classmethod
+    def merged(cls, histograms: Iterable[Histogram]) -> Histogram:
+        result = cls()
+        for histogram in histograms:
+            result.merge(histogram)
+        return result
+
+    def buckets(self) -> List[Tuple[int, int]]:
+        """
+        The (upper bound, count) of non-empty buckets in ascending order.
+        """
+        return [(bucket_bounds(index)[1], count) for index, count in sorted(self.counts.items())]
+
+    def percentile(self, percent: float) -> Optional[int]:
+        if self.count == 0:
+            return None
+        rank = max(1, int(round(self.count * percent / 100.0)))
+        seen = 0
+        for index, count in sorted(self.counts.items()):
+            seen += count
+            if seen >= rank:
+                lower, upper = bucket_bounds(index)
+                # the midpoint of bucket, clamped by the recorded extremes.
+                return min(max((lower + upper) // 2, self.min), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "min": self.min,
+            "max": self.max,
+            "mean": None if self.count == 0 else self.total / self.count,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "p999": self.percentile(99.9)
+        }
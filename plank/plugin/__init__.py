@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import List, Dict, Any, NoReturn, Optional, TYPE_CHECKING
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Dict, Any, NoReturn, Optional, Iterator, TYPE_CHECKING
 
 from plank.context import Context
 from plank.serving.interface import ServiceManagerable
@@ -8,6 +10,9 @@ from plank.serving.interface import ServiceManagerable
 if TYPE_CHECKING:
     from plank.serving.service import Service
 
+# The plugin which the running action or hook belongs to.
+_current_plugin: ContextVar[Optional[Plugin]] = ContextVar("plank.plugin.current", default=None)
+
 
 class Plugin(ServiceManagerable):
     """
@@ -44,8 +49,10 @@ class Plugin(ServiceManagerable):
         context = Context.standard(cls.__qualname__)
         context.set(key=plugin._name(), value=plugin)
         if cls is not Plugin:
+            # Plugin.install calls did_install.
             Plugin.install(plugin)
-        plugin.did_install()
+        else:
+            plugin.did_install()
 
     @classmethod
     def installed(cls) -> List[Plugin]:
@@ -59,14 +66,66 @@ class Plugin(ServiceManagerable):
             raise KeyError(f"Any plugin can be found with name: {name}, by type of plugin: {cls.__qualname__}.")
         return context.get(key=name)
 
+    @classmethod
+    def sort_by_dependencies(cls, plugins: List[Plugin]) -> List[Plugin]:
+        """
+        Sort plugins topologically by their dependencies, the discovered order is kept if they are independent.
+        """
+        plugins_by_name = {plugin.name: plugin for plugin in plugins}
+        for plugin in plugins:
+            for dependency in plugin.dependencies:
+                if dependency not in plugins_by_name:
+                    raise KeyError(f"The dependency: {dependency} of plugin: {plugin.name} is not discovered.")
+
+        ordered: List[Plugin] = []
+        visiting = set()
+        visited = set()
+
+        def _visit(plugin: Plugin, trail: List[str]):
+            if plugin.name in visited:
+                return
+            if plugin.name in visiting:
+                cycle = " -> ".join(trail + [plugin.name])
+                raise ValueError(f"The dependencies of plugins are circular: {cycle}.")
+            visiting.add(plugin.name)
+            for dependency in plugin.dependencies:
+                _visit(plugins_by_name[dependency], trail + [plugin.name])
+            visiting.remove(plugin.name)
+            visited.add(plugin.name)
+            ordered.append(plugin)
+
+        for plugin in plugins:
+            _visit(plugin, [])
+        return ordered
+
     @classmethod
     def current(cls) -> Optional[Plugin]:
+        plugin = _current_plugin.get()
+        if plugin is not None:
+            return plugin
         for subclass in Plugin.__inherited__:
+            if "current" not in subclass.__dict__:
+                continue
             plugin = subclass.current()
             if plugin is not None:
                 return plugin
         return None
 
+    @classmethod
+    @contextmanager
+    def activated(cls, plugin: Optional[Plugin]) -> Iterator[Optional[Plugin]]:
+        """
+        Make `plugin` the result of `Plugin.current()` in the current context.
+        """
+        if plugin is None:
+            yield None
+            return
+        token = _current_plugin.set(plugin)
+        try:
+            yield plugin
+        finally:
+            _current_plugin.reset(token)
+
     def __init_subclass__(cls, **kwargs):
         if cls not in Plugin.__inherited__:
             Plugin.__inherited__.append(cls)
@@ -79,12 +138,29 @@ class Plugin(ServiceManagerable):
     def delegate(self) -> Plugin.Delegate:
         return self._delegate()
 
+    @property
+    def dependencies(self) -> List[str]:
+        return self._dependencies()
+
     def _name(self) -> str:
         raise NotImplementedError(f"The name of Plugin({self.__class__.__name__}) not implemented.")
 
     def _delegate(self) -> Plugin.Delegate:
         raise NotImplementedError(f"The delegate of Plugin({self.__class__.__name__}) not implemented.")
 
+    def _dependencies(self) -> List[str]:
+        return []
+
+    def notify(self, hook_name: str, **kwargs) -> Any:
+        return getattr(self.delegate, hook_name)(plugin=self, **kwargs)
+
+    def preload(self):
+        """
+        The part of `load` which could run concurrently in a thread pool before it, e.g. importing modules.
+        It shouldn't call any hook, the hooks run on the thread calling `load`.
+        """
+        pass
+
     def load(self) -> NoReturn:
         pass
 
@@ -97,6 +173,9 @@ class Plugin(ServiceManagerable):
     def did_discover(self):
         pass
 
+    def _service_plugin(self) -> Optional[Plugin]:
+        return self
+
     def add_service(self, service: Service):
         super().add_service(service)
         service.__did_add_to_plugin__(plugin=self)
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Callable, Tuple, Iterable
+
+from plank import logger
+
+_PluginIndex__version = 1
+
+
+def _fingerprint(path: Optional[str]) -> Optional[Tuple[int, int]]:
+    if path is None:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _normalized(paths: Iterable[str]) -> List[str]:
+    # absolute and de-duplicated in order, e.g. `''` in `sys.path` is the working directory.
+    return list(dict.fromkeys(os.path.abspath(path) for path in paths))
+
+
+class PluginIndex:
+    """
+    The discovery cache of plugins stored in the data folder of workspace.
+    An entry is read again only if the fingerprint (mtime, size) of its source changed,
+    and the search paths are scanned again only if one of their fingerprints changed.
+    """
+
+    class Record:
+        __slots__ = ("module_name", "origin", "fingerprint", "plugin_info")
+
+        def __init__(self, module_name: str, origin: Optional[str], fingerprint: Optional[Tuple[int, int]],
+                     plugin_info: Optional[Dict[str, Any]]):
+            self.module_name = module_name
+            self.origin = origin
+            self.fingerprint = fingerprint
+            # None if `__plugin__` can't be read without importing the module.
+            self.plugin_info = plugin_info
+
+        @property
+        def name(self) -> Optional[str]:
+            return None if self.plugin_info is None else self.plugin_info.get("name")
+
+        @property
+        def delegate(self) -> Optional[str]:
+            return None if self.plugin_info is None else self.plugin_info.get("delegate")
+
+        def is_valid(self) -> bool:
+            return self.fingerprint is not None and _fingerprint(self.origin) == self.fingerprint
+
+        @classmethod
+        def from_dict(cls, record_dict: Dict[str, Any]) -> PluginIndex.Record:
+            fingerprint = record_dict.get("fingerprint")
+            return cls(module_name=record_dict["module_name"], origin=record_dict.get("origin"),
+                       fingerprint=None if fingerprint is None else tuple(fingerprint),
+                       plugin_info=record_dict.get("plugin_info"))
+
+        def dict(self) -> Dict[str, Any]:
+            return {
+                "module_name": self.module_name,
+                "origin": self.origin,
+                "fingerprint": None if self.fingerprint is None else list(self.fingerprint),
+                "plugin_info": self.plugin_info
+            }
+
+        def __repr__(self) -> str:
+            return f"{self.__class__.__name__}(module_name={self.module_name}, name={self.name}, origin={self.origin})"
+
+    @classmethod
+    def search_paths(cls) -> List[str]:
+        return _normalized(sys.path)
+
+    @property
+    def path(self) -> Path:
+        return self.__path
+
+    @property
+    def is_dirty(self) -> bool:
+        return self.__dirty
+
+    def __init__(self, path: Path):
+        self.__path = path
+        self.__prefixes: Dict[str, Dict[str, Any]] = {}
+        self.__dirty = False
+        self.load()
+
+    def load(self):
+        try:
+            with self.__path.open("r") as fp:
+                index_dict = json.load(fp)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warn(f"The plugin index {self.__path} is unreadable and would be rebuilt: {e}.")
+            return
+        if index_dict.get("version") != _PluginIndex__version:
+            return
+        self.__prefixes = index_dict.get("prefixes", {})
+
+    def save(self):
+        if not self.__dirty:
+            return
+        self.__path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.__path.with_name(f"{self.__path.name}.{os.getpid()}.tmp")
+        with temp_path.open("w") as fp:
+            json.dump({"version": _PluginIndex__version, "prefixes": self.__prefixes}, fp, indent=2)
+        os.replace(temp_path, self.__path)
+        self.__dirty = False
+
+    def prefixes(self) -> List[str]:
+        return list(self.__prefixes.keys())
+
+    def records(self, prefix: str) -> List[PluginIndex.Record]:
+        prefix_dict = self.__prefixes.get(prefix, {})
+        return [PluginIndex.Record.from_dict(record_dict) for record_dict in prefix_dict.get("records", [])]
+
+    def is_stale(self, prefix: str) -> bool:
+        prefix_dict = self.__prefixes.get(prefix)
+        if prefix_dict is None:
+            return True
+        search_paths = self.search_paths()
+        recorded_paths = prefix_dict.get("search_paths", {})
+        if _normalized(recorded_paths.keys()) != search_paths:
+            return True
+        return any(
+            _fingerprint(path) != (None if fingerprint is None else tuple(fingerprint))
+            for path, fingerprint in recorded_paths.items()
+        )
+
+    def discover(self, prefix: str, scan: Callable[[], Dict[str, Optional[str]]],
+                 read: Callable[[Path], Optional[Dict[str, Any]]], rebuild: bool = False) -> List[PluginIndex.Record]:
+        """
+        `scan` lists the module names with their origins on the search paths,
+        `read` reads the plugin info from an origin without importing it.
+        """
+        records = {} if rebuild else {record.module_name: record for record in self.records(prefix)}
+        if rebuild or self.is_stale(prefix):
+            origins = scan()
+            search_paths = {path: _fingerprint(path) for path in self.search_paths()}
+        else:
+            origins = {module_name: record.origin for module_name, record in records.items()}
+            search_paths = None
+
+        changed = search_paths is not None
+        updated_records = []
+        for module_name, origin in origins.items():
+            record = records.get(module_name)
+            if record is None or record.origin != origin or not record.is_valid():
+                plugin_info = None if origin is None else read(Path(origin))
+                record = PluginIndex.Record(module_name=module_name, origin=origin, fingerprint=_fingerprint(origin),
+                                            plugin_info=plugin_info)
+                changed = True
+            updated_records.append(record)
+
+        if changed:
+            prefix_dict = self.__prefixes.setdefault(prefix, {})
+            if search_paths is not None:
+                prefix_dict["search_paths"] = {
+                    path: None if fingerprint is None else list(fingerprint)
+                    for path, fingerprint in search_paths.items()
+                }
+            prefix_dict["records"] = [record.dict() for record in updated_records]
+            self.__dirty = True
+        return updated_records
@@ -1,27 +1,27 @@
 from __future__ import annotations
 
-import asyncio
+import ast
 import importlib
 import inspect
 import pkgutil
 import sys
 from pathlib import Path
-from typing import NoReturn, Dict, Any, Optional, List, Type, Union
+from typing import NoReturn, Dict, Any, Optional, List, Type, Union, Awaitable
 
-import nest_asyncio
 from plank import logger
 from plank.context import Context
 from plank.configuration import Configuration
-from plank.plugin import Plugin
+from plank.app.runner import LoopRunner
+from plank.plugin import Plugin, _current_plugin
 from plank.plugin.asset import Asset
+from plank.plugin.index import PluginIndex
 from plank.serving.service import Service
 
-nest_asyncio.apply()
-
 
 class ModulePlugin(Plugin):
     __package_name_mappings__: Dict[str, Plugin] = {}
     __available_prefix__: List[str] = []
+    __module_plugins__: Dict[Optional[str], Optional[Plugin]] = {}
 
     class PluginContext(Context):
         def store(self, value: Any, for_key: str):
@@ -36,27 +36,101 @@ class ModulePlugin(Plugin):
     @classmethod
     def __discover_module(cls, plugin_prefix: str, paths: Optional[List[str]] = None) -> Dict[str, pkgutil.ModuleInfo]:
         return {
-            name: importlib.import_module(name)
-            for finder, name, ispkg in pkgutil.iter_modules(paths)
-            if name.startswith(plugin_prefix)
+            module_info.name: module_info
+            for module_info in pkgutil.iter_modules(paths)
+            if module_info.name.startswith(plugin_prefix)
         }
 
     @classmethod
-    def discover(cls, plugin_prefix: str) -> List[Plugin]:
-        cls.__available_prefix__.append(plugin_prefix)
+    def module_origin(cls, module_info: pkgutil.ModuleInfo) -> Optional[Path]:
+        try:
+            spec = module_info.module_finder.find_spec(module_info.name)
+        except (ImportError, AttributeError):
+            return None
+        if spec is None or spec.origin is None or not spec.has_location:
+            return None
+        return Path(spec.origin)
+
+    @classmethod
+    def read_plugin_info(cls, origin: Path) -> Optional[Dict[str, Any]]:
+        """
+        Read the `__plugin__` declaration from the source without executing the module.
+        Returns None if it is not declared as a literal dict.
+        """
+        try:
+            tree = ast.parse(origin.read_bytes(), filename=str(origin))
+        except (OSError, SyntaxError, ValueError):
+            return None
+        for node in tree.body:
+            if isinstance(node, ast.Assign):
+                targets = node.targets
+            elif isinstance(node, ast.AnnAssign) and node.value is not None:
+                targets = [node.target]
+            else:
+                continue
+            if any(isinstance(target, ast.Name) and target.id == "__plugin__" for target in targets):
+                try:
+                    plugin_info = ast.literal_eval(node.value)
+                except ValueError:
+                    return None
+                return plugin_info if isinstance(plugin_info, dict) else None
+        return None
+
+    @classmethod
+    def scan(cls, plugin_prefix: str) -> Dict[str, pkgutil.ModuleInfo]:
         current_path = str(Path.cwd())
-        if current_path not in sys.path:
-            sys.path.append(current_path)
         modules_dict = {}
         site_package_modules = cls.__discover_module(paths=None, plugin_prefix=plugin_prefix)
         current_path_modules = cls.__discover_module(paths=[current_path], plugin_prefix=plugin_prefix)
         modules_dict.update(site_package_modules)
         modules_dict.update(current_path_modules)
+        return modules_dict
 
-        plugins = [
-            cls.from_module(module=module)
-            for name, module in modules_dict.items()
-        ]
+    @classmethod
+    def index(cls) -> Optional[PluginIndex]:
+        try:
+            configuration = Configuration.default()
+            data_path = configuration.path.get_path("data")
+        except (AttributeError, AssertionError, TypeError):
+            # no configuration for the data folder, discover without the index.
+            return None
+        return PluginIndex(path=data_path / "plugin.index.json")
+
+    @classmethod
+    def index_records(cls, plugin_prefix: str, rebuild: bool = False) -> Optional[List[PluginIndex.Record]]:
+        index = cls.index()
+        if index is None:
+            return None
+
+        def _scan() -> Dict[str, Optional[str]]:
+            origins = {}
+            for name, module_info in cls.scan(plugin_prefix=plugin_prefix).items():
+                origin = cls.module_origin(module_info=module_info)
+                origins[name] = None if origin is None else str(origin)
+            return origins
+
+        records = index.discover(prefix=plugin_prefix, scan=_scan, read=cls.read_plugin_info, rebuild=rebuild)
+        try:
+            index.save()
+        except OSError as e:
+            logger.warn(f"The plugin index can't be saved at {index.path}: {e}.")
+        return records
+
+    @classmethod
+    def discover(cls, plugin_prefix: str) -> List[Plugin]:
+        cls.__available_prefix__.append(plugin_prefix)
+        current_path = str(Path.cwd())
+        if current_path not in sys.path:
+            sys.path.append(current_path)
+
+        records = cls.index_records(plugin_prefix=plugin_prefix)
+        if records is not None:
+            plugins = [cls.from_index_record(record=record) for record in records]
+        else:
+            plugins = [
+                cls.from_module_info(module_info=module_info)
+                for name, module_info in cls.scan(plugin_prefix=plugin_prefix).items()
+            ]
 
         for plugin in plugins:
             plugin.did_discover()
@@ -65,20 +139,24 @@ class ModulePlugin(Plugin):
 
     @classmethod
     def caller_plugin(cls, index=-1) -> Optional[Plugin]:
-        currentframe = inspect.currentframe()
-        getouterframes = inspect.getouterframes(currentframe, 2)
-        modules = map(lambda frameinfo: inspect.getmodule(frameinfo.frame), getouterframes)
-        configuration = Configuration.default()
-        filtered = filter(
-            lambda module: module is not None and hasattr(module, "__package__") and str(module.__package__).startswith(
-                f"{configuration.plugin.prefix}_"), modules
-        )
-
-        try:
-            module = next(filtered)
-            return cls.plugin_by_module(module=module)
-        except:
-            return None
+        """
+        Walk up the stack for the first frame whose module belongs to an installed plugin.
+        The plugin of each module name is cached until another plugin is installed.
+        """
+        mappings = cls.__package_name_mappings__
+        module_plugins = cls.__module_plugins__
+        frame = sys._getframe(1)
+        while frame is not None:
+            module_name = frame.f_globals.get("__name__")
+            try:
+                plugin = module_plugins[module_name]
+            except KeyError:
+                plugin = None if module_name is None else mappings.get(cls.clear_package_name(module_name))
+                module_plugins[module_name] = plugin
+            if plugin is not None:
+                return plugin
+            frame = frame.f_back
+        return None
 
     @classmethod
     def clear_package_name(cls, package_name: str) -> str:
@@ -96,6 +174,9 @@ class ModulePlugin(Plugin):
 
     @classmethod
     def current(cls) -> Plugin:
+        plugin = _current_plugin.get()
+        if plugin is not None:
+            return plugin
         return cls.caller_plugin()
 
     @classmethod
@@ -104,60 +185,99 @@ class ModulePlugin(Plugin):
         init_parameters["module"] = module
         return cls(**init_parameters)
 
+    @classmethod
+    def from_module_info(cls: Type[ModulePlugin], module_info: pkgutil.ModuleInfo):
+        origin = cls.module_origin(module_info=module_info)
+        plugin_info = None if origin is None else cls.read_plugin_info(origin=origin)
+        if plugin_info is None:
+            # `__plugin__` is not a literal, the module has to be imported to read it.
+            return cls.from_module(module=importlib.import_module(module_info.name))
+        init_parameters = cls.construct_parameters(plugin_info)
+        init_parameters["module"] = module_info.name
+        return cls(**init_parameters)
+
+    @classmethod
+    def from_index_record(cls: Type[ModulePlugin], record: PluginIndex.Record):
+        if record.plugin_info is None:
+            return cls.from_module(module=importlib.import_module(record.module_name))
+        init_parameters = cls.construct_parameters(record.plugin_info)
+        init_parameters["module"] = record.module_name
+        return cls(**init_parameters)
+
     @classmethod
     def construct_parameters(cls, plugin_info: Dict[str, Any]) -> Dict[str, Any]:
         k_ModulePlugin__name = "name"
         k_ModulePlugin__delegate = "delegate"
-
-        def _parse_type(description: Optional[str]):
-            if description is None:
-                return None
-            module_str, class_str = description.split(":")
-            module = importlib.import_module(module_str)
-            parsed_type = module.__dict__[class_str]
-            return parsed_type
-
-        def _gen_delegate(delegate_str: Optional[str]):
-            delegate_type = _parse_type(delegate_str)
-            return delegate_type()
+        k_ModulePlugin__dependencies = "dependencies"
 
         name = plugin_info[k_ModulePlugin__name]
 
-        try:
-            _delegate = _gen_delegate(delegate_str=plugin_info.get(k_ModulePlugin__delegate))
-        except Exception as e:
-            logger.error(f"_gen_delegate failed: {e}.")
-            raise e
-
         return {
             "name": name,
-            "delegate": _delegate
+            "delegate": plugin_info.get(k_ModulePlugin__delegate),
+            "dependencies": list(plugin_info.get(k_ModulePlugin__dependencies, []))
         }
 
+    @classmethod
+    def make_delegate(cls, delegate_str: str) -> Plugin.Delegate:
+        try:
+            module_str, class_str = delegate_str.split(":")
+            module = importlib.import_module(module_str)
+            delegate_type = module.__dict__[class_str]
+            return delegate_type()
+        except Exception as e:
+            logger.error(f"make_delegate failed: {e}.")
+            raise e
+
     @property
     def module(self):
+        if self.__module is None:
+            self.__module = importlib.import_module(self.__module_name)
         return self.__module
 
+    @property
+    def module_name(self) -> str:
+        return self.__module_name
+
+    @property
+    def is_imported(self) -> bool:
+        return self.__module is not None
+
     @property
     def package_name(self):
-        return self.__class__.clear_package_name(self.module.__package__)
+        return self.__class__.clear_package_name(self.__module_name)
 
     @property
     def data_folder_path(self) -> Path:
         return self.__data_folder_path
 
-    def services(self) -> List[Service]:
-        return Service.registered()
-
     @property
     def context(self) -> ModulePlugin.PluginContext:
         return self.__context
 
-    def __init__(self, name: str, module, delegate: Optional[Plugin.Delegate] = None) -> None:
+    def __init__(self, name: str, module, delegate: Optional[Union[str, Plugin.Delegate]] = None,
+                 dependencies: Optional[List[str]] = None) -> None:
+        """
+        `module` could be given by name, it would be imported on the first use. `delegate` could be given by name too,
+        it would be imported by the first hook.
+        `dependencies` are the names of plugins which should be loaded before this one.
+        """
         self.__name = name
-        self.__module = module
-        self.__delegate = delegate or Plugin.Delegate()
-        self.__context = self.__class__.PluginContext.standard(namespace=f"plugin.config.{module.__package__}")
+        self.__dependencies = dependencies or []
+        if isinstance(module, str):
+            self.__module = None
+            self.__module_name = module
+        else:
+            self.__module = module
+            self.__module_name = module.__name__
+        if isinstance(delegate, str):
+            self.__delegate = None
+            self.__delegate_str = delegate
+        else:
+            self.__delegate = delegate or Plugin.Delegate()
+            self.__delegate_str = None
+        self.__context = self.__class__.PluginContext.standard(
+            namespace=f"plugin.config.{self.package_name}")
         self.__context.set(key="plugin", value=name)
         configuration = Configuration.default()
         self.__data_folder_path = configuration.path.get_path("plugin", extra_info={"PLUGIN": name})
@@ -165,16 +285,47 @@ class ModulePlugin(Plugin):
     def _name(self) -> str:
         return self.__name
 
+    def _dependencies(self) -> List[str]:
+        return self.__dependencies
+
     def _delegate(self) -> Plugin.Delegate:
+        if self.__delegate is None:
+            self.__delegate = self.__class__.make_delegate(self.__delegate_str)
         return self.__delegate
 
+    def notify(self, hook_name: str, **kwargs) -> Any:
+        """
+        Call the hook of delegate, which is imported by the first hook, e.g. `plugin_did_discover`.
+        """
+        self._delegate()
+        with Plugin.activated(self):
+            cor_or_not = super().notify(hook_name, **kwargs)
+        if inspect.isawaitable(cor_or_not):
+            cor_or_not = LoopRunner.shared().run_sync(self.__activated_hook(cor_or_not))
+        return cor_or_not
+
+    async def __activated_hook(self, awaitable: Awaitable) -> Any:
+        with Plugin.activated(self):
+            return await awaitable
+
     def will_load(self) -> NoReturn:
         pass
 
+    def import_module(self):
+        module = self.module
+        self._delegate()
+        return module
+
+    def preload(self):
+        with Plugin.activated(self):
+            self.import_module()
+
     def load(self) -> NoReturn:
-        self.will_load()
-        logger.info(f"plugin did load: {self.name}")
-        self.delegate.plugin_did_load(plugin=self)
+        with Plugin.activated(self):
+            self.import_module()
+            self.will_load()
+            logger.info(f"plugin did load: {self.name}")
+            self.delegate.plugin_did_load(plugin=self)
 
     def launch(self, **options) -> NoReturn:
         pass
@@ -186,20 +337,22 @@ class ModulePlugin(Plugin):
         pass
 
     def unload(self):
-        self.delegate.plugin_did_unload(plugin=self)
+        with Plugin.activated(self):
+            self.delegate.plugin_did_unload(plugin=self)
         self.did_unload()
+        Service.registry().remove_plugin(self.name)
+        from plank.server.action.caching import ResultCache
+        ResultCache.invalidate_plugin(self.name)
 
     def did_install(self):
         self.__class__.__package_name_mappings__[self.package_name] = self
+        self.__class__.__module_plugins__.clear()
         logger.info(f"plugin did install: {self.name}")
-
-        cor_or_not = self.delegate.plugin_did_install(plugin=self)
-        if inspect.isawaitable(cor_or_not):
-            asyncio.run(cor_or_not)
+        self.notify("plugin_did_install")
 
     def did_discover(self):
         logger.info(f"plugin did discover: {self.name}")
-        self.delegate.plugin_did_discover(plugin=self)
+        self.notify("plugin_did_discover")
 
     def asset(self, name: str) -> Optional[Asset]:
         try:
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import signal
+import threading
 from collections import namedtuple
 from pathlib import Path
 from typing import Optional, Dict, Any, TYPE_CHECKING
@@ -7,6 +9,8 @@ from typing import Optional, Dict, Any, TYPE_CHECKING
 from plank.app import Application
 from plank.context import Context
 from plank.configuration import Configuration
+from plank.server.route import RouteTable, RouteMatch, normalize
+from plank.utils.path import clearify
 
 if TYPE_CHECKING:
     from plank.server.action import Action
@@ -44,12 +48,16 @@ class Server:
 
     @property
     def actions(self) -> Dict[str, Action]:
-        return self.__registered_backends
+        return self.__routes.actions()
+
+    @property
+    def routes(self) -> RouteTable:
+        return self.__routes
 
     def __init__(self, application: Application, delegate: Optional[Server.Delegate] = None,
                  path_prefix: Optional[str] = None):
         self.__bind_address = None
-        self.__registered_backends = {}
+        self.__routes = RouteTable()
         self.__application = application
         self.__path_prefix = path_prefix
 
@@ -64,17 +72,28 @@ class Server:
         standard_context.update(vars)
 
     def add_action(self, backend: Action):
-        self.__registered_backends[backend.routing_path()] = backend
+        self.__routes.add(backend.routing_path(), backend)
 
     def add_actions(self, *backends: Action):
         for backend in backends:
             self.add_action(backend=backend)
 
     def remove_action(self, path: str) -> Action:
-        return self.__registered_backends.pop(path)
+        return self.__routes.remove(path)
 
     def get_action(self, key: str) -> Optional[Action]:
-        return self.__registered_backends.get(key)
+        match = self.match_action(key)
+        return None if match is None else match.action
+
+    def match_action(self, path: str) -> Optional[RouteMatch]:
+        match = self.__routes.match(path)
+        if match is None and self.path_prefix:
+            # routing paths may be registered without the prefix the server is mounted on.
+            prefix = f"/{clearify(self.path_prefix)}"
+            path = normalize(path)
+            if path == prefix or path.startswith(f"{prefix}/"):
+                match = self.__routes.match(path[len(prefix):] or "/")
+        return match
 
     def launch(self, **options):
         self.application.launch(**options)
@@ -82,6 +101,33 @@ class Server:
     def listen(self, address: BindAddress):
         self.__bind_address = address
 
+    async def start(self, **options):
+        """
+        Start serving on the bind address, implemented by the servers of transports.
+        """
+        raise NotImplementedError
+
+    async def stop(self):
+        raise NotImplementedError
+
+    def run(self, **start_options):
+        """
+        Serve on the loop of the application runner until SIGINT or SIGTERM.
+        """
+        runner = self.application.runner
+        runner.run_sync(self.start(**start_options))
+        stopped = threading.Event()
+        previous_handler = signal.signal(signal.SIGTERM, lambda signum, frame: stopped.set())
+        try:
+            stopped.wait()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            try:
+                runner.run_sync(self.stop())
+            finally:
+                signal.signal(signal.SIGTERM, previous_handler)
+
     def __safe_call_delegate_method(self, method_name: str) -> Any:
         if hasattr(self.delegate, method_name):
             method = getattr(self.delegate, method_name)
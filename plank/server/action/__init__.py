@@ -1,8 +1,17 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Optional, Union, Tuple, Dict, TYPE_CHECKING
 
-from plank.server.message import Request, Response
+from plank.metrics import Metrics
+from plank.server.action.caching import ResultCache, canonical_arguments
+from plank.server.message import Request, Response, SlottedRequest, SlottedResponse, response_for
+from plank.server.message.streaming import StreamingResponse, is_streaming
+
+if TYPE_CHECKING:
+    from plank.plugin import Plugin
+    from plank.server.action.binder import ArgumentBinder
+    from plank.server.action.coalescing import Coalescer
+    from plank.server.action.execution import ExecutionPolicy
 
 
 class Action:
@@ -10,8 +19,61 @@ class Action:
     def routing_path(self) -> str:
         raise NotImplementedError
 
-    async def receive(self, request: Request) -> Response:
+    def plugin(self) -> Optional[Plugin]:
+        return None
+
+    async def receive(self, request: Union[Request, SlottedRequest]) -> Union[
+            Response, SlottedResponse, StreamingResponse]:
         pass
 
     def reverse(self, response: Response) -> Any:
         pass
+
+    async def _receive(self, request: Union[Request, SlottedRequest], binder: ArgumentBinder,
+                       execution: ExecutionPolicy, cache: Optional[ResultCache] = None,
+                       coalescer: Optional[Coalescer] = None, stream_buffer: int = 16) -> Union[
+            Response, SlottedResponse, StreamingResponse]:
+        """
+        Binds, caches, coalesces and measures a request for the subclasses, the end point is called by `_call`.
+        """
+        path = self.routing_path()
+        metrics = Metrics.default()
+        start = metrics.begin(path)
+        try:
+            args, kwargs = binder.bind(request.arguments)
+            key = None
+            if cache is not None or coalescer is not None:
+                key = canonical_arguments(args, kwargs)
+            hit, response_value = (False, None) if key is None or cache is None else cache.get(key)
+            if not hit:
+                if key is not None and coalescer is not None:
+                    response_value = await coalescer.run(
+                        key, lambda: self.__perform(args, kwargs, key, execution, cache, stream_buffer, start))
+                else:
+                    response_value = await self.__perform(args, kwargs, key, execution, cache, stream_buffer, start)
+        except BaseException:
+            metrics.end(path, start, error=True)
+            raise
+        if isinstance(response_value, StreamingResponse):
+            # measured until the stream ends.
+            return response_value
+        metrics.end(path, start)
+        return response_for(request, response_value)
+
+    async def _call(self, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+        """
+        The value of the end point for the bound arguments.
+        """
+        raise NotImplementedError
+
+    async def __perform(self, args: Tuple[Any, ...], kwargs: Dict[str, Any], key: Any, execution: ExecutionPolicy,
+                        cache: Optional[ResultCache], stream_buffer: int, start: int) -> Any:
+        response_value = await self._call(args, kwargs)
+        if is_streaming(response_value):
+            if key is not None:
+                raise TypeError(f"The streaming result of {self.routing_path()} can't be cached or coalesced.")
+            return StreamingResponse(response_value, max_buffered=stream_buffer, execution=execution,
+                                     plugin=self.plugin(), path=self.routing_path(), start=start)
+        if key is not None and cache is not None:
+            cache.put(key, response_value)
+        return response_value
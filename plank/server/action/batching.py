@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import time
+import weakref
+from typing import Callable, Dict, Any, Optional, Tuple, List, Union, Set
+
+from plank.metrics import Metrics
+from plank.plugin import Plugin
+from plank.server.action.binder import BindingError
+from plank.server.action.execution import ExecutionPolicy
+
+
+class BatchPolicy:
+    """
+    The micro-batching of an action, declared by `@action(..., batch={"max_size": 64, "max_wait": 0.005})`.
+    A batch is flushed when it holds `max_size` requests or its first request waited `max_wait` seconds.
+    """
+
+    @classmethod
+    def from_action_args(cls, action_args: Dict[str, Any]) -> Optional[BatchPolicy]:
+        batch: Union[None, bool, int, Dict[str, Any]] = action_args.get("batch")
+        if batch is None or batch is False:
+            return None
+        if batch is True:
+            return cls()
+        if isinstance(batch, int):
+            return cls(max_size=batch)
+        return cls(**batch)
+
+    @property
+    def max_size(self) -> int:
+        return self.__max_size
+
+    @property
+    def max_wait(self) -> float:
+        return self.__max_wait
+
+    def __init__(self, max_size: int = 32, max_wait: float = 0.005):
+        assert max_size > 0, f"The max_size of batch should be positive, but {max_size} given."
+        assert max_wait >= 0, f"The max_wait of batch should not be negative, but {max_wait} given."
+        self.__max_size = max_size
+        self.__max_wait = max_wait
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(max_size={self.__max_size}, max_wait={self.__max_wait})"
+
+
+class Batcher:
+    """
+    Queues the bound arguments of concurrent requests and calls the end point once per batch.
+    Every parameter of the end point receives the list of its values in the batch, e.g. `score(items: List[Item])`,
+    and it returns a list of results in the same order, one for each request.
+    A request omitting a parameter with a default is given the default in its column, and a request whose arguments
+    don't fit the columns of its batch fails alone by `BindingError`.
+    """
+
+    class Pending:
+        __slots__ = ("requests", "timer")
+
+        def __init__(self):
+            # [(args, kwargs, future, enqueued_ns)]
+            self.requests: List[Tuple[Tuple[Any, ...], Dict[str, Any], asyncio.Future, int]] = []
+            self.timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def policy(self) -> BatchPolicy:
+        return self.__policy
+
+    def __init__(self, path: str, end_point: Callable, policy: BatchPolicy, execution: ExecutionPolicy,
+                 plugin_provider: Optional[Callable[[], Optional[Plugin]]] = None):
+        self.__path = path
+        self.__end_point = end_point
+        self.__policy = policy
+        self.__execution = execution
+        self.__plugin_provider = plugin_provider
+        signature_parameters = inspect.signature(end_point).parameters.values()
+        parameters = [
+            parameter for parameter in signature_parameters
+            if parameter.kind in (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+        ]
+        # the parameters by names, the names of positional arguments are skipped by their count.
+        self.__parameters: Dict[str, inspect.Parameter] = {parameter.name: parameter for parameter in parameters}
+        self.__positional_names = [
+            parameter.name for parameter in parameters if parameter.kind is inspect.Parameter.POSITIONAL_OR_KEYWORD
+        ]
+        # the end point takes `**kwargs`, the keys are checked against the first request of batch instead.
+        self.__var_keyword = any(parameter.kind is inspect.Parameter.VAR_KEYWORD for parameter in signature_parameters)
+        # the queues by event loop, the futures of a batch belong to the loop it was queued in.
+        self.__pending: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        # the batches being performed, the loop only keeps weak references to its tasks.
+        self.__performing: Set[asyncio.Task] = set()
+
+    async def submit(self, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+        loop = asyncio.get_running_loop()
+        pending = self.__pending.get(loop)
+        if pending is None:
+            pending = self.__pending[loop] = Batcher.Pending()
+        kwargs = self.__complete(args, kwargs, pending)
+        future = loop.create_future()
+        pending.requests.append((args, kwargs, future, time.perf_counter_ns()))
+        if len(pending.requests) >= self.__policy.max_size:
+            self.__flush(loop, pending)
+        elif pending.timer is None:
+            pending.timer = loop.call_later(self.__policy.max_wait, self.__flush, loop, pending)
+        return await future
+
+    def __complete(self, args: Tuple[Any, ...], kwargs: Dict[str, Any], pending: Batcher.Pending) -> Dict[str, Any]:
+        # every request of a batch should have the same columns, the defaults fill the omitted parameters.
+        positional = set(self.__positional_names[:len(args)])
+        missing = [name for name in self.__parameters.keys() if name not in kwargs and name not in positional]
+        if len(missing) > 0:
+            kwargs = dict(kwargs)
+            for name in missing:
+                default = self.__parameters[name].default
+                if default is inspect.Parameter.empty:
+                    raise BindingError(f"The argument {name} is missing.")
+                kwargs[name] = default
+        if not self.__var_keyword:
+            unknown = [name for name in kwargs.keys() if name not in self.__parameters or name in positional]
+            if len(unknown) > 0:
+                raise BindingError(f"The arguments of {self.__path} had unknown keys: {', '.join(sorted(unknown))}.")
+        if len(pending.requests) > 0:
+            first_args, first_kwargs, _, _ = pending.requests[0]
+            if len(args) != len(first_args) or kwargs.keys() != first_kwargs.keys():
+                raise BindingError(f"The arguments of {self.__path} don't fit the columns of its batch: "
+                                   f"{len(args)} positional and {', '.join(sorted(kwargs.keys()))} given, "
+                                   f"but {len(first_args)} positional and {', '.join(sorted(first_kwargs.keys()))} "
+                                   f"expected.")
+        return kwargs
+
+    def __flush(self, loop: asyncio.AbstractEventLoop, pending: Batcher.Pending):
+        if pending.timer is not None:
+            pending.timer.cancel()
+            pending.timer = None
+        max_size = self.__policy.max_size
+        while len(pending.requests) > 0:
+            batch, pending.requests = pending.requests[:max_size], pending.requests[max_size:]
+            if len(batch) < max_size and len(pending.requests) == 0 and not self.__is_due(batch):
+                pending.requests = batch
+                break
+            self.__report(batch)
+            task = loop.create_task(self.__perform(batch))
+            self.__performing.add(task)
+            task.add_done_callback(self.__performed)
+        if len(pending.requests) > 0:
+            waited = (time.perf_counter_ns() - pending.requests[0][3]) / 1e9
+            pending.timer = loop.call_later(max(0.0, self.__policy.max_wait - waited), self.__flush, loop, pending)
+
+    def __performed(self, task: asyncio.Task):
+        self.__performing.discard(task)
+        if not task.cancelled():
+            task.exception()
+
+    def __is_due(self, batch: List[Tuple[Tuple[Any, ...], Dict[str, Any], asyncio.Future, int]]) -> bool:
+        return time.perf_counter_ns() - batch[0][3] >= self.__policy.max_wait * 1e9
+
+    def __report(self, batch: List[Tuple[Tuple[Any, ...], Dict[str, Any], asyncio.Future, int]]):
+        metrics = Metrics.default()
+        metrics.observe("action_batch_fill_percent", self.__path, len(batch) * 100 // self.__policy.max_size)
+        now = time.perf_counter_ns()
+        for _, _, _, enqueued in batch:
+            metrics.observe("action_batch_queue_delay_ns", self.__path, now - enqueued)
+
+    def __columns(self, batch: List[Tuple[Tuple[Any, ...], Dict[str, Any], asyncio.Future, int]]) \
+            -> Tuple[Tuple[Any, ...], Dict[str, Any]]:
+        args_count = len(batch[0][0])
+        args = tuple([request[0][index] for request in batch] for index in range(args_count))
+        kwargs = {name: [request[1][name] for request in batch] for name in batch[0][1].keys()}
+        return args, kwargs
+
+    async def __perform(self, batch: List[Tuple[Tuple[Any, ...], Dict[str, Any], asyncio.Future, int]]):
+        plugin = None if self.__plugin_provider is None else self.__plugin_provider()
+        try:
+            args, kwargs = self.__columns(batch)
+            with Plugin.activated(plugin):
+                results = list(await self.__execution.run(self.__end_point, args, kwargs))
+            if len(results) != len(batch):
+                raise ValueError(f"The batch end point of {self.__path} should return {len(batch)} results, "
+                                 f"but {len(results)} returned.")
+        except BaseException as e:
+            for _, _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, _, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import inspect
+import typing
+from enum import Enum
+from typing import Callable, Dict, Any, Tuple, List, Optional, FrozenSet, Type
+
+from pydantic import BaseModel, Extra, Field, create_model, validate_model
+
+
+class BindingError(ValueError):
+    """
+    The arguments of a request can't be bound onto the parameters of an end point, e.g. a missing argument,
+    or an invalid one in the `validate` mode.
+    """
+
+
+def _model_type(annotation: Any) -> Optional[type]:
+    if inspect.isclass(annotation) and issubclass(annotation, BaseModel):
+        return annotation
+    return None
+
+
+def _element_annotation(annotation: Any) -> Any:
+    if typing.get_origin(annotation) in (list, List):
+        element_args = typing.get_args(annotation)
+        return element_args[0] if len(element_args) > 0 else Any
+    return annotation
+
+
+class ArgumentBinder:
+    """
+    The precomputed plan to bind `Request.arguments` onto the parameters of an end point.
+    It is compiled once per action, so dispatching a request does not inspect the end point again.
+    """
+
+    class Strategy(Enum):
+        # perform(model) with a single BaseModel parameter.
+        MODEL = "model"
+        # perform(**arguments) with a single plain parameter.
+        KEYWORDS = "keywords"
+        # perform(name=argument, ...) for every parameter.
+        PARAMETERS = "parameters"
+
+    class Mode(Enum):
+        # models are constructed without validation, e.g. for trusted callers.
+        NONE = "none"
+        # arguments are validated and the unknown keys are rejected by `BindingError`.
+        VALIDATE = "validate"
+
+    class Parameter:
+        __slots__ = ("name", "model_type", "default")
+
+        def __init__(self, name: str, model_type: Optional[type], default: Any = inspect.Parameter.empty):
+            self.name = name
+            self.model_type = model_type
+            # `inspect.Parameter.empty` if the argument is required.
+            self.default = default
+
+    class Schema:
+        """
+        The accepted keys of a model computed once, the validators are the cached fields of pydantic.
+        """
+        __slots__ = ("model_type", "keys", "allow_extra", "field_names")
+
+        def __init__(self, model_type: Type[BaseModel], field_names: Optional[Dict[str, str]] = None):
+            self.model_type = model_type
+            keys = {field.alias for field in model_type.__fields__.values()}
+            if model_type.__config__.allow_population_by_field_name:
+                keys.update(model_type.__fields__.keys())
+            self.keys = frozenset(keys)
+            self.allow_extra = model_type.__config__.extra is Extra.allow
+            # the names of parameters by the names of fields, for the model of parameters.
+            self.field_names = field_names
+
+        def validate(self, data: Any) -> BaseModel:
+            model_type = self.model_type
+            if not isinstance(data, dict):
+                raise BindingError(f"The arguments of {model_type.__name__} should be an object, "
+                                   f"but {data.__class__.__name__} given.")
+            if not self.allow_extra and not self.keys.issuperset(data.keys()):
+                unknown = ", ".join(sorted(str(key) for key in data.keys() if key not in self.keys))
+                raise BindingError(f"The arguments of {model_type.__name__} had unknown keys: {unknown}.")
+            values, fields_set, error = validate_model(model_type, data)
+            if error is not None:
+                raise BindingError(str(error)) from error
+            # the same as `BaseModel.__init__` after validation.
+            model = model_type.__new__(model_type)
+            object.__setattr__(model, "__dict__", values)
+            object.__setattr__(model, "__fields_set__", fields_set)
+            model._init_private_attributes()
+            return model
+
+        def validate_parameters(self, data: Any) -> Dict[str, Any]:
+            values = self.validate(data).__dict__
+            return {parameter_name: values[field_name] for field_name, parameter_name in self.field_names.items()}
+
+    @classmethod
+    def compile(cls, end_point: Callable, batched: bool = False,
+                mode: ArgumentBinder.Mode = Mode.NONE) -> ArgumentBinder:
+        """
+        A `batched` end point receives a list for each of its parameters, e.g. `items: List[Item]`,
+        so a request is bound by the element types of the parameters.
+        The `validate` mode raises TypeError for an end point with `*args`, `**kwargs` or positional-only parameters.
+        """
+        sig = inspect.signature(end_point)
+        try:
+            hints = typing.get_type_hints(end_point)
+        except Exception:
+            # the annotations can't be resolved, e.g. names imported under TYPE_CHECKING.
+            hints = {}
+        annotations = {
+            name: _element_annotation(hints.get(name, parameter.annotation)) if batched else hints.get(
+                name, parameter.annotation)
+            for name, parameter in sig.parameters.items()
+        }
+        parameters = [
+            ArgumentBinder.Parameter(name=name, model_type=_model_type(annotations[name]), default=parameter.default)
+            for name, parameter in sig.parameters.items()
+        ]
+
+        model_keys = frozenset()
+        if len(parameters) == 1:
+            model_type = parameters[0].model_type
+            if model_type is not None:
+                strategy = ArgumentBinder.Strategy.MODEL
+                model_keys = frozenset(field.alias for field in model_type.__fields__.values())
+            else:
+                strategy = ArgumentBinder.Strategy.KEYWORDS
+        else:
+            strategy = ArgumentBinder.Strategy.PARAMETERS
+
+        schema = None
+        if mode is ArgumentBinder.Mode.VALIDATE:
+            if strategy is ArgumentBinder.Strategy.MODEL:
+                schema = ArgumentBinder.Schema(parameters[0].model_type)
+            elif all(parameter.kind in (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+                     for parameter in sig.parameters.values()):
+                schema = cls.__parameters_schema(end_point, sig, annotations)
+            else:
+                # the arguments of `*args`, `**kwargs` or positional-only parameters have no fields to validate.
+                name = getattr(end_point, "__qualname__", repr(end_point))
+                raise TypeError(f"The arguments of {name}{sig} can't be validated, "
+                                f"please bind it in the `none` mode or declare its parameters by names.")
+
+        return cls(parameters=parameters, strategy=strategy, model_keys=model_keys, mode=mode, schema=schema)
+
+    @classmethod
+    def __parameters_schema(cls, end_point: Callable, sig: inspect.Signature,
+                            annotations: Dict[str, Any]) -> ArgumentBinder.Schema:
+        # the fields are aliased by the names of parameters, so parameters can shadow the attributes of BaseModel.
+        fields = {}
+        field_names = {}
+        for index, (name, parameter) in enumerate(sig.parameters.items()):
+            annotation = annotations[name]
+            default = ... if parameter.default is inspect.Parameter.empty else parameter.default
+            field_name = f"p{index}"
+            fields[field_name] = (Any if annotation is inspect.Parameter.empty else annotation,
+                                  Field(default, alias=name))
+            field_names[field_name] = name
+        model_name = f"{getattr(end_point, '__qualname__', 'end_point')}.Arguments"
+        model_type = create_model(model_name, **fields)
+        return ArgumentBinder.Schema(model_type, field_names=field_names)
+
+    @property
+    def parameters(self) -> List[ArgumentBinder.Parameter]:
+        return self.__parameters
+
+    @property
+    def strategy(self) -> ArgumentBinder.Strategy:
+        return self.__strategy
+
+    @property
+    def model_keys(self) -> FrozenSet[str]:
+        return self.__model_keys
+
+    @property
+    def mode(self) -> ArgumentBinder.Mode:
+        return self.__mode
+
+    def __init__(self, parameters: List[ArgumentBinder.Parameter], strategy: ArgumentBinder.Strategy,
+                 model_keys: FrozenSet[str], mode: ArgumentBinder.Mode = Mode.NONE,
+                 schema: Optional[ArgumentBinder.Schema] = None):
+        self.__parameters = parameters
+        self.__strategy = strategy
+        self.__model_keys = model_keys
+        self.__mode = mode
+        self.__schema = schema
+        if schema is not None:
+            if strategy is ArgumentBinder.Strategy.MODEL:
+                self.__bind = self.__validate_model
+            else:
+                self.__bind = self.__validate_parameters
+        elif strategy is ArgumentBinder.Strategy.MODEL:
+            self.__bind = self.__bind_model
+        elif strategy is ArgumentBinder.Strategy.KEYWORDS:
+            self.__bind = self.__bind_keywords
+        else:
+            self.__bind = self.__bind_parameters
+
+    def bind(self, arguments: Dict[str, Any]) -> Tuple[Tuple[Any, ...], Dict[str, Any]]:
+        return self.__bind(arguments)
+
+    def __bind_model(self, arguments: Dict[str, Any]) -> Tuple[Tuple[Any, ...], Dict[str, Any]]:
+        parameter = self.__parameters[0]
+        model_type = parameter.model_type
+        if isinstance(arguments, dict):
+            if len(arguments) > 0:
+                if self.__model_keys.issuperset(arguments.keys()):
+                    model = model_type.construct(**arguments)
+                elif parameter.name in arguments:
+                    model = model_type.construct(**arguments[parameter.name])
+                else:
+                    unknown = ", ".join(sorted(str(key) for key in arguments.keys() if key not in self.__model_keys))
+                    raise BindingError(f"The arguments of {model_type.__name__} had unknown keys: {unknown}.")
+            else:
+                model = model_type.construct()
+        else:
+            model = model_type.construct(**arguments)
+        return (model,), {}
+
+    def __validate_model(self, arguments: Dict[str, Any]) -> Tuple[Tuple[Any, ...], Dict[str, Any]]:
+        schema = self.__schema
+        name = self.__parameters[0].name
+        if isinstance(arguments, dict) and name in arguments and name not in schema.keys:
+            if len(arguments) > 1:
+                unknown = ", ".join(sorted(str(key) for key in arguments.keys() if key != name))
+                raise BindingError(f"The arguments of {schema.model_type.__name__} had unknown keys: {unknown}.")
+            arguments = arguments[name]
+        return (schema.validate(arguments),), {}
+
+    def __validate_parameters(self, arguments: Dict[str, Any]) -> Tuple[Tuple[Any, ...], Dict[str, Any]]:
+        return (), self.__schema.validate_parameters(arguments)
+
+    def __bind_keywords(self, arguments: Dict[str, Any]) -> Tuple[Tuple[Any, ...], Dict[str, Any]]:
+        return (), arguments
+
+    def __bind_parameters(self, arguments: Dict[str, Any]) -> Tuple[Tuple[Any, ...], Dict[str, Any]]:
+        pass_arguments = {}
+        for parameter in self.__parameters:
+            try:
+                arg = arguments[parameter.name]
+            except KeyError:
+                if parameter.default is not inspect.Parameter.empty:
+                    # the end point gives its own default.
+                    continue
+                raise BindingError(f"The argument {parameter.name} is missing.") from None
+            if parameter.model_type is not None and isinstance(arg, dict):
+                arg = parameter.model_type.construct(**arg)
+            pass_arguments[parameter.name] = arg
+        return (), pass_arguments
+
+    def __repr__(self) -> str:
+        names = ", ".join(parameter.name for parameter in self.__parameters)
+        return f"{self.__class__.__name__}(strategy={self.__strategy.value}, mode={self.__mode.value}, " \
+               f"parameters=[{names}])"
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from enum import Enum
+from typing import Callable, Dict, Any, Optional, Tuple, Hashable
+
+from pydantic import BaseModel
+
+from plank.metrics import Metrics
+from plank.plugin import Plugin
+
+_ResultCache__caches_key = "__caches"
+
+
+def canonical(value: Any) -> Hashable:
+    """
+    A hashable key of `value` which is equal for equal arguments, e.g. dicts in any key order or equal models.
+    Raises TypeError if `value` can't be represented.
+    """
+    if value is None or isinstance(value, (str, bytes, int, float, bool)):
+        # bool and int are equal as dict keys, so the type is kept.
+        return value.__class__, value
+    if isinstance(value, BaseModel):
+        return value.__class__, tuple(
+            (name, canonical(getattr(value, name, None))) for name in value.__fields__.keys())
+    if isinstance(value, dict):
+        return dict, tuple(sorted(((canonical(key), canonical(item)) for key, item in value.items()), key=repr))
+    if isinstance(value, (list, tuple)):
+        return value.__class__, tuple(canonical(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset, frozenset(canonical(item) for item in value)
+    if isinstance(value, Enum):
+        return value.__class__, value.value
+    raise TypeError(f"{value.__class__.__name__} can't be used as a key of cache.")
+
+
+def canonical_arguments(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Optional[Hashable]:
+    """
+    The key of bound arguments, None if any of them can't be represented.
+    """
+    try:
+        return canonical(args), canonical(kwargs)
+    except TypeError:
+        return None
+
+
+def _sizeof(value: Any) -> int:
+    size = sys.getsizeof(value)
+    if isinstance(value, BaseModel):
+        return size + _sizeof(value.__dict__)
+    if isinstance(value, dict):
+        return size + sum(_sizeof(key) + _sizeof(item) for key, item in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + sum(_sizeof(item) for item in value)
+    return size
+
+
+class CachePolicy:
+    """
+    The result cache of an action, declared by `@action(..., cache={"ttl": 60, "max_entries": 1024, "max_bytes": None})`.
+    The least recently used entries are evicted beyond `max_entries` or `max_bytes`, entries expire after `ttl` seconds.
+    """
+
+    @classmethod
+    def from_action_args(cls, action_args: Dict[str, Any]) -> Optional[CachePolicy]:
+        cache = action_args.get("cache")
+        if cache is None or cache is False:
+            return None
+        if cache is True:
+            return cls()
+        return cls(**cache)
+
+    @property
+    def ttl(self) -> Optional[float]:
+        return self.__ttl
+
+    @property
+    def max_entries(self) -> int:
+        return self.__max_entries
+
+    @property
+    def max_bytes(self) -> Optional[int]:
+        return self.__max_bytes
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: int = 1024, max_bytes: Optional[int] = None):
+        assert max_entries > 0, f"The max_entries of cache should be positive, but {max_entries} given."
+        self.__ttl = ttl
+        self.__max_entries = max_entries
+        self.__max_bytes = max_bytes
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(ttl={self.__ttl}, max_entries={self.__max_entries}, " \
+               f"max_bytes={self.__max_bytes})"
+
+
+class ResultCache:
+    """
+    The results of an action by canonical arguments, the results are shared by the callers and should not be mutated.
+    """
+
+    class Entry:
+        __slots__ = ("value", "expires_at", "size")
+
+        def __init__(self, value: Any, expires_at: Optional[float], size: int):
+            self.value = value
+            self.expires_at = expires_at
+            self.size = size
+
+    @classmethod
+    def caches(cls) -> weakref.WeakSet:
+        if not hasattr(cls, _ResultCache__caches_key):
+            setattr(cls, _ResultCache__caches_key, weakref.WeakSet())
+        return getattr(cls, _ResultCache__caches_key)
+
+    @classmethod
+    def invalidate_plugin(cls, plugin_name: str):
+        """
+        Clear the caches of actions provided by the plugin, e.g. on unloading it.
+        """
+        for cache in list(cls.caches()):
+            plugin = cache.plugin()
+            if plugin is not None and plugin.name == plugin_name:
+                cache.clear()
+
+    @property
+    def policy(self) -> CachePolicy:
+        return self.__policy
+
+    @property
+    def size(self) -> int:
+        return self.__size
+
+    def __init__(self, path: str, policy: CachePolicy,
+                 plugin_provider: Optional[Callable[[], Optional[Plugin]]] = None):
+        self.__path = path
+        self.__policy = policy
+        self.__plugin_provider = plugin_provider
+        self.__entries: OrderedDict[Hashable, ResultCache.Entry] = OrderedDict()
+        self.__size = 0
+        self.__lock = threading.Lock()
+        ResultCache.caches().add(self)
+
+    def plugin(self) -> Optional[Plugin]:
+        return None if self.__plugin_provider is None else self.__plugin_provider()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Returns (hit, value).
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None:
+                if entry.expires_at is not None and entry.expires_at <= time.monotonic():
+                    self.__remove(key)
+                    entry = None
+                else:
+                    self.__entries.move_to_end(key)
+        metrics = Metrics.default()
+        if entry is None:
+            metrics.increase("action_cache_misses_total", self.__path)
+            return False, None
+        metrics.increase("action_cache_hits_total", self.__path)
+        return True, entry.value
+
+    def put(self, key: Hashable, value: Any):
+        policy = self.__policy
+        size = 0 if policy.max_bytes is None else _sizeof(value)
+        if policy.max_bytes is not None and size > policy.max_bytes:
+            return
+        expires_at = None if policy.ttl is None else time.monotonic() + policy.ttl
+        evicted = 0
+        with self.__lock:
+            if key in self.__entries:
+                self.__remove(key)
+            self.__entries[key] = ResultCache.Entry(value=value, expires_at=expires_at, size=size)
+            self.__size += size
+            while len(self.__entries) > policy.max_entries or (
+                    policy.max_bytes is not None and self.__size > policy.max_bytes):
+                self.__remove(next(iter(self.__entries)))
+                evicted += 1
+        if evicted > 0:
+            Metrics.default().increase("action_cache_evictions_total", self.__path, evicted)
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.__size = 0
+
+    def __remove(self, key: Hashable):
+        entry = self.__entries.pop(key)
+        self.__size -= entry.size
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import weakref
+from typing import Callable, Any, Awaitable, Dict, Hashable
+
+from plank.metrics import Metrics
+
+
+class Coalescer:
+    """
+    Single-flight execution of an action, declared by `@action(..., coalesce=True)`.
+    The concurrent requests with the same canonical arguments share one in-flight execution,
+    and all of them receive its result or exception.
+    """
+
+    def __init__(self, path: str):
+        self.__path = path
+        # the in-flight executions by event loop.
+        self.__in_flight: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def in_flight(self) -> int:
+        return sum(len(tasks) for tasks in list(self.__in_flight.values()))
+
+    async def run(self, key: Hashable, perform: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        tasks: Dict[Hashable, asyncio.Task] = self.__in_flight.get(loop)
+        if tasks is None:
+            tasks = self.__in_flight[loop] = {}
+
+        task = tasks.get(key)
+        if task is not None:
+            Metrics.default().increase("action_coalesced_total", self.__path)
+        else:
+            # the execution is a task of its own, so cancelling any caller, the first one included,
+            # doesn't cancel it for the others.
+            task = tasks[key] = loop.create_task(perform())
+            task.add_done_callback(functools.partial(self.__done, tasks, key))
+        return await asyncio.shield(task)
+
+    @staticmethod
+    def __done(tasks: Dict[Hashable, asyncio.Task], key: Hashable, task: asyncio.Task):
+        if tasks.get(key) is task:
+            del tasks[key]
+        if not task.cancelled():
+            # retrieved, even if every caller was cancelled.
+            task.exception()
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import inspect
+from enum import Enum
+from functools import partial
+from typing import Callable, Dict, Any, Optional, Tuple
+
+from plank.app.executor import ExecutorManager
+
+
+class ExecutionPolicy:
+    """
+    Where the end point of an action runs, declared by `@action(..., execution=..., executor=..., max_workers=...)`:
+    `inline` on the event loop, `thread` or `process` in the named executor managed by the application.
+    Coroutine functions always run on the event loop.
+    """
+
+    class Kind(Enum):
+        INLINE = "inline"
+        THREAD = ExecutorManager.THREAD
+        PROCESS = ExecutorManager.PROCESS
+
+    @classmethod
+    def inline(cls) -> ExecutionPolicy:
+        return cls(kind=ExecutionPolicy.Kind.INLINE)
+
+    @classmethod
+    def from_action_args(cls, action_args: Dict[str, Any]) -> ExecutionPolicy:
+        kind = ExecutionPolicy.Kind(action_args.get("execution", ExecutionPolicy.Kind.INLINE.value))
+        return cls(kind=kind, executor=action_args.get("executor"), max_workers=action_args.get("max_workers"))
+
+    @property
+    def kind(self) -> ExecutionPolicy.Kind:
+        return self.__kind
+
+    @property
+    def executor(self) -> Optional[str]:
+        return self.__executor
+
+    @property
+    def max_workers(self) -> Optional[int]:
+        return self.__max_workers
+
+    def __init__(self, kind: ExecutionPolicy.Kind, executor: Optional[str] = None, max_workers: Optional[int] = None):
+        self.__kind = kind
+        self.__executor = executor
+        self.__max_workers = max_workers
+
+    async def run(self, func: Callable, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+        if self.__kind is ExecutionPolicy.Kind.INLINE or inspect.iscoroutinefunction(func):
+            result = func(*args, **kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+
+        executor = ExecutorManager.shared().get(kind=self.__kind.value, name=self.__executor,
+                                                max_workers=self.__max_workers)
+        loop = asyncio.get_running_loop()
+        if self.__kind is ExecutionPolicy.Kind.THREAD:
+            # keep the context variables, e.g. `Plugin.current()`, in the worker thread.
+            context = contextvars.copy_context()
+            return await loop.run_in_executor(executor, partial(context.run, func, *args, **kwargs))
+        # the end point and its arguments should be picklable.
+        return await loop.run_in_executor(executor, partial(func, *args, **kwargs))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(kind={self.__kind.value}, executor={self.__executor})"
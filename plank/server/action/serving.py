@@ -1,11 +1,14 @@
-import inspect
-from functools import reduce
-from typing import Union, List, Dict, Any
+from typing import Optional, Any, Union
 
+from plank.plugin import Plugin
 from plank.server.action import Action
-from plank.server.message import Request, Response
+from plank.server.action.binder import ArgumentBinder
+from plank.server.action.caching import CachePolicy, ResultCache
+from plank.server.action.coalescing import Coalescer
+from plank.server.action.execution import ExecutionPolicy
+from plank.server.message import Request, Response, SlottedRequest, SlottedResponse
+from plank.server.message.streaming import StreamingResponse
 from plank.serving import Serving
-from pydantic import BaseModel
 
 
 class ServingAction(Action):
@@ -14,58 +17,45 @@ class ServingAction(Action):
     def serving(self) -> Serving:
         return self.__serving
 
-    def __init__(self, path: str, serving: Serving):
+    @property
+    def binder(self) -> ArgumentBinder:
+        return self.__binder
+
+    @property
+    def execution(self) -> ExecutionPolicy:
+        return self.__execution
+
+    @property
+    def cache(self) -> Optional[ResultCache]:
+        return self.__cache
+
+    @property
+    def coalescer(self) -> Optional[Coalescer]:
+        return self.__coalescer
+
+    def __init__(self, path: str, serving: Serving, execution: Optional[ExecutionPolicy] = None,
+                 cache: Optional[CachePolicy] = None, coalesce: bool = False, stream_buffer: int = 16,
+                 binding: ArgumentBinder.Mode = ArgumentBinder.Mode.NONE):
         self.__path = path
         self.__serving = serving
+        self.__binder = ArgumentBinder.compile(serving.perform, mode=binding)
+        self.__execution = execution or ExecutionPolicy.inline()
+        self.__cache = None if cache is None else ResultCache(path=path, policy=cache, plugin_provider=self.plugin)
+        self.__coalescer = Coalescer(path=path) if coalesce else None
+        self.__stream_buffer = stream_buffer
 
     def routing_path(self) -> str:
         return self.__path
 
-    async def receive(self, request: Request) -> Response:
-        # request.arguments
-
-        sig = inspect.signature(self.serving.perform)
-        parameter_names = sig.parameters.keys()
-
-        def handle(args: Union[List[Any], Dict[str, Any]], parameter: inspect.Parameter):
-            arg = args[parameter.name]
-            if isinstance(arg, dict) and issubclass(parameter.annotation, BaseModel):
-                return parameter.annotation.construct(**arg)
-            else:
-                return arg
-
-        # for name, parameter in sig.parameters.items():
-        #     print(parameter.annotation, isinstance(body, parameter.annotation))
+    def plugin(self) -> Optional[Plugin]:
+        plugin = getattr(self.__serving, "plugin", None)
+        return plugin() if callable(plugin) else None
 
-        if len(parameter_names) == 1:
-            parameter_name = list(parameter_names)[0]
-            parameter = sig.parameters[parameter_name]
-            if issubclass(parameter.annotation, BaseModel):
-                if isinstance(request.arguments, dict):
-                    argument_count = len(request.arguments.keys())
-                    model_keys = parameter.annotation.schema(by_alias=True).keys()
-                    if argument_count > 0:
-                        keys_compared = reduce(lambda result, item: result and (item in model_keys),
-                                               request.arguments.keys(), True)
-                        if keys_compared:
-                            model = parameter.annotation.construct(**request.arguments)
-                        else:
-                            model = parameter.annotation.construct(**request.arguments[parameter_name])
-                    else:
-                        model = parameter.annotation.construct()
-                    response_value = self.serving.perform(model)
-                else:
-                    model = parameter.annotation.construct(**request.arguments)
-                    response_value = self.serving.perform(model)
-            else:
-                response_value = self.serving.perform(**request.arguments)
-        else:
-            pass_arguments = {
-                name: handle(request.arguments, parameter)
-                for name, parameter in sig.parameters.items()
-            }
-            response_value = self.serving.perform(**pass_arguments)
+    async def receive(self, request: Union[Request, SlottedRequest]) -> Union[
+            Response, SlottedResponse, StreamingResponse]:
+        return await self._receive(request, binder=self.__binder, execution=self.__execution, cache=self.__cache,
+                                   coalescer=self.__coalescer, stream_buffer=self.__stream_buffer)
 
-        if inspect.isawaitable(response_value):
-            response_value = await response_value
-        return Response(value=response_value)
+    async def _call(self, args, kwargs) -> Any:
+        with Plugin.activated(self.plugin()):
+            return await self.__execution.run(self.serving.perform, args, kwargs)
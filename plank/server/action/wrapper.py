@@ -1,6 +1,16 @@
-from typing import Callable, Any, Optional
+import inspect
+from typing import Callable, Any, Optional, Union
 
+from plank.metrics import Metrics
+from plank.plugin import Plugin
 from plank.server.action import Action
+from plank.server.action.batching import BatchPolicy, Batcher
+from plank.server.action.binder import ArgumentBinder
+from plank.server.action.caching import CachePolicy, ResultCache, canonical_arguments
+from plank.server.action.coalescing import Coalescer
+from plank.server.action.execution import ExecutionPolicy
+from plank.server.message import Request, Response, SlottedRequest, SlottedResponse, response_for
+from plank.server.message.streaming import StreamingResponse, is_streaming
 
 
 class WrapperAction(Action):
@@ -9,18 +19,85 @@ class WrapperAction(Action):
             self,
             path: str,
             end_point: Callable,
-            response_reverser: Optional[Callable] = None
+            response_reverser: Optional[Callable] = None,
+            plugin_provider: Optional[Callable[[], Optional[Plugin]]] = None,
+            binder: Optional[ArgumentBinder] = None,
+            execution: Optional[ExecutionPolicy] = None,
+            batch: Optional[BatchPolicy] = None,
+            cache: Optional[CachePolicy] = None,
+            coalesce: bool = False,
+            stream_buffer: int = 16,
+            binding: ArgumentBinder.Mode = ArgumentBinder.Mode.NONE
     ):
         self.__path = path
         self.__end_point = end_point
         self.__response_reverser = response_reverser
+        self.__plugin_provider = plugin_provider
+        self.__binder = binder or ArgumentBinder.compile(end_point, batched=batch is not None, mode=binding)
+        self.__execution = execution or ExecutionPolicy.inline()
+        self.__batcher = None if batch is None else Batcher(
+            path=path, end_point=end_point, policy=batch, execution=self.__execution, plugin_provider=plugin_provider)
+        self.__cache = None if cache is None else ResultCache(path=path, policy=cache, plugin_provider=plugin_provider)
+        self.__coalescer = Coalescer(path=path) if coalesce else None
+        self.__stream_buffer = stream_buffer
 
     def end_point(self) -> Callable:
         return self.__end_point
 
+    @property
+    def binder(self) -> ArgumentBinder:
+        return self.__binder
+
+    @property
+    def execution(self) -> ExecutionPolicy:
+        return self.__execution
+
+    @property
+    def batcher(self) -> Optional[Batcher]:
+        return self.__batcher
+
+    @property
+    def cache(self) -> Optional[ResultCache]:
+        return self.__cache
+
+    @property
+    def coalescer(self) -> Optional[Coalescer]:
+        return self.__coalescer
+
     def routing_path(self) -> str:
         return self.__path
 
+    def plugin(self) -> Optional[Plugin]:
+        return None if self.__plugin_provider is None else self.__plugin_provider()
+
+    @property
+    def can_receive_sync(self) -> bool:
+        """
+        The end point can be called on the thread of a request, neither batched nor awaited nor offloaded.
+        """
+        return self.__batcher is None and self.__execution.kind is ExecutionPolicy.Kind.INLINE and \
+            not inspect.iscoroutinefunction(self.__end_point)
+
+    def receive_sync(self, request: Union[Request, SlottedRequest]) -> Union[
+            Response, SlottedResponse, StreamingResponse]:
+        """
+        Receive a request on the calling thread if `can_receive_sync`, e.g. sent by a synchronous end point
+        running on a loop, which can't wait for the loop. The result is cached, but not coalesced.
+        """
+        args, kwargs = self.__binder.bind(request.arguments)
+        key = None if self.__cache is None else canonical_arguments(args, kwargs)
+        hit, response_value = (False, None) if key is None else self.__cache.get(key)
+        if not hit:
+            response_value = self(*args, **kwargs)
+            if is_streaming(response_value):
+                if key is not None:
+                    raise TypeError(f"The streaming result of {self.__path} can't be cached or coalesced.")
+                return StreamingResponse(response_value, max_buffered=self.__stream_buffer, execution=self.__execution,
+                                         plugin=self.plugin())
+            if key is not None:
+                self.__cache.put(key, response_value)
+        return response_for(request, response_value)
+
     def set_response_reverser(self, func: Callable[[Any], Any]):
         self.__response_reverser = func
 
@@ -29,5 +106,38 @@ class WrapperAction(Action):
             return response
         return self.__response_reverser(response)
 
+    async def receive(self, request: Union[Request, SlottedRequest]) -> Union[
+            Response, SlottedResponse, StreamingResponse]:
+        return await self._receive(request, binder=self.__binder, execution=self.__execution, cache=self.__cache,
+                                   coalescer=self.__coalescer, stream_buffer=self.__stream_buffer)
+
+    async def _call(self, args, kwargs) -> Any:
+        if self.__batcher is not None:
+            return await self.__batcher.submit(args, kwargs)
+        with Plugin.activated(self.plugin()):
+            return await self.__execution.run(self.__end_point, args, kwargs)
+
     def __call__(self, *args, **kwargs):
-        return self.__end_point(*args, **kwargs)
+        plugin = self.plugin()
+        metrics = Metrics.default()
+        start = metrics.begin(self.__path)
+        try:
+            with Plugin.activated(plugin):
+                result = self.__end_point(*args, **kwargs)
+        except BaseException:
+            metrics.end(self.__path, start, error=True)
+            raise
+        if inspect.iscoroutine(result):
+            return self.__awaiting(plugin, result, metrics, start)
+        metrics.end(self.__path, start)
+        return result
+
+    async def __awaiting(self, plugin: Optional[Plugin], coroutine, metrics: Metrics, start: int):
+        try:
+            with Plugin.activated(plugin):
+                result = await coroutine
+        except BaseException:
+            metrics.end(self.__path, start, error=True)
+            raise
+        metrics.end(self.__path, start)
+        return result
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import importlib
+import re
+from typing import Type, Dict, Union, Any, Tuple, List
+
+from plank.server.framing import RemoteError, Buffer
+from plank.server.message import Request, SlottedRequest
+
+
+class CodecError(ValueError):
+    """
+    A value can't be encoded, or a payload can't be decoded.
+    """
+
+
+class Codec:
+    """
+    Encodes the messages of cross-process transports, e.g. the frames of `unix://`.
+    A codec is registered by its name, the servers and connectors select one by their `codec` option.
+    """
+    __registered_codecs: Dict[str, Type[Codec]] = {}
+
+    @classmethod
+    def get_type(cls, name: str) -> Type[Codec]:
+        return cls.__registered_codecs[name]
+
+    @classmethod
+    def named(cls, codec: Union[str, Codec], **kwargs) -> Codec:
+        if isinstance(codec, Codec):
+            return codec
+        return cls.get_type(name=codec)(**kwargs)
+
+    @classmethod
+    def register(cls, codec_type: Union[str, Type[Codec]]):
+        if type(codec_type) is str:
+            rx = r'(?P<namespace>[a-z A-Z]+[\._\w]+):(?P<class_name>[a-z A-Z]+[_\w]*)'
+            match_obj = re.search(rx, codec_type)
+            assert match_obj is not None, "The parameter `codec_type` should be formatted with {namespace}:{class_name}"
+            namespace = match_obj["namespace"]
+            class_name = match_obj["class_name"]
+            module = importlib.import_module(namespace)
+            codec_type = module.__dict__[class_name]
+        cls.__registered_codecs[codec_type.name()] = codec_type
+
+    @classmethod
+    def name(cls) -> str:
+        raise NotImplementedError
+
+    @property
+    def zero_copy(self) -> bool:
+        """
+        The decoded values could refer to the payload instead of copying it, e.g. bytes as memoryviews.
+        """
+        return False
+
+    def dumps(self, value: Any) -> bytes:
+        """
+        Encode a value into a bytes-like object.
+        """
+        raise NotImplementedError
+
+    def dumps_buffers(self, value: Any) -> List[Buffer]:
+        """
+        Encode a value into the buffers to be concatenated, e.g. by a transport writing them in order,
+        so a codec could refer to large bytes of the value instead of copying them.
+        """
+        return [self.dumps(value)]
+
+    def loads(self, payload: Union[bytes, memoryview]) -> Any:
+        raise NotImplementedError
+
+    def dumps_request(self, path: str, request: Union[Request, SlottedRequest]) -> bytes:
+        return self.dumps((path, request.method, request.headers, request.arguments))
+
+    def dumps_request_buffers(self, path: str, request: Union[Request, SlottedRequest]) -> List[Buffer]:
+        return self.dumps_buffers((path, request.method, request.headers, request.arguments))
+
+    def loads_request(self, payload: Union[bytes, memoryview]) -> Tuple[str, SlottedRequest]:
+        path, method, headers, arguments = self.loads(payload)
+        return path, SlottedRequest(method=method, arguments=arguments or {}, headers=headers or {})
+
+    def dumps_error(self, error: BaseException) -> bytes:
+        return self.dumps((error.__class__.__name__, str(error)))
+
+    def loads_error(self, payload: Union[bytes, memoryview]) -> RemoteError:
+        type_name, message = self.loads(payload)
+        return RemoteError(type_name=type_name, message=message)
+
+
+Codec.register(codec_type="plank.server.codec.json:JSONCodec")
+Codec.register(codec_type="plank.server.codec.binary:BinaryCodec")
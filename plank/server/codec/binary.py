@@ -0,0 +1,397 @@
+from __future__ import annotations
+
+import struct
+import sys
+from typing import Union, Any, Dict, Tuple, Type, List
+
+from pydantic import BaseModel, validate_model
+from pydantic.json import pydantic_encoder
+
+from plank.server.codec import Codec, CodecError
+from plank.server.framing import Buffer
+
+_u8 = struct.Struct("!B")
+_u16 = struct.Struct("!H")
+_u32 = struct.Struct("!I")
+_u64 = struct.Struct("!Q")
+_i8 = struct.Struct("!b")
+_i16 = struct.Struct("!h")
+_i32 = struct.Struct("!i")
+_i64 = struct.Struct("!q")
+_f32 = struct.Struct("!f")
+_f64 = struct.Struct("!d")
+
+# the type of extension for models, encoded as the key of model type followed by the values of fields.
+MODEL_EXT_TYPE = 1
+# the bytes referred by `dumps_buffers` instead of being copied.
+OUT_OF_LINE_SIZE = 64 * 1024
+
+
+class BinaryCodec(Codec):
+    """
+    The msgpack format, a model is an extension of its type key `module:QualName` and its field values in order,
+    so the field names are not repeated in each message. The model type should be imported by the decoding process,
+    which validates the field values again.
+
+    With `zero_copy`, bytes are decoded as read-only memoryviews over the payload instead of copies,
+    the payload is kept alive as long as any of them. `dumps_buffers` refers to large bytes without copying them.
+    """
+
+    class ModelInfo:
+        __slots__ = ("model_type", "key", "field_names", "aliases", "prefix")
+
+        def __init__(self, model_type: Type[BaseModel], key: str, prefix: bytes):
+            self.model_type = model_type
+            self.key = key
+            self.field_names = tuple(model_type.__fields__.keys())
+            # the keys of fields to validate, a model may not be populated by the names of fields.
+            self.aliases = tuple(field.alias for field in model_type.__fields__.values())
+            # the encoded key and the header of the array of field values.
+            self.prefix = prefix
+
+    class Segments(bytearray):
+        """
+        An encoding buffer with the large bytes referred by their positions.
+        """
+        __slots__ = ("references", "external")
+
+        def __init__(self):
+            super().__init__()
+            self.references: List[Tuple[int, Buffer]] = []
+            # the total size of the referred bytes.
+            self.external = 0
+
+    @classmethod
+    def name(cls) -> str:
+        return "binary"
+
+    @property
+    def zero_copy(self) -> bool:
+        return self.__zero_copy
+
+    def __init__(self, zero_copy: bool = False):
+        self.__zero_copy = zero_copy
+        self.__models_by_type: Dict[Type[BaseModel], BinaryCodec.ModelInfo] = {}
+        self.__models_by_key: Dict[str, BinaryCodec.ModelInfo] = {}
+
+    def dumps(self, value: Any) -> bytearray:
+        buffer = bytearray()
+        self.__encode(value, buffer)
+        return buffer
+
+    def dumps_buffers(self, value: Any) -> List[Buffer]:
+        buffer = BinaryCodec.Segments()
+        self.__encode(value, buffer)
+        if len(buffer.references) == 0:
+            return [buffer]
+        view = memoryview(buffer)
+        buffers = []
+        offset = 0
+        for position, reference in buffer.references:
+            buffers.append(view[offset:position])
+            buffers.append(reference)
+            offset = position
+        buffers.append(view[offset:])
+        return buffers
+
+    def loads(self, payload: Union[bytes, memoryview]) -> Any:
+        view = memoryview(payload)
+        if view.format != "B":
+            view = view.cast("B")
+        try:
+            value, offset = self.__decode(view, 0)
+        except (IndexError, struct.error) as e:
+            raise CodecError("The payload ended in a value.") from e
+        except UnicodeDecodeError as e:
+            raise CodecError(f"The payload had an invalid string: {e}") from e
+        if offset > len(view):
+            raise CodecError("The payload ended in a value.")
+        if offset < len(view):
+            raise CodecError(f"The payload had {len(view) - offset} trailing bytes.")
+        return value
+
+    def __encode(self, value: Any, buffer: bytearray):
+        value_type = type(value)
+        if value_type is str:
+            self.__encode_str(value, buffer)
+        elif value_type is int:
+            self.__encode_int(value, buffer)
+        elif value_type is dict:
+            self.__encode_map(value, buffer)
+        elif value_type is list or value_type is tuple:
+            self.__encode_array(value, buffer)
+        elif value_type is float:
+            buffer.append(0xcb)
+            buffer += _f64.pack(value)
+        elif value is None:
+            buffer.append(0xc0)
+        elif value is True:
+            buffer.append(0xc3)
+        elif value is False:
+            buffer.append(0xc2)
+        elif value_type is bytes or value_type is bytearray or value_type is memoryview:
+            self.__encode_bin(value, buffer)
+        elif isinstance(value, BaseModel):
+            self.__encode_model(value, buffer)
+        # the subclasses, e.g. str and int enums.
+        elif isinstance(value, str):
+            self.__encode_str(value, buffer)
+        elif isinstance(value, int):
+            self.__encode_int(int(value), buffer)
+        elif isinstance(value, float):
+            self.__encode(float(value), buffer)
+        elif isinstance(value, dict):
+            self.__encode_map(value, buffer)
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            self.__encode_array(value, buffer)
+        else:
+            # the same conversions as JSON, e.g. datetime, Enum, UUID and Decimal.
+            try:
+                converted = pydantic_encoder(value)
+            except TypeError as e:
+                raise CodecError(f"The value of {value_type.__name__} can't be encoded.") from e
+            self.__encode(converted, buffer)
+
+    @staticmethod
+    def __encode_str(value: str, buffer: bytearray):
+        data = value.encode("utf-8")
+        length = len(data)
+        if length < 32:
+            buffer.append(0xa0 | length)
+        elif length < 0x100:
+            buffer.append(0xd9)
+            buffer.append(length)
+        elif length < 0x10000:
+            buffer.append(0xda)
+            buffer += _u16.pack(length)
+        else:
+            buffer.append(0xdb)
+            buffer += _u32.pack(length)
+        buffer += data
+
+    @staticmethod
+    def __encode_int(value: int, buffer: bytearray):
+        if 0 <= value < 0x80:
+            buffer.append(value)
+        elif -32 <= value < 0:
+            buffer.append(value & 0xff)
+        elif value >= 0:
+            if value < 0x100:
+                buffer.append(0xcc)
+                buffer.append(value)
+            elif value < 0x10000:
+                buffer.append(0xcd)
+                buffer += _u16.pack(value)
+            elif value < 0x100000000:
+                buffer.append(0xce)
+                buffer += _u32.pack(value)
+            elif value < 0x10000000000000000:
+                buffer.append(0xcf)
+                buffer += _u64.pack(value)
+            else:
+                raise CodecError(f"The integer {value} exceeds 64 bits.")
+        elif value >= -0x80:
+            buffer.append(0xd0)
+            buffer += _i8.pack(value)
+        elif value >= -0x8000:
+            buffer.append(0xd1)
+            buffer += _i16.pack(value)
+        elif value >= -0x80000000:
+            buffer.append(0xd2)
+            buffer += _i32.pack(value)
+        elif value >= -0x8000000000000000:
+            buffer.append(0xd3)
+            buffer += _i64.pack(value)
+        else:
+            raise CodecError(f"The integer {value} exceeds 64 bits.")
+
+    @staticmethod
+    def __encode_bin(value: Union[bytes, bytearray, memoryview], buffer: bytearray):
+        length = value.nbytes if isinstance(value, memoryview) else len(value)
+        if length < 0x100:
+            buffer.append(0xc4)
+            buffer.append(length)
+        elif length < 0x10000:
+            buffer.append(0xc5)
+            buffer += _u16.pack(length)
+        else:
+            buffer.append(0xc6)
+            buffer += _u32.pack(length)
+        if length >= OUT_OF_LINE_SIZE and type(buffer) is BinaryCodec.Segments:
+            buffer.references.append((len(buffer), value))
+            buffer.external += length
+        else:
+            buffer += value
+
+    @staticmethod
+    def __encode_container_header(length: int, buffer: bytearray, fix: int, header16: int):
+        if length < 16:
+            buffer.append(fix | length)
+        elif length < 0x10000:
+            buffer.append(header16)
+            buffer += _u16.pack(length)
+        else:
+            buffer.append(header16 + 1)
+            buffer += _u32.pack(length)
+
+    def __encode_array(self, value, buffer: bytearray):
+        self.__encode_container_header(len(value), buffer, 0x90, 0xdc)
+        encode = self.__encode
+        for item in value:
+            encode(item, buffer)
+
+    def __encode_map(self, value: dict, buffer: bytearray):
+        self.__encode_container_header(len(value), buffer, 0x80, 0xde)
+        encode = self.__encode
+        for key, item in value.items():
+            encode(key, buffer)
+            encode(item, buffer)
+
+    def __encode_model(self, value: BaseModel, buffer: bytearray):
+        info = self.__model_info(type(value))
+        # ext32, so the length is patched after the fields are encoded in place.
+        buffer.append(0xc9)
+        length_offset = len(buffer)
+        buffer += b"\x00\x00\x00\x00"
+        buffer.append(MODEL_EXT_TYPE)
+        start = len(buffer) + self.__external(buffer)
+        buffer += info.prefix
+        fields = value.__dict__
+        encode = self.__encode
+        for field_name in info.field_names:
+            encode(fields[field_name], buffer)
+        _u32.pack_into(buffer, length_offset, len(buffer) + self.__external(buffer) - start)
+
+    @staticmethod
+    def __external(buffer: bytearray) -> int:
+        return buffer.external if type(buffer) is BinaryCodec.Segments else 0
+
+    def __model_info(self, model_type: Type[BaseModel]) -> BinaryCodec.ModelInfo:
+        info = self.__models_by_type.get(model_type)
+        if info is None:
+            key = f"{model_type.__module__}:{model_type.__qualname__}"
+            prefix = bytearray()
+            self.__encode_str(key, prefix)
+            self.__encode_container_header(len(model_type.__fields__), prefix, 0x90, 0xdc)
+            info = BinaryCodec.ModelInfo(model_type=model_type, key=key, prefix=bytes(prefix))
+            self.__models_by_type[model_type] = info
+            self.__models_by_key[key] = info
+        return info
+
+    def __model_info_for_key(self, key: str) -> BinaryCodec.ModelInfo:
+        info = self.__models_by_key.get(key)
+        if info is not None:
+            return info
+        module_name, _, qualname = key.partition(":")
+        # a model is only looked up in the imported modules, a payload never imports a module.
+        target = sys.modules.get(module_name)
+        for name in qualname.split("."):
+            target = getattr(target, name, None)
+        if not isinstance(target, type) or not issubclass(target, BaseModel):
+            raise CodecError(f"The model {key} isn't imported in this process.")
+        return self.__model_info(target)
+
+    def __decode(self, view: memoryview, offset: int) -> Tuple[Any, int]:
+        head = view[offset]
+        offset += 1
+        if head < 0x80:
+            return head, offset
+        if 0xa0 <= head < 0xc0:
+            end = offset + (head & 0x1f)
+            return str(view[offset:end], "utf-8"), end
+        if head < 0x90:
+            return self.__decode_map(view, offset, head & 0x0f)
+        if head < 0xa0:
+            return self.__decode_array(view, offset, head & 0x0f)
+        if head >= 0xe0:
+            return head - 0x100, offset
+        if head == 0xc0:
+            return None, offset
+        if head == 0xc2:
+            return False, offset
+        if head == 0xc3:
+            return True, offset
+        if head == 0xcb:
+            return _f64.unpack_from(view, offset)[0], offset + 8
+        if head == 0xca:
+            return _f32.unpack_from(view, offset)[0], offset + 4
+        if 0xcc <= head <= 0xd3:
+            number = (_u8, _u16, _u32, _u64, _i8, _i16, _i32, _i64)[head - 0xcc]
+            return number.unpack_from(view, offset)[0], offset + number.size
+        if 0xd9 <= head <= 0xdb:
+            length, offset = self.__decode_length(view, offset, head - 0xd9)
+            end = offset + length
+            return str(view[offset:end], "utf-8"), end
+        if 0xc4 <= head <= 0xc6:
+            length, offset = self.__decode_length(view, offset, head - 0xc4)
+            end = offset + length
+            if end > len(view):
+                raise CodecError("The payload ended in bytes.")
+            return (view[offset:end].toreadonly() if self.__zero_copy else view[offset:end].tobytes()), end
+        if head == 0xdc or head == 0xdd:
+            length, offset = self.__decode_length(view, offset, head - 0xdc + 1)
+            return self.__decode_array(view, offset, length)
+        if head == 0xde or head == 0xdf:
+            length, offset = self.__decode_length(view, offset, head - 0xde + 1)
+            return self.__decode_map(view, offset, length)
+        if head == 0xc9:
+            length = _u32.unpack_from(view, offset)[0]
+            ext_type = view[offset + 4]
+            offset += 5
+            if ext_type != MODEL_EXT_TYPE:
+                raise CodecError(f"Unknown extension type {ext_type}.")
+            return self.__decode_model(view, offset, offset + length)
+        raise CodecError(f"Unsupported header 0x{head:02x}.")
+
+    @staticmethod
+    def __decode_length(view: memoryview, offset: int, width: int) -> Tuple[int, int]:
+        # the width of length is 1, 2 or 4 bytes.
+        if width == 0:
+            return view[offset], offset + 1
+        if width == 1:
+            return _u16.unpack_from(view, offset)[0], offset + 2
+        return _u32.unpack_from(view, offset)[0], offset + 4
+
+    def __decode_array(self, view: memoryview, offset: int, length: int) -> Tuple[list, int]:
+        items = []
+        decode = self.__decode
+        for _ in range(length):
+            item, offset = decode(view, offset)
+            items.append(item)
+        return items, offset
+
+    def __decode_map(self, view: memoryview, offset: int, length: int) -> Tuple[dict, int]:
+        items = {}
+        decode = self.__decode
+        for _ in range(length):
+            key, offset = decode(view, offset)
+            value, offset = decode(view, offset)
+            try:
+                items[key] = value
+            except TypeError as e:
+                raise CodecError(f"The key of map can't be a {key.__class__.__name__}.") from e
+        return items, offset
+
+    def __decode_model(self, view: memoryview, offset: int, end: int) -> Tuple[BaseModel, int]:
+        key, offset = self.__decode(view, offset)
+        values, offset = self.__decode(view, offset)
+        if offset != end:
+            raise CodecError(f"The extension of model {key} had a wrong length.")
+        if not isinstance(key, str):
+            raise CodecError(f"The key of model should be a str, but {key.__class__.__name__} given.")
+        if not isinstance(values, list):
+            raise CodecError(f"The fields of model {key} should be an array, but {values.__class__.__name__} given.")
+        info = self.__model_info_for_key(key)
+        if len(values) != len(info.field_names):
+            raise CodecError(f"The model {key} had {len(info.field_names)} fields, but {len(values)} given.")
+        model_type = info.model_type
+        # validated again, so the values encoded as JSON types get their field types back, e.g. datetime and Enum.
+        fields, fields_set, error = validate_model(model_type, dict(zip(info.aliases, values)))
+        if error is not None:
+            raise CodecError(f"The model {key} had invalid fields: {error}") from error
+        # the same as `BaseModel.__init__` after validation.
+        model = model_type.__new__(model_type)
+        object.__setattr__(model, "__dict__", fields)
+        object.__setattr__(model, "__fields_set__", fields_set)
+        model._init_private_attributes()
+        return model, offset
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import json
+from typing import Union, Any
+
+from pydantic.json import pydantic_encoder
+
+from plank.server.codec import Codec, CodecError
+
+
+class JSONCodec(Codec):
+    """
+    Compact JSON, readable on the wire but bytes are not supported and models are decoded as dicts.
+    """
+
+    @classmethod
+    def name(cls) -> str:
+        return "json"
+
+    def dumps(self, value: Any) -> bytes:
+        try:
+            return json.dumps(value, default=pydantic_encoder, separators=(",", ":")).encode("utf-8")
+        except (TypeError, ValueError) as e:
+            raise CodecError(f"The value can't be encoded into JSON: {e}") from e
+
+    def loads(self, payload: Union[bytes, memoryview]) -> Any:
+        if isinstance(payload, memoryview):
+            payload = payload.tobytes()
+        try:
+            return json.loads(payload)
+        except ValueError as e:
+            raise CodecError(f"The payload isn't valid JSON: {e}") from e
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+import asyncio
 import importlib
 import re
-from typing import Type, Dict, Union
+from typing import Type, Dict, Union, Iterator, Iterable, List, Optional, Any, TYPE_CHECKING
 from urllib.parse import urlparse, ParseResult
 
 from plank.server import Server, BindAddress
 from plank.server.message import Request, Response
 
+if TYPE_CHECKING:
+    from plank.app.runner import LoopRunner
+
 
 class Connector:
     __registered_connectors: Dict[str, Type[Connector]] = {}
@@ -50,11 +54,53 @@ class Connector:
     def url_components(self) -> ParseResult:
         return self.__url_components
 
+    @property
+    def concurrency(self) -> Optional[int]:
+        return self.__concurrency
+
+    @property
+    def runner(self) -> LoopRunner:
+        """
+        The runner of the loop the synchronous methods wait on.
+        """
+        raise NotImplementedError()
+
     def __init__(self, url: str, **kwargs):
         self.__url_components = urlparse(url=url)
+        self.__concurrency = kwargs.get("concurrency")
 
     def send(self, request: Request) -> Response:
         raise NotImplementedError()
 
+    async def send_async(self, request: Request) -> Response:
+        raise NotImplementedError()
+
+    def send_many(self, requests: Iterable[Request], concurrency: Optional[int] = None) -> List[
+            Union[Response, BaseException]]:
+        return self.runner.run_sync(self.send_many_async(requests=requests, concurrency=concurrency))
+
+    async def send_many_async(self, requests: Iterable[Request], concurrency: Optional[int] = None) -> List[
+            Union[Response, BaseException]]:
+        """
+        Dispatch the requests concurrently on the running loop, at most `concurrency` of them at a time.
+        The responses keep the order of requests, a failed request gives its exception in place of the response.
+        """
+        requests = list(requests)
+        semaphore = asyncio.Semaphore(concurrency or self.__concurrency or len(requests) or 1)
+
+        async def _send(request: Request) -> Response:
+            async with semaphore:
+                return await self.send_async(request=request)
+
+        return await asyncio.gather(*(_send(request) for request in requests), return_exceptions=True)
+
+    def stream(self, request: Request) -> Iterator[Any]:
+        """
+        Iterate the chunks of a streaming action, a non-streaming action gives its value as the only chunk.
+        """
+        raise NotImplementedError()
+
 
 Connector.register(connector_type="plank.server.connector.inline:InlineConnector")
+Connector.register(connector_type="plank.server.connector.unix:UnixConnector")
+Connector.register(connector_type="plank.server.connector.shm:ShmConnector")
@@ -1,12 +1,15 @@
 import asyncio
-import nest_asyncio
+from typing import Union, Iterator, AsyncIterator, Any
+
+from plank.app.runner import LoopRunner
 from plank.server import Server
 from plank.server.action import Action
+from plank.server.action.wrapper import WrapperAction
 from plank.server.connector import Connector
 from plank.server.inline import InlineServer
-from plank.server.message import Request, Response
-
-nest_asyncio.apply()
+from plank.server.message import Request, Response, SlottedRequest, SlottedResponse
+from plank.server.message.streaming import StreamingResponse
+from plank.server.route import with_params
 
 
 class InlineConnector(Connector):
@@ -19,6 +22,10 @@ class InlineConnector(Connector):
     def backend(self) -> Action:
         return self.__backend
 
+    @property
+    def runner(self) -> LoopRunner:
+        return self.server.application.runner
+
     @classmethod
     def support_scheme(cls) -> str:
         return "inline"
@@ -28,14 +35,60 @@ class InlineConnector(Connector):
     # path as service method
     def __init__(self, url: str, **kwargs):
         # url = f"inline://local/{service_name}"
-        super().__init__(url=url)
+        super().__init__(url=url, **kwargs)
         service_name = self.path
         self.__server = InlineServer.listened_server(self.address)
         print("self.__server:", self.__server)
-        self.__backend = self.__server.get_action(service_name)
+        match = self.__server.match_action(service_name)
+        self.__backend = None if match is None else match.action
+        self.__path_params = {} if match is None else match.params
+
+    def send(self, request: Union[Request, SlottedRequest]) -> Union[Response, SlottedResponse]:
+        backend = self.backend
+        if isinstance(backend, WrapperAction) and backend.can_receive_sync and self.__on_loop():
+            # sent by a synchronous end point on a loop, so the action is called in place instead of waiting.
+            return backend.receive_sync(self.__with_path_params(request))
+        return self.runner.run_sync(self.send_async(request=request))
+
+    @staticmethod
+    def __on_loop() -> bool:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return True
+
+    def __with_path_params(self, request: Union[Request, SlottedRequest]) -> Union[Request, SlottedRequest]:
+        if len(self.__path_params) == 0:
+            return request
+        return request.copy(update={"arguments": with_params(request.arguments, self.__path_params)})
+
+    def stream(self, request: Request) -> Iterator[Any]:
+        runner = self.runner
+        chunks = self.stream_async(request=request)
+        try:
+            while True:
+                try:
+                    yield runner.run_sync(chunks.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            runner.run_sync(chunks.aclose())
 
-    def send(self, request: Request) -> Response:
-        return asyncio.run(self.send_async(request=request))
+    async def stream_async(self, request: Request) -> AsyncIterator[Any]:
+        response = await self.send_async(request=request)
+        if not isinstance(response, StreamingResponse):
+            yield response.value
+            return
+        try:
+            async for chunk in response:
+                yield chunk
+        finally:
+            await response.aclose()
 
-    async def send_async(self, request: Request) -> Response:
-        return await self.backend.receive(request=request)
+    async def send_async(self, request: Union[Request, SlottedRequest]) -> Union[
+            Response, SlottedResponse, StreamingResponse]:
+        """
+        A `SlottedRequest` is dispatched without pydantic models and answered by a `SlottedResponse`.
+        """
+        return await self.backend.receive(request=self.__with_path_params(request))
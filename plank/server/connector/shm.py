@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Type
+
+from plank.server.connector.unix import UnixConnection, UnixConnector
+from plank.server.framing import MAX_FRAME_SIZE
+from plank.server.ring import SharedRing, RingChannel, HANDSHAKE
+
+
+class ShmConnection(UnixConnection):
+    """
+    A connection to a `ShmServer`, the frames go through the rings created by the server.
+    """
+
+    @classmethod
+    async def open(cls, path: str, max_frame_size: int = MAX_FRAME_SIZE) -> ShmConnection:
+        reader, writer = await asyncio.open_unix_connection(path=path)
+        try:
+            writer.write(HANDSHAKE)
+            rings = json.loads(await reader.readline())
+            requests = SharedRing.attach(rings["requests"])
+        except (ValueError, KeyError, TypeError) as e:
+            writer.close()
+            raise ConnectionError(f"The server at {path} didn't answer the handshake of shared memory.") from e
+        except BaseException:
+            writer.close()
+            raise
+        try:
+            responses = SharedRing.attach(rings["responses"])
+        except BaseException:
+            requests.close()
+            writer.close()
+            raise
+        return cls(channel=RingChannel(outbound=requests, inbound=responses, reader=reader, writer=writer,
+                                       max_frame_size=max_frame_size))
+
+
+class ShmConnector(UnixConnector):
+    """
+    Calls the actions of a `ShmServer` in another process, e.g. `shm://%2Ftmp%2Fplank.sock/service/action`,
+    the netloc of url is the percent-encoded path of the socket of server.
+    """
+
+    @classmethod
+    def support_scheme(cls) -> str:
+        return "shm"
+
+    @classmethod
+    def connection_type(cls) -> Type[UnixConnection]:
+        return ShmConnection
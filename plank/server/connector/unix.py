@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import weakref
+from typing import Dict, List, Union, Iterator, AsyncIterator, Any, Tuple, Type, Sequence
+from urllib.parse import unquote
+
+from plank.app.runner import LoopRunner
+from plank.server.connector import Connector
+from plank.server.codec import Codec
+from plank.server.framing import FrameType, FrameError, FrameChannel, FrameStream, MAX_FRAME_SIZE, Buffer
+from plank.server.message import Request, Response, SlottedRequest, SlottedResponse, response_for
+
+_UnixConnectionPool__pools_key = "__pools"
+
+
+class UnixConnection:
+    """
+    A connection to a `UnixServer`, the requests are multiplexed by id and answered in any order.
+    """
+
+    @property
+    def in_flight(self) -> int:
+        return len(self.__waiters)
+
+    @property
+    def is_closed(self) -> bool:
+        return self.__closed
+
+    def __init__(self, channel: FrameChannel, stream_buffer: int = 64):
+        assert stream_buffer > 0, f"The stream_buffer should be positive, but {stream_buffer} given."
+        self.__channel = channel
+        self.__stream_buffer = stream_buffer
+        self.__request_ids = itertools.count(1)
+        # a future for a response, or a queue for the chunks of a stream, by request id.
+        self.__waiters: Dict[int, Union[asyncio.Future, asyncio.Queue]] = {}
+        self.__closed = False
+        self.__receiving = asyncio.get_running_loop().create_task(self.__receive())
+
+    @classmethod
+    async def open(cls, path: str, max_frame_size: int = MAX_FRAME_SIZE) -> UnixConnection:
+        reader, writer = await asyncio.open_unix_connection(path=path)
+        return cls(channel=FrameStream(reader=reader, writer=writer, max_frame_size=max_frame_size))
+
+    async def request(self, payload: Sequence[Buffer]) -> Tuple[FrameType, Buffer]:
+        request_id = next(self.__request_ids)
+        future = asyncio.get_running_loop().create_future()
+        self.__waiters[request_id] = future
+        try:
+            await self.__send(request_id, payload)
+            return await future
+        except BaseException:
+            # answered, but the caller was cancelled before taking the payload.
+            if future.done() and not future.cancelled() and future.exception() is None:
+                self.commit(future.result()[1])
+            raise
+        finally:
+            self.__waiters.pop(request_id, None)
+
+    async def stream(self, payload: Sequence[Buffer]) -> AsyncIterator[Tuple[FrameType, Buffer]]:
+        """
+        The frames of a request until a frame other than CHUNK, raises if the connection is lost meanwhile.
+        """
+        request_id = next(self.__request_ids)
+        # at most `stream_buffer` chunks are queued, then the connection stops reading until the consumer catches up,
+        # so a slow consumer holds back the server instead of buffering without limit.
+        queue = asyncio.Queue(maxsize=self.__stream_buffer)
+        self.__waiters[request_id] = queue
+        try:
+            await self.__send(request_id, payload)
+            while True:
+                frame = await queue.get()
+                if isinstance(frame, BaseException):
+                    raise frame
+                frame_type, frame_payload = frame
+                yield frame_type, frame_payload
+                if frame_type is not FrameType.CHUNK:
+                    return
+        finally:
+            self.__waiters.pop(request_id, None)
+            # wakes the connection up if it waits for the space of an abandoned stream.
+            while not queue.empty():
+                self.__discard(queue.get_nowait())
+
+    def commit(self, payload: Buffer):
+        """
+        Release the payload of a frame given by `request` or `stream`, once it's decoded.
+        """
+        self.__channel.commit(payload)
+
+    def __discard(self, frame: Union[Tuple[FrameType, Buffer], BaseException]):
+        if not isinstance(frame, BaseException):
+            self.commit(frame[1])
+
+    async def close(self):
+        self.__closed = True
+        self.__receiving.cancel()
+        try:
+            await self.__receiving
+        except asyncio.CancelledError:
+            pass
+
+    async def __send(self, request_id: int, payload: Sequence[Buffer]):
+        if self.__closed:
+            raise ConnectionError("The unix connection was closed.")
+        await self.__channel.send(FrameType.REQUEST, request_id, payload)
+
+    async def __receive(self):
+        error: BaseException = ConnectionError("The unix connection was closed by server.")
+        try:
+            while True:
+                frame = await self.__channel.receive()
+                if frame is None:
+                    break
+                frame_type, request_id, payload = frame
+                waiter = self.__waiters.get(request_id)
+                if isinstance(waiter, asyncio.Queue):
+                    await waiter.put((frame_type, payload))
+                elif waiter is not None and not waiter.done():
+                    waiter.set_result((frame_type, payload))
+                else:
+                    # the caller gave up, e.g. cancelled.
+                    self.commit(payload)
+        except (ConnectionError, FrameError) as e:
+            error = e
+        except asyncio.CancelledError:
+            error = ConnectionError("The unix connection was closed.")
+            raise
+        finally:
+            self.__closed = True
+            self.__channel.close()
+            for waiter in list(self.__waiters.values()):
+                if isinstance(waiter, asyncio.Queue):
+                    # the stream fails at once, instead of after the chunks still queued.
+                    while not waiter.empty():
+                        self.__discard(waiter.get_nowait())
+                    waiter.put_nowait(ConnectionError(str(error)))
+                elif not waiter.done():
+                    waiter.set_exception(ConnectionError(str(error)))
+
+
+class UnixConnectionPool:
+    """
+    At most `max_connections` connections to a socket path in an event loop.
+    A request takes an idle connection, opens another one below the limit, or shares the least busy one.
+    """
+
+    @classmethod
+    def get(cls, path: str, max_connections: int = 4,
+            connection_type: Type[UnixConnection] = UnixConnection) -> UnixConnectionPool:
+        if not hasattr(cls, _UnixConnectionPool__pools_key):
+            setattr(cls, _UnixConnectionPool__pools_key, weakref.WeakKeyDictionary())
+        pools_by_loop = getattr(cls, _UnixConnectionPool__pools_key)
+        loop = asyncio.get_running_loop()
+        pools = pools_by_loop.get(loop)
+        if pools is None:
+            pools = pools_by_loop[loop] = {}
+        pool = pools.get((connection_type, path))
+        if pool is None:
+            pool = pools[(connection_type, path)] = cls(path=path, max_connections=max_connections,
+                                                        connection_type=connection_type)
+        return pool
+
+    @property
+    def path(self) -> str:
+        return self.__path
+
+    @property
+    def connections(self) -> List[UnixConnection]:
+        return list(self.__connections)
+
+    def __init__(self, path: str, max_connections: int = 4, max_frame_size: int = MAX_FRAME_SIZE,
+                 connection_type: Type[UnixConnection] = UnixConnection):
+        assert max_connections > 0, f"The max_connections should be positive, but {max_connections} given."
+        self.__path = path
+        self.__connection_type = connection_type
+        self.__max_connections = max_connections
+        self.__max_frame_size = max_frame_size
+        self.__connections: List[UnixConnection] = []
+        self.__opening = asyncio.Lock()
+
+    async def acquire(self) -> UnixConnection:
+        self.__connections = [connection for connection in self.__connections if not connection.is_closed]
+        for connection in self.__connections:
+            if connection.in_flight == 0:
+                return connection
+        if len(self.__connections) < self.__max_connections:
+            async with self.__opening:
+                if len(self.__connections) < self.__max_connections:
+                    connection = await self.__connection_type.open(self.__path,
+                                                                   max_frame_size=self.__max_frame_size)
+                    self.__connections.append(connection)
+                    return connection
+        return min(self.__connections, key=lambda connection: connection.in_flight)
+
+    async def close(self):
+        connections, self.__connections = self.__connections, []
+        for connection in connections:
+            await connection.close()
+
+
+class UnixConnector(Connector):
+    """
+    Calls the actions of a `UnixServer` in another process, e.g. `unix://%2Ftmp%2Fplank.sock/service/action`,
+    the path of socket is percent-encoded as the netloc of url. The `codec` should be the same one as the server.
+    """
+
+    @classmethod
+    def support_scheme(cls) -> str:
+        return "unix"
+
+    @classmethod
+    def connection_type(cls) -> Type[UnixConnection]:
+        return UnixConnection
+
+    @property
+    def socket_path(self) -> str:
+        return self.__socket_path
+
+    @property
+    def codec(self) -> Codec:
+        return self.__codec
+
+    @property
+    def max_connections(self) -> int:
+        return self.__max_connections
+
+    @property
+    def runner(self) -> LoopRunner:
+        return self.__runner
+
+    def __init__(self, url: str, **kwargs):
+        super().__init__(url=url, **kwargs)
+        self.__socket_path = unquote(self.url_components.netloc)
+        self.__max_connections = kwargs.get("max_connections", 4)
+        self.__codec = Codec.named(kwargs.get("codec", "binary"))
+        self.__runner: LoopRunner = kwargs.get("runner") or LoopRunner.shared()
+
+    def __pool(self) -> UnixConnectionPool:
+        return UnixConnectionPool.get(self.__socket_path, self.__max_connections,
+                                      connection_type=self.connection_type())
+
+    def send(self, request: Union[Request, SlottedRequest]) -> Union[Response, SlottedResponse]:
+        return self.__runner.run_sync(self.send_async(request=request))
+
+    async def send_async(self, request: Union[Request, SlottedRequest]) -> Union[Response, SlottedResponse]:
+        connection = await self.__pool().acquire()
+        frame_type, payload = await connection.request(self.__codec.dumps_request_buffers(self.path, request))
+        try:
+            if frame_type is FrameType.RESPONSE:
+                return response_for(request, self.__loads(payload))
+            if frame_type is FrameType.ERROR:
+                raise self.__codec.loads_error(payload)
+        finally:
+            connection.commit(payload)
+        raise FrameError(f"The server answered a request by a {frame_type.name} frame, please use `stream`.")
+
+    def __loads(self, payload: Buffer) -> Any:
+        # the values decoded without copying would refer to the payload after it's committed.
+        return self.__codec.loads(bytes(payload) if self.__codec.zero_copy else payload)
+
+    def stream(self, request: Request) -> Iterator[Any]:
+        chunks = self.stream_async(request=request)
+        try:
+            while True:
+                try:
+                    yield self.__runner.run_sync(chunks.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            self.__runner.run_sync(chunks.aclose())
+
+    async def stream_async(self, request: Request) -> AsyncIterator[Any]:
+        connection = await self.__pool().acquire()
+        frames = connection.stream(self.__codec.dumps_request_buffers(self.path, request))
+        try:
+            async for frame_type, payload in frames:
+                try:
+                    if frame_type is FrameType.END:
+                        continue
+                    if frame_type is FrameType.ERROR:
+                        raise self.__codec.loads_error(payload)
+                    # a non-streaming action gives its value as the only chunk.
+                    value = self.__loads(payload)
+                finally:
+                    connection.commit(payload)
+                yield value
+        finally:
+            await frames.aclose()
+
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import struct
+from enum import IntEnum
+from typing import Optional, Tuple, Sequence, Union
+
+# payload length, request id, frame type.
+HEADER = struct.Struct("!IQB")
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class FrameType(IntEnum):
+    REQUEST = 1
+    RESPONSE = 2
+    ERROR = 3
+    # the chunks of a streaming response, ended by END.
+    CHUNK = 4
+    END = 5
+
+
+class FrameError(ValueError):
+    """
+    A malformed or oversized frame, the connection can't be used anymore.
+    """
+
+
+class RemoteError(RuntimeError):
+    """
+    An action failed in another process, the exception is identified by the name of its type.
+    """
+
+    def __init__(self, type_name: str, message: str):
+        super().__init__(f"{type_name}: {message}")
+        self.type_name = type_name
+        self.message = message
+
+
+async def read_frame(reader: asyncio.StreamReader, max_size: int = MAX_FRAME_SIZE) -> Optional[
+        Tuple[FrameType, int, bytes]]:
+    """
+    The next (type, request id, payload), None on a clean end of stream.
+    """
+    try:
+        header = await reader.readexactly(HEADER.size)
+    except asyncio.IncompleteReadError as e:
+        if len(e.partial) == 0:
+            return None
+        raise FrameError("The stream ended in a frame header.")
+    length, request_id, frame_type = HEADER.unpack(header)
+    if length > max_size:
+        raise FrameError(f"The frame of {length} bytes exceeds the limit of {max_size} bytes.")
+    try:
+        frame_type = FrameType(frame_type)
+    except ValueError:
+        raise FrameError(f"Unknown frame type {frame_type}.")
+    payload = await reader.readexactly(length) if length > 0 else b""
+    return frame_type, request_id, payload
+
+
+class FrameChannel:
+    """
+    Sends and receives the frames of a connection, the frame of a sender is never interleaved with the others.
+    """
+
+    async def receive(self) -> Optional[Tuple[FrameType, int, Buffer]]:
+        """
+        The next (type, request id, payload), None when the peer closed the connection.
+        """
+        raise NotImplementedError
+
+    def commit(self, payload: Buffer):
+        """
+        Release the payload of a received frame, e.g. its space in a ring of shared memory.
+        The payload, and the values decoded from it without copying, shouldn't be used after.
+        """
+        pass
+
+    async def send(self, frame_type: FrameType, request_id: int, buffers: Sequence[Buffer]):
+        """
+        Send the concatenated buffers as the payload of a frame, the buffers are not copied into a new payload.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        raise NotImplementedError
+
+
+class FrameStream(FrameChannel):
+    """
+    The frames over a stream, e.g. a unix socket.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                 max_frame_size: int = MAX_FRAME_SIZE):
+        self.__reader = reader
+        self.__writer = writer
+        self.__max_frame_size = max_frame_size
+        self.__write_lock = asyncio.Lock()
+
+    async def receive(self) -> Optional[Tuple[FrameType, int, bytes]]:
+        return await read_frame(self.__reader, max_size=self.__max_frame_size)
+
+    async def send(self, frame_type: FrameType, request_id: int, buffers: Sequence[Buffer]):
+        length = sum(memoryview(buffer).nbytes for buffer in buffers)
+        async with self.__write_lock:
+            self.__writer.write(HEADER.pack(length, request_id, frame_type))
+            self.__writer.writelines(buffers)
+            await self.__writer.drain()
+
+    def close(self):
+        self.__writer.close()
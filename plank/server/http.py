@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import socket
+import traceback
+from http import HTTPStatus
+from typing import Optional, Dict, Any, Tuple, List, Set, Union
+from urllib.parse import unquote, parse_qsl
+
+from pydantic.json import pydantic_encoder
+
+from plank import logger
+from plank.app import Application
+from plank.server import Server, BindAddress
+from plank.server.action.binder import BindingError
+from plank.server.message import SlottedRequest
+from plank.server.message.streaming import StreamingResponse
+from plank.server.route import with_params
+
+_HTTPServer__status_lines = {
+    status.value: f"HTTP/1.1 {status.value} {status.phrase}\r\n".encode("latin-1") for status in HTTPStatus
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: HTTPStatus, message: Optional[str] = None):
+        super().__init__(message or status.phrase)
+        self.status = status
+
+
+class HTTPServer(Server):
+    """
+    An HTTP/1.1 server on asyncio streams, which dispatches requests onto the route table of actions.
+    Connections are kept alive and pipelined, the requests of a connection are dispatched concurrently
+    (at most `max_pipelined`) and answered in order.
+
+    The arguments of a request are the query parameters, the path parameters and the JSON object of body,
+    other bodies are passed as bytes in `body`, and the path parameters override the others of the same names.
+    A response is `{"value": ...}` in JSON, or newline delimited JSON chunks by the chunked transfer coding
+    for a streaming action.
+    """
+
+    class Message:
+        __slots__ = ("method", "path", "query", "version", "headers", "body", "keep_alive")
+
+        def __init__(self, method: str, path: str, query: str, version: str, headers: Dict[str, str], body: bytes,
+                     keep_alive: bool):
+            self.method = method
+            self.path = path
+            self.query = query
+            self.version = version
+            self.headers = headers
+            self.body = body
+            self.keep_alive = keep_alive
+
+    class Connection:
+        __slots__ = ("task", "idle")
+
+        def __init__(self, task: asyncio.Task):
+            self.task = task
+            # waiting for the next request, it can be closed without losing a request.
+            self.idle = True
+
+    @property
+    def max_header_size(self) -> int:
+        return self.__max_header_size
+
+    @property
+    def max_body_size(self) -> int:
+        return self.__max_body_size
+
+    @property
+    def sockets(self) -> List[Any]:
+        return [] if self.__server is None else list(self.__server.sockets)
+
+    @property
+    def bound_address(self) -> Optional[BindAddress]:
+        """
+        The address actually bound, e.g. the port chosen by the system for port 0.
+        """
+        sockets = self.sockets
+        if len(sockets) == 0:
+            return None
+        host, port = sockets[0].getsockname()[:2]
+        return BindAddress(host, port)
+
+    def __init__(self, application: Application, delegate: Optional[Server.Delegate] = None,
+                 path_prefix: Optional[str] = None, max_header_size: int = 64 * 1024,
+                 max_body_size: int = 8 * 1024 * 1024, keep_alive_timeout: float = 75.0, max_pipelined: int = 16,
+                 drain_timeout: float = 30.0):
+        super().__init__(application=application, delegate=delegate, path_prefix=path_prefix)
+        self.__max_header_size = max_header_size
+        self.__max_body_size = max_body_size
+        self.__keep_alive_timeout = keep_alive_timeout
+        self.__max_pipelined = max_pipelined
+        self.__drain_timeout = drain_timeout
+        self.__server: Optional[asyncio.AbstractServer] = None
+        self.__connections: Set[HTTPServer.Connection] = set()
+        self.__closing = False
+
+    async def start(self, sock: Optional[Any] = None, **options):
+        """
+        Listen on the bind address, or on `sock` if given, e.g. a socket shared by worker processes.
+        """
+        self.__closing = False
+        if sock is not None:
+            self.__server = await asyncio.start_server(self.__accept, sock=sock, limit=self.__max_header_size)
+        else:
+            address = self.bind_address
+            assert address is not None, "The server should listen on an address before starting."
+            self.__server = await asyncio.start_server(self.__accept, host=address.host, port=address.port,
+                                                       limit=self.__max_header_size, reuse_address=True)
+        logger.info(f"http server did start: {self.bound_address.description()}")
+        self.did_startup()
+
+    async def stop(self):
+        """
+        Stop accepting, close the idle connections and wait for the in-flight requests up to `drain_timeout`.
+        """
+        if self.__server is None:
+            return
+        self.__closing = True
+        self.__server.close()
+        for connection in list(self.__connections):
+            if connection.idle:
+                connection.task.cancel()
+        tasks = [connection.task for connection in self.__connections]
+        if len(tasks) > 0:
+            _, pending = await asyncio.wait(tasks, timeout=self.__drain_timeout)
+            for task in pending:
+                task.cancel()
+        await self.__server.wait_closed()
+        self.__server = None
+        logger.info("http server did stop.")
+        self.did_shutdown()
+
+    async def __accept(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        sock = writer.get_extra_info("socket")
+        if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+            # asyncio skips it for the sockets created with proto 0, e.g. a shared listening socket,
+            # then the pipelined responses are delayed by Nagle's algorithm.
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        connection = HTTPServer.Connection(task=asyncio.current_task())
+        self.__connections.add(connection)
+        try:
+            await self.__serve_connection(connection, reader, writer)
+        except (asyncio.CancelledError, ConnectionError):
+            pass
+        finally:
+            self.__connections.discard(connection)
+            writer.close()
+
+    async def __serve_connection(self, connection: HTTPServer.Connection, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter):
+        loop = asyncio.get_running_loop()
+        responses: asyncio.Queue = asyncio.Queue(maxsize=self.__max_pipelined)
+        writing = loop.create_task(self.__write_responses(responses, writer))
+        try:
+            keep_alive = True
+            while keep_alive and not self.__closing:
+                connection.idle = True
+                # cheaper than `wait_for` per request, the connection is cancelled if it idles too long.
+                timer = loop.call_later(self.__keep_alive_timeout, connection.task.cancel)
+                try:
+                    message = await self.__read_message(reader, writer)
+                except HTTPError as e:
+                    await responses.put((loop.create_task(self.__error(e.status, str(e))), False))
+                    break
+                except asyncio.IncompleteReadError:
+                    break
+                finally:
+                    timer.cancel()
+                if message is None:
+                    break
+                connection.idle = False
+                keep_alive = message.keep_alive and not self.__closing
+                await responses.put((loop.create_task(self.__dispatch(message)), keep_alive))
+        finally:
+            await responses.put(None)
+            await writing
+
+    async def __read_message(self, reader: asyncio.StreamReader,
+                             writer: asyncio.StreamWriter) -> Optional[HTTPServer.Message]:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as e:
+            if len(e.partial) == 0:
+                return None
+            raise
+        except asyncio.LimitOverrunError:
+            raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+
+        lines = head[:-4].decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ", 2)
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line.")
+        if version not in ("HTTP/1.1", "HTTP/1.0"):
+            raise HTTPError(HTTPStatus.HTTP_VERSION_NOT_SUPPORTED)
+
+        headers = {}
+        for line in lines[1:]:
+            name, separator, value = line.partition(":")
+            if not separator:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed header.")
+            headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.1":
+            keep_alive = connection != "close"
+        else:
+            keep_alive = connection == "keep-alive"
+
+        if headers.get("expect", "").lower() == "100-continue":
+            writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+
+        transfer_encoding = headers.get("transfer-encoding")
+        if transfer_encoding is not None:
+            if transfer_encoding.lower() != "chunked":
+                raise HTTPError(HTTPStatus.NOT_IMPLEMENTED, f"Transfer encoding {transfer_encoding} is unsupported.")
+            body = await self.__read_chunked(reader)
+        else:
+            try:
+                length = int(headers.get("content-length", "0"))
+            except ValueError:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed content length.")
+            if length < 0:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed content length.")
+            if length > self.__max_body_size:
+                raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+            body = await reader.readexactly(length) if length > 0 else b""
+
+        path, _, query = target.partition("?")
+        return HTTPServer.Message(method=method, path=unquote(path), query=query, version=version, headers=headers,
+                                  body=body, keep_alive=keep_alive)
+
+    async def __read_chunked(self, reader: asyncio.StreamReader) -> bytes:
+        chunks = []
+        size = 0
+        while True:
+            try:
+                size_line = await reader.readuntil(b"\r\n")
+                chunk_size = int(size_line.split(b";", 1)[0], 16)
+            except asyncio.LimitOverrunError:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed chunk.")
+            except ValueError:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed chunk.")
+            if chunk_size < 0:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed chunk.")
+            if chunk_size == 0:
+                # the trailers are ignored.
+                try:
+                    while (await reader.readuntil(b"\r\n")) != b"\r\n":
+                        pass
+                except asyncio.LimitOverrunError:
+                    raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+                return b"".join(chunks)
+            size += chunk_size
+            if size > self.__max_body_size:
+                raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+            chunks.append(await reader.readexactly(chunk_size))
+            if await reader.readexactly(2) != b"\r\n":
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed chunk.")
+
+    def arguments(self, message: HTTPServer.Message, params: Dict[str, Any]) -> Dict[str, Any]:
+        arguments = dict(parse_qsl(message.query, keep_blank_values=True)) if message.query else {}
+        if len(message.body) > 0:
+            content_type = message.headers.get("content-type", "application/json")
+            if content_type.startswith("application/json"):
+                try:
+                    # decoded from the bytes of body directly.
+                    body = json.loads(message.body)
+                except ValueError:
+                    raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed JSON body.")
+                if not isinstance(body, dict):
+                    raise HTTPError(HTTPStatus.BAD_REQUEST, "The JSON body should be an object.")
+                arguments.update(body)
+            else:
+                arguments["body"] = message.body
+        return with_params(arguments, params)
+
+    async def __dispatch(self, message: HTTPServer.Message) -> Tuple[int, List[Tuple[str, str]], Union[
+            bytes, StreamingResponse]]:
+        match = self.match_action(message.path)
+        if match is None:
+            return await self.__error(HTTPStatus.NOT_FOUND, f"No action for {message.path}.")
+        try:
+            request = SlottedRequest(method=message.method, arguments=self.arguments(message, match.params),
+                                     headers=message.headers)
+            response = await match.action.receive(request)
+        except HTTPError as e:
+            return await self.__error(e.status, str(e))
+        except BindingError as e:
+            return await self.__error(HTTPStatus.BAD_REQUEST, f"Invalid arguments: {e}")
+        except Exception as e:
+            # the details of error are logged, but not sent to the client.
+            logger.error(f"The error happened on {message.method} {message.path}: {e!r}", traceback.format_exc(),
+                         sep="\n")
+            return await self.__error(HTTPStatus.INTERNAL_SERVER_ERROR, HTTPStatus.INTERNAL_SERVER_ERROR.phrase)
+
+        if isinstance(response, StreamingResponse):
+            return HTTPStatus.OK.value, [("Content-Type", "application/x-ndjson")], response
+        body = json.dumps({"value": response.value}, default=pydantic_encoder).encode("utf-8")
+        return HTTPStatus.OK.value, [("Content-Type", "application/json")], body
+
+    async def __error(self, status: HTTPStatus, message: str) -> Tuple[int, List[Tuple[str, str]], bytes]:
+        body = json.dumps({"error": message}).encode("utf-8")
+        return status.value, [("Content-Type", "application/json")], body
+
+    async def __write_responses(self, responses: asyncio.Queue, writer: asyncio.StreamWriter):
+        broken = False
+        while True:
+            item = await responses.get()
+            if item is None:
+                return
+            task, keep_alive = item
+            if broken:
+                task.cancel()
+                continue
+            try:
+                status, headers, body = await task
+                await self.__write_response(writer, status, headers, body, keep_alive)
+            except (ConnectionError, asyncio.CancelledError):
+                # the reader would stop on the closed transport, the rest of responses are discarded.
+                broken = True
+                writer.transport.abort()
+
+    async def __write_response(self, writer: asyncio.StreamWriter, status: int, headers: List[Tuple[str, str]],
+                               body: Union[bytes, StreamingResponse], keep_alive: bool):
+        head = [_HTTPServer__status_lines[status]]
+        for name, value in headers:
+            head.append(f"{name}: {value}\r\n".encode("latin-1"))
+        head.append(b"Connection: keep-alive\r\n" if keep_alive else b"Connection: close\r\n")
+
+        if not isinstance(body, StreamingResponse):
+            head.append(f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1"))
+            writer.writelines(head + [body])
+            await writer.drain()
+            return
+
+        head.append(b"Transfer-Encoding: chunked\r\n\r\n")
+        writer.writelines(head)
+        try:
+            async for chunk in body:
+                line = json.dumps(chunk, default=pydantic_encoder).encode("utf-8") + b"\n"
+                writer.writelines([f"{len(line):x}\r\n".encode("latin-1"), line, b"\r\n"])
+                # waits for the client, so the stream is produced no faster than it's consumed.
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            raise
+        except Exception as e:
+            # the status was sent, the error ends the stream without the last chunk.
+            logger.error(f"The error happened on streaming: {e!r}")
+            writer.transport.abort()
+            raise ConnectionError(str(e))
+        finally:
+            await body.aclose()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
@@ -1,4 +1,4 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
 
 from pydantic import BaseModel
 
@@ -14,3 +14,72 @@ class Request(BaseModel):
 
 class Response(BaseModel):
     value: Any
+
+
+class SlottedRequest:
+    """
+    The request of the internal path, e.g. `inline://`, without the construction and validation of pydantic.
+    It's converted from and into `Request` only where a request is serialized.
+    """
+    __slots__ = ("method", "headers", "arguments")
+
+    def __init__(self, method: str, arguments: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        self.method = method
+        self.headers = headers if headers is not None else {}
+        self.arguments = arguments
+
+    def header(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        return self.headers.get(key, default)
+
+    def copy(self, update: Optional[Dict[str, Any]] = None) -> "SlottedRequest":
+        request = SlottedRequest(method=self.method, arguments=self.arguments, headers=self.headers)
+        for name, value in (update or {}).items():
+            setattr(request, name, value)
+        return request
+
+    @classmethod
+    def from_model(cls, request: Request) -> "SlottedRequest":
+        return cls(method=request.method, arguments=request.arguments, headers=request.headers)
+
+    def to_model(self) -> Request:
+        return Request.construct(method=self.method, headers=self.headers, arguments=self.arguments)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, SlottedRequest) and (self.method, self.headers, self.arguments) == (
+            other.method, other.headers, other.arguments)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(method={self.method!r}, headers={self.headers!r}, " \
+               f"arguments={self.arguments!r})"
+
+
+class SlottedResponse:
+    """
+    The response of a `SlottedRequest`.
+    """
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    @classmethod
+    def from_model(cls, response: Response) -> "SlottedResponse":
+        return cls(value=response.value)
+
+    def to_model(self) -> Response:
+        return Response.construct(value=self.value)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, SlottedResponse) and self.value == other.value
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(value={self.value!r})"
+
+
+def response_for(request: Union[Request, SlottedRequest], value: Any) -> Union[Response, SlottedResponse]:
+    """
+    The response of the same family as `request`.
+    """
+    if request.__class__ is SlottedRequest:
+        return SlottedResponse(value)
+    return Response(value=value)
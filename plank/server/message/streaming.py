@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+from collections.abc import Iterator, AsyncIterator
+from typing import Any, Optional, Union, Iterable, AsyncIterable, TYPE_CHECKING
+
+from plank.metrics import Metrics
+
+if TYPE_CHECKING:
+    from plank.plugin import Plugin
+    from plank.server.action.execution import ExecutionPolicy
+
+_StreamingResponse__chunk = "chunk"
+_StreamingResponse__error = "error"
+_StreamingResponse__end = "end"
+_StreamingResponse__exhausted = object()
+
+
+def is_streaming(value: Any) -> bool:
+    """
+    Whether an end point returned a stream of chunks, a sync or async iterator (e.g. a generator) but not a collection.
+    """
+    return isinstance(value, (Iterator, AsyncIterator))
+
+
+class StreamingResponse:
+    """
+    The chunks of an action which returned a sync or async iterator, consumed by `async for`.
+    The producer runs ahead of the consumer by at most `max_buffered` chunks and waits while the buffer is full,
+    it starts on the first iteration in the loop of the consumer.
+    The request of `path` is measured until the stream ends, fails or is closed, instead of until it's returned.
+    """
+
+    @property
+    def max_buffered(self) -> int:
+        return self.__max_buffered
+
+    @property
+    def is_closed(self) -> bool:
+        return self.__closed
+
+    def __init__(self, source: Union[Iterable, AsyncIterable], max_buffered: int = 16,
+                 execution: Optional[ExecutionPolicy] = None, plugin: Optional[Plugin] = None,
+                 path: Optional[str] = None, start: int = 0):
+        """
+        `execution` runs each step of a sync iterator, e.g. in a thread if it blocks.
+        `plugin` is activated while producing the chunks, and `start` is given by `Metrics.begin(path)`.
+        """
+        assert max_buffered > 0, f"The max_buffered of stream should be positive, but {max_buffered} given."
+        self.__source = source
+        self.__max_buffered = max_buffered
+        self.__execution = execution
+        self.__plugin = plugin
+        self.__path = path
+        self.__start = start
+        self.__queue: Optional[asyncio.Queue] = None
+        self.__producer: Optional[asyncio.Task] = None
+        self.__closed = False
+
+    def __aiter__(self) -> StreamingResponse:
+        return self
+
+    async def __anext__(self) -> Any:
+        if self.__closed:
+            raise StopAsyncIteration
+        if self.__producer is None:
+            self.__queue = asyncio.Queue(maxsize=self.__max_buffered)
+            self.__producer = asyncio.get_running_loop().create_task(self.__produce())
+        kind, value = await self.__queue.get()
+        if kind == _StreamingResponse__chunk:
+            return value
+        self.__closed = True
+        if kind == _StreamingResponse__error:
+            raise value
+        raise StopAsyncIteration
+
+    async def aclose(self):
+        """
+        Stop the producer and close the source, e.g. when the consumer leaves early.
+        """
+        self.__closed = True
+        producer, self.__producer = self.__producer, None
+        if producer is not None and not producer.done():
+            producer.cancel()
+            try:
+                await producer
+            except asyncio.CancelledError:
+                pass
+        try:
+            if inspect.isasyncgen(self.__source):
+                await self.__source.aclose()
+            elif inspect.isgenerator(self.__source):
+                self.__source.close()
+        finally:
+            # e.g. closed before the first iteration.
+            self.__measured(error=False)
+
+    def __measured(self, error: bool):
+        path, self.__path = self.__path, None
+        if path is not None:
+            Metrics.default().end(path, self.__start, error=error)
+
+    async def __produce(self):
+        from plank.plugin import Plugin
+        queue = self.__queue
+        try:
+            with Plugin.activated(self.__plugin):
+                if isinstance(self.__source, AsyncIterable):
+                    async for chunk in self.__source:
+                        await queue.put((_StreamingResponse__chunk, chunk))
+                else:
+                    iterator = iter(self.__source)
+                    while True:
+                        chunk = await self.__next(iterator)
+                        if chunk is _StreamingResponse__exhausted:
+                            break
+                        await queue.put((_StreamingResponse__chunk, chunk))
+        except asyncio.CancelledError:
+            # the consumer left early.
+            self.__measured(error=False)
+            raise
+        except BaseException as e:
+            self.__measured(error=True)
+            await queue.put((_StreamingResponse__error, e))
+            return
+        self.__measured(error=False)
+        await queue.put((_StreamingResponse__end, None))
+
+    async def __next(self, iterator: Iterator) -> Any:
+        from plank.server.action.execution import ExecutionPolicy
+        # iterators can't be sent to another process, so they are stepped in the loop or in a thread only.
+        if self.__execution is not None and self.__execution.kind is ExecutionPolicy.Kind.THREAD:
+            return await self.__execution.run(next, (iterator, _StreamingResponse__exhausted), {})
+        return next(iterator, _StreamingResponse__exhausted)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(source={self.__source!r}, max_buffered={self.__max_buffered})"
@@ -0,0 +1,412 @@
+from __future__ import annotations
+
+import asyncio
+import struct
+import sys
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from collections import OrderedDict
+from typing import Optional, Tuple, List, Sequence, Set, Dict
+
+from plank import logger
+from plank.server.framing import FrameType, FrameError, FrameChannel, MAX_FRAME_SIZE, Buffer
+
+HANDSHAKE = b"plank-shm/1\n"
+
+# payload length, request id, frame type, flags, aligned to 16 bytes.
+RECORD = struct.Struct("=IQBB2x")
+# the rest of ring is skipped, the next record is at the start.
+WRAP = 0
+# a fragment of a frame, followed by the next fragment.
+MORE = 1
+
+_u64 = struct.Struct("=Q")
+# the counters of producer and consumer are on their own cache lines.
+_HEAD = 0
+_TAIL = 64
+_CONSUMER_WAITING = 128
+_PRODUCER_WAITING = 192
+_CAPACITY = 200
+_DATA = 256
+
+# the names of segments created by this process, their attachments are tracked by the creator already.
+_created_names: Set[str] = set()
+
+
+def _align(size: int) -> int:
+    return (size + 7) & ~7
+
+
+def _retrieve_exception(task: asyncio.Task):
+    if not task.cancelled():
+        task.exception()
+
+
+class SharedRing:
+    """
+    A single-producer single-consumer ring of records in shared memory.
+    The head and the tail only increase, the producer publishes a record by moving the head after writing it,
+    and the consumer releases it by moving the tail after reading it. The consumer could hold several records
+    and release them in any order, the tail moves over a record once the records before it were released too.
+    """
+
+    @classmethod
+    def create(cls, capacity: int) -> SharedRing:
+        capacity = _align(capacity)
+        assert capacity >= 4 * RECORD.size, f"The capacity of ring is too small: {capacity} bytes."
+        memory = SharedMemory(create=True, size=_DATA + capacity)
+        memory.buf[:_DATA] = bytes(_DATA)
+        _u64.pack_into(memory.buf, _CAPACITY, capacity)
+        _created_names.add(memory.name)
+        return cls(memory=memory, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> SharedRing:
+        if sys.version_info >= (3, 13):
+            memory = SharedMemory(name=name, track=False)
+        else:
+            memory = SharedMemory(name=name)
+            if name not in _created_names:
+                # the creator unlinks the segment, otherwise the tracker of this process would unlink it on exit.
+                resource_tracker.unregister(memory._name, "shared_memory")
+        return cls(memory=memory, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.__memory.name
+
+    @property
+    def capacity(self) -> int:
+        return self.__capacity
+
+    @property
+    def used(self) -> int:
+        return self.__get(_HEAD) - self.__get(_TAIL)
+
+    @property
+    def consumer_waiting(self) -> bool:
+        return self.__get(_CONSUMER_WAITING) != 0
+
+    @consumer_waiting.setter
+    def consumer_waiting(self, waiting: bool):
+        self.__set(_CONSUMER_WAITING, 1 if waiting else 0)
+
+    @property
+    def producer_waiting(self) -> bool:
+        return self.__get(_PRODUCER_WAITING) != 0
+
+    @producer_waiting.setter
+    def producer_waiting(self, waiting: bool):
+        self.__set(_PRODUCER_WAITING, 1 if waiting else 0)
+
+    def __init__(self, memory: SharedMemory, owner: bool):
+        self.__memory = memory
+        self.__owner = owner
+        self.__header = memory.buf[:_DATA]
+        self.__capacity = _u64.unpack_from(self.__header, _CAPACITY)[0]
+        self.__data = memory.buf[_DATA:_DATA + self.__capacity]
+        # the position after the records read.
+        self.__cursor = self.__get(_TAIL)
+        # whether the records read are released, by their ends in order.
+        self.__held: OrderedDict[int, bool] = OrderedDict()
+
+    def __get(self, offset: int) -> int:
+        return _u64.unpack_from(self.__header, offset)[0]
+
+    def __set(self, offset: int, value: int):
+        _u64.pack_into(self.__header, offset, value)
+
+    def try_write(self, frame_type: int, request_id: int, flags: int, parts: Sequence[memoryview],
+                  length: int) -> bool:
+        """
+        Write a record of the concatenated parts, False without writing if the ring doesn't have the space.
+        """
+        capacity = self.__capacity
+        head = self.__get(_HEAD)
+        position = head % capacity
+        size = _align(RECORD.size + length)
+        contiguous = capacity - position
+        # a record is never split by the end of ring.
+        skipped = contiguous if contiguous < size else 0
+        if capacity - (head - self.__get(_TAIL)) < skipped + size:
+            return False
+        data = self.__data
+        if skipped > 0:
+            if skipped >= RECORD.size:
+                RECORD.pack_into(data, position, 0, 0, WRAP, 0)
+            head += skipped
+            position = 0
+        offset = position + RECORD.size
+        for part in parts:
+            end = offset + len(part)
+            data[offset:end] = part
+            offset = end
+        RECORD.pack_into(data, position, length, request_id, frame_type, flags)
+        self.__set(_HEAD, head + size)
+        return True
+
+    def read(self) -> Optional[Tuple[int, int, int, memoryview, int]]:
+        """
+        The next (type, request id, flags, payload, end), the payload is a view of ring until `release(end)`.
+        """
+        capacity = self.__capacity
+        data = self.__data
+        head = self.__get(_HEAD)
+        cursor = self.__cursor
+        while cursor < head:
+            position = cursor % capacity
+            contiguous = capacity - position
+            if contiguous < RECORD.size:
+                cursor += contiguous
+                continue
+            length, request_id, frame_type, flags = RECORD.unpack_from(data, position)
+            if frame_type == WRAP:
+                cursor += contiguous
+                continue
+            end = self.__cursor = cursor + _align(RECORD.size + length)
+            self.__held[end] = False
+            start = position + RECORD.size
+            return frame_type, request_id, flags, data[start:start + length], end
+        self.__cursor = cursor
+        if len(self.__held) == 0:
+            # the skipped end of ring is released at once.
+            self.__set(_TAIL, cursor)
+        return None
+
+    def release(self, end: int):
+        """
+        Release the record read before `end`, its space is reused by the producer.
+        """
+        held = self.__held
+        if end not in held:
+            return
+        held[end] = True
+        tail = None
+        while len(held) > 0 and next(iter(held.values())):
+            tail, _ = held.popitem(last=False)
+        if tail is not None:
+            self.__set(_TAIL, tail)
+
+    def close(self):
+        self.__header.release()
+        self.__data.release()
+        try:
+            self.__memory.close()
+        except BufferError:
+            # a payload is still referred, e.g. by the bytes decoded without copying, it's unmapped when collected.
+            logger.warn(f"shared memory {self.__memory.name} is closed while its payloads are still referred.")
+        if self.__owner:
+            _created_names.discard(self.__memory.name)
+            try:
+                self.__memory.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class RingChannel(FrameChannel):
+    """
+    The frames between two processes through a ring to send and a ring to receive,
+    a frame larger than a quarter of ring is sent by fragments so the consumer drains it meanwhile.
+
+    A side waiting for data or space sets its flag in the ring, the other side clears the flag and
+    notifies it by a byte on the unix socket. So the socket is only written while the peer is waiting,
+    and `poll_interval` limits the delay of a notification lost in a race.
+
+    The payload of a frame in one record is a view of the ring, its space is reused after `commit`.
+    The payload of a fragmented frame is assembled into a buffer, since the fragments are released on arrival
+    so the producer could write the rest of frame.
+    """
+    DATA = b"\x01"
+    SPACE = b"\x02"
+
+    class Pending:
+        __slots__ = ("frame_type", "request_id", "payload")
+
+        def __init__(self, frame_type: int, request_id: int):
+            self.frame_type = frame_type
+            self.request_id = request_id
+            self.payload = bytearray()
+
+    @property
+    def outbound(self) -> SharedRing:
+        return self.__outbound
+
+    @property
+    def inbound(self) -> SharedRing:
+        return self.__inbound
+
+    def __init__(self, outbound: SharedRing, inbound: SharedRing, reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter, max_frame_size: int = MAX_FRAME_SIZE, poll_interval: float = 0.05):
+        self.__outbound = outbound
+        self.__inbound = inbound
+        self.__reader = reader
+        self.__writer = writer
+        self.__max_frame_size = max_frame_size
+        self.__poll_interval = poll_interval
+        self.__max_fragment = (outbound.capacity // 4 - RECORD.size) & ~7
+        self.__data = asyncio.Event()
+        self.__space = asyncio.Event()
+        self.__send_lock = asyncio.Lock()
+        # the fragments of the frame being received, kept across the calls of `receive`.
+        self.__pending: Optional[RingChannel.Pending] = None
+        # the payloads received as views of the inbound ring and their ends in ring, by id until committed.
+        self.__leases: Dict[int, Tuple[memoryview, int]] = {}
+        # the peer closed the socket, the inbound ring is still drained.
+        self.__disconnected = False
+        self.__closed = False
+        self.__listening = asyncio.get_running_loop().create_task(self.__listen())
+
+    async def __listen(self):
+        try:
+            while True:
+                signals = await self.__reader.read(64)
+                if len(signals) == 0:
+                    break
+                if RingChannel.DATA in signals:
+                    self.__data.set()
+                if RingChannel.SPACE in signals:
+                    self.__space.set()
+        except ConnectionError:
+            pass
+        finally:
+            self.__disconnected = True
+            self.__data.set()
+            self.__space.set()
+
+    def __notify(self, signal: bytes):
+        if not self.__disconnected and not self.__writer.transport.is_closing():
+            self.__writer.write(signal)
+
+    async def __wait(self, event: asyncio.Event):
+        try:
+            await asyncio.wait_for(event.wait(), self.__poll_interval)
+        except asyncio.TimeoutError:
+            pass
+
+    async def send(self, frame_type: FrameType, request_id: int, buffers: Sequence[Buffer]):
+        fragments = self.__fragments(buffers)
+        if len(fragments) == 1:
+            # nothing is written before the record is complete, so the caller can be cancelled at any await.
+            await self.__write(frame_type, request_id, fragments)
+            return
+        # a frame cut off between fragments would be glued to the next frame by the receiver,
+        # so the fragments are written to the end by a task even if the caller is cancelled.
+        writing = asyncio.get_running_loop().create_task(self.__write(frame_type, request_id, fragments))
+        writing.add_done_callback(_retrieve_exception)
+        await asyncio.shield(writing)
+
+    async def __write(self, frame_type: FrameType, request_id: int, fragments: List[Tuple[List[memoryview], int]]):
+        async with self.__send_lock:
+            ring = self.__outbound
+            for index, (parts, length) in enumerate(fragments):
+                flags = MORE if index < len(fragments) - 1 else 0
+                while True:
+                    if self.__closed or self.__disconnected:
+                        raise ConnectionError("The shared memory channel was closed.")
+                    if ring.try_write(frame_type, request_id, flags, parts, length):
+                        break
+                    # the ring is full, waits for the consumer instead of buffering.
+                    ring.producer_waiting = True
+                    self.__space.clear()
+                    if ring.try_write(frame_type, request_id, flags, parts, length):
+                        break
+                    await self.__wait(self.__space)
+                if ring.consumer_waiting:
+                    ring.consumer_waiting = False
+                    self.__notify(RingChannel.DATA)
+
+    def __fragments(self, buffers: Sequence[Buffer]) -> List[Tuple[List[memoryview], int]]:
+        max_fragment = self.__max_fragment
+        fragments = []
+        parts = []
+        length = 0
+        for buffer in buffers:
+            view = memoryview(buffer).cast("B")
+            while len(view) > 0:
+                part = view[:max_fragment - length]
+                parts.append(part)
+                length += len(part)
+                view = view[len(part):]
+                if length == max_fragment:
+                    fragments.append((parts, length))
+                    parts = []
+                    length = 0
+        if length > 0 or len(fragments) == 0:
+            fragments.append((parts, length))
+        return fragments
+
+    async def receive(self) -> Optional[Tuple[FrameType, int, Buffer]]:
+        ring = self.__inbound
+        waiting = False
+        while True:
+            if self.__closed:
+                return None
+            record = ring.read()
+            if record is None:
+                if self.__disconnected:
+                    return None
+                ring.consumer_waiting = waiting = True
+                self.__data.clear()
+                record = ring.read()
+                if record is None:
+                    await self.__wait(self.__data)
+                    continue
+            if waiting:
+                ring.consumer_waiting = waiting = False
+            frame_type, request_id, flags, view, end = record
+            pending = self.__pending
+            if pending is not None and (pending.request_id != request_id or pending.frame_type != frame_type):
+                logger.warn(f"shared memory channel dropped the incomplete frame of request {pending.request_id}.")
+                pending = self.__pending = None
+            if pending is None and flags & MORE == 0:
+                # not copied, the space is released when the consumer commits the payload.
+                payload = view
+                self.__leases[id(view)] = (view, end)
+            else:
+                if pending is None:
+                    pending = self.__pending = RingChannel.Pending(frame_type=frame_type, request_id=request_id)
+                pending.payload += view
+                payload = pending.payload
+                view.release()
+                self.__release(end)
+            if len(payload) > self.__max_frame_size:
+                self.commit(payload)
+                raise FrameError(f"The frame exceeds the limit of {self.__max_frame_size} bytes.")
+            if flags & MORE:
+                continue
+            self.__pending = None
+            try:
+                return FrameType(frame_type), request_id, payload
+            except ValueError:
+                self.commit(payload)
+                raise FrameError(f"Unknown frame type {frame_type}.")
+
+    def commit(self, payload: Buffer):
+        lease = self.__leases.pop(id(payload), None)
+        if lease is None or self.__closed:
+            return
+        view, end = lease
+        view.release()
+        self.__release(end)
+
+    def __release(self, end: int):
+        ring = self.__inbound
+        ring.release(end)
+        if ring.producer_waiting:
+            ring.producer_waiting = False
+            self.__notify(RingChannel.SPACE)
+
+    def close(self):
+        if self.__closed:
+            return
+        self.__closed = True
+        self.__listening.cancel()
+        self.__writer.close()
+        # wakes the waiting sender and receiver up, they see the channel closed.
+        self.__data.set()
+        self.__space.set()
+        leases, self.__leases = self.__leases, {}
+        for view, _ in leases.values():
+            view.release()
+        self.__outbound.close()
+        self.__inbound.close()
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from typing import Dict, Optional, List, Tuple, Any, TYPE_CHECKING
+
+from plank.utils.path import clearify
+
+if TYPE_CHECKING:
+    from plank.server.action import Action
+
+
+def normalize(path: str) -> str:
+    return "/" + clearify(path)
+
+
+def with_params(arguments: Dict[str, Any], params: Dict[str, str]) -> Dict[str, Any]:
+    """
+    The arguments of a request with the parameters of its path, which override the arguments of the same names.
+    """
+    if len(params) == 0:
+        return arguments
+    return dict(arguments, **params)
+
+
+def _param_name(segment: str) -> Optional[str]:
+    if len(segment) > 2 and segment[0] == "{" and segment[-1] == "}":
+        return segment[1:-1]
+    return None
+
+
+class RouteMatch:
+    __slots__ = ("action", "params", "template")
+
+    def __init__(self, action: Action, params: Dict[str, str], template: str):
+        self.action = action
+        self.params = params
+        self.template = template
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(template={self.template}, params={self.params})"
+
+
+class RouteTable:
+    """
+    Static paths are resolved by a single dict lookup, paths with `{name}` segments by a segment trie.
+    """
+
+    class Node:
+        __slots__ = ("children", "param_name", "param_child", "action", "template")
+
+        def __init__(self):
+            self.children: Dict[str, RouteTable.Node] = {}
+            self.param_name: Optional[str] = None
+            self.param_child: Optional[RouteTable.Node] = None
+            self.action: Optional[Action] = None
+            self.template: Optional[str] = None
+
+        def is_empty(self) -> bool:
+            return self.action is None and self.param_child is None and len(self.children) == 0
+
+    def __init__(self):
+        self.__static: Dict[str, Action] = {}
+        self.__dynamic: Dict[str, Action] = {}
+        self.__root = RouteTable.Node()
+
+    def __len__(self) -> int:
+        return len(self.__static) + len(self.__dynamic)
+
+    def __contains__(self, path: str) -> bool:
+        return self.get(path) is not None
+
+    def actions(self) -> Dict[str, Action]:
+        actions = dict(self.__static)
+        actions.update(self.__dynamic)
+        return actions
+
+    def add(self, path: str, action: Action):
+        path = normalize(path)
+        segments = path.split("/")[1:]
+        if not any(_param_name(segment) for segment in segments):
+            self.__static[path] = action
+            return
+
+        node = self.__root
+        for segment in segments:
+            param_name = _param_name(segment)
+            if param_name is None:
+                node = node.children.setdefault(segment, RouteTable.Node())
+            else:
+                if node.param_child is None:
+                    node.param_child = RouteTable.Node()
+                    node.param_name = param_name
+                elif node.param_name != param_name:
+                    raise ValueError(
+                        f"The route {path} conflicts with parameter `{{{node.param_name}}}` at the same position.")
+                node = node.param_child
+        node.action = action
+        node.template = path
+        self.__dynamic[path] = action
+
+    def remove(self, path: str) -> Action:
+        path = normalize(path)
+        if path in self.__static:
+            return self.__static.pop(path)
+
+        action = self.__dynamic.pop(path)
+        trail: List[Tuple[RouteTable.Node, str]] = []
+        node = self.__root
+        for segment in path.split("/")[1:]:
+            trail.append((node, segment))
+            node = node.param_child if _param_name(segment) is not None else node.children[segment]
+        node.action = None
+        node.template = None
+        # prune the branches which have no routes anymore.
+        for parent, segment in reversed(trail):
+            if not node.is_empty():
+                break
+            if _param_name(segment) is not None:
+                parent.param_child = None
+                parent.param_name = None
+            else:
+                del parent.children[segment]
+            node = parent
+        return action
+
+    def get(self, path: str) -> Optional[Action]:
+        match = self.match(path)
+        return None if match is None else match.action
+
+    def match(self, path: str) -> Optional[RouteMatch]:
+        action = self.__static.get(path)
+        if action is None:
+            path = normalize(path)
+            action = self.__static.get(path)
+        if action is not None:
+            return RouteMatch(action=action, params={}, template=path)
+        if len(self.__dynamic) == 0:
+            return None
+        return self.__match_node(self.__root, path.split("/")[1:], 0, {})
+
+    def __match_node(self, node: RouteTable.Node, segments: List[str], index: int,
+                     params: Dict[str, str]) -> Optional[RouteMatch]:
+        if index == len(segments):
+            if node.action is None:
+                return None
+            return RouteMatch(action=node.action, params=dict(params), template=node.template)
+
+        segment = segments[index]
+        child = node.children.get(segment)
+        if child is not None:
+            match = self.__match_node(child, segments, index + 1, params)
+            if match is not None:
+                return match
+
+        if node.param_child is not None and segment != "":
+            params[node.param_name] = segment
+            match = self.__match_node(node.param_child, segments, index + 1, params)
+            del params[node.param_name]
+            return match
+
+        return None
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Optional, Union
+
+from plank.app import Application
+from plank.server import Server
+from plank.server.codec import Codec
+from plank.server.framing import FrameError, FrameChannel, MAX_FRAME_SIZE
+from plank.server.ring import SharedRing, RingChannel, HANDSHAKE
+from plank.server.unix import UnixServer
+
+
+class ShmServer(UnixServer):
+    """
+    Serves actions to the processes on the same host through shared memory, e.g. for `shm://` connectors.
+    A connector connects to the unix socket at the path of bind address, then the server creates a ring of
+    `capacity` bytes for its requests and one for its responses. The socket only carries the notifications.
+    """
+
+    @property
+    def capacity(self) -> int:
+        return self.__capacity
+
+    def __init__(self, application: Application, delegate: Optional[Server.Delegate] = None,
+                 path_prefix: Optional[str] = None, max_frame_size: int = MAX_FRAME_SIZE, max_in_flight: int = 1024,
+                 drain_timeout: float = 30.0, codec: Union[str, Codec] = "binary", capacity: int = 4 * 1024 * 1024,
+                 poll_interval: float = 0.05):
+        super().__init__(application=application, delegate=delegate, path_prefix=path_prefix,
+                         max_frame_size=max_frame_size, max_in_flight=max_in_flight, drain_timeout=drain_timeout,
+                         codec=codec)
+        self.__capacity = capacity
+        self.__poll_interval = poll_interval
+
+    async def open_channel(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> FrameChannel:
+        handshake = await reader.readline()
+        if handshake != HANDSHAKE:
+            raise FrameError("The connection didn't start with the handshake of shared memory.")
+        requests = SharedRing.create(self.__capacity)
+        responses = SharedRing.create(self.__capacity)
+        try:
+            writer.write(json.dumps({"requests": requests.name, "responses": responses.name}).encode("utf-8") + b"\n")
+            await writer.drain()
+        except BaseException:
+            requests.close()
+            responses.close()
+            raise
+        return RingChannel(outbound=responses, inbound=requests, reader=reader, writer=writer,
+                           max_frame_size=self.max_frame_size, poll_interval=self.__poll_interval)
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import stat
+from typing import Optional, Set, Union
+
+from plank import logger
+from plank.app import Application
+from plank.server import Server, BindAddress
+from plank.server.codec import Codec
+from plank.server.framing import FrameType, FrameError, FrameChannel, FrameStream, MAX_FRAME_SIZE, Buffer
+from plank.server.message.streaming import StreamingResponse
+from plank.server.route import with_params
+
+
+class UnixServer(Server):
+    """
+    Serves actions to the processes on the same host through a unix domain socket, e.g. for `unix://` connectors.
+    The host of the bind address is the path of socket.
+
+    A frame is a header of (payload length, request id, type) and a payload.
+    The requests of a connection are dispatched concurrently (at most `max_in_flight`),
+    and each response frame carries the id of its request, so they are answered as they complete.
+    The payloads are encoded by the `codec`, the same one as the connectors.
+    """
+
+    class Connection:
+        __slots__ = ("task", "in_flight")
+
+        def __init__(self, task: asyncio.Task):
+            self.task = task
+            self.in_flight = 0
+
+    @property
+    def codec(self) -> Codec:
+        return self.__codec
+
+    @property
+    def path(self) -> Optional[str]:
+        return None if self.bind_address is None else self.bind_address.host
+
+    def __init__(self, application: Application, delegate: Optional[Server.Delegate] = None,
+                 path_prefix: Optional[str] = None, max_frame_size: int = MAX_FRAME_SIZE, max_in_flight: int = 1024,
+                 drain_timeout: float = 30.0, codec: Union[str, Codec] = "binary"):
+        super().__init__(application=application, delegate=delegate, path_prefix=path_prefix)
+        self.__codec = Codec.named(codec)
+        self.__max_frame_size = max_frame_size
+        self.__max_in_flight = max_in_flight
+        self.__drain_timeout = drain_timeout
+        self.__server: Optional[asyncio.AbstractServer] = None
+        self.__connections: Set[UnixServer.Connection] = set()
+        self.__closing = False
+
+    def listen(self, address: BindAddress):
+        assert address.port is None, f"A unix server listens on a path, but the port {address.port} given."
+        super().listen(address=address)
+
+    async def start(self, **options):
+        path = self.path
+        assert path is not None, "The server should listen on a path before starting."
+        self.__closing = False
+        try:
+            if stat.S_ISSOCK(os.stat(path).st_mode):
+                # left by a previous process.
+                os.unlink(path)
+        except FileNotFoundError:
+            pass
+        self.__server = await asyncio.start_unix_server(self.__accept, path=path)
+        logger.info(f"unix server did start: {path}")
+        self.did_startup()
+
+    async def stop(self):
+        if self.__server is None:
+            return
+        self.__closing = True
+        self.__server.close()
+        for connection in list(self.__connections):
+            if connection.in_flight == 0:
+                connection.task.cancel()
+        tasks = [connection.task for connection in self.__connections]
+        if len(tasks) > 0:
+            _, pending = await asyncio.wait(tasks, timeout=self.__drain_timeout)
+            for task in pending:
+                task.cancel()
+        await self.__server.wait_closed()
+        self.__server = None
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+        logger.info("unix server did stop.")
+        self.did_shutdown()
+
+    @property
+    def max_frame_size(self) -> int:
+        return self.__max_frame_size
+
+    async def open_channel(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> FrameChannel:
+        """
+        The channel of frames for an accepted connection.
+        """
+        return FrameStream(reader=reader, writer=writer, max_frame_size=self.__max_frame_size)
+
+    async def __accept(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        connection = UnixServer.Connection(task=asyncio.current_task())
+        self.__connections.add(connection)
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(self.__max_in_flight)
+        dispatching: Set[asyncio.Task] = set()
+        channel: Optional[FrameChannel] = None
+        try:
+            channel = await self.open_channel(reader, writer)
+            while not self.__closing:
+                # waits for a free slot before receiving more, so a flooding client is pushed back.
+                await slots.acquire()
+                frame = await channel.receive()
+                if frame is None:
+                    slots.release()
+                    break
+                frame_type, request_id, payload = frame
+                if frame_type is not FrameType.REQUEST:
+                    channel.commit(payload)
+                    raise FrameError(f"A request frame is expected, but {frame_type.name} given.")
+                connection.in_flight += 1
+                task = loop.create_task(self.__dispatch(request_id, payload, channel))
+                dispatching.add(task)
+
+                def _done(task: asyncio.Task):
+                    dispatching.discard(task)
+                    connection.in_flight -= 1
+                    slots.release()
+                    if self.__closing and connection.in_flight == 0:
+                        connection.task.cancel()
+                    # the errors of actions were answered already, these are of answering, e.g. the client went away.
+                    error = None if task.cancelled() else task.exception()
+                    if error is not None and not isinstance(error, ConnectionError):
+                        logger.error(f"The error happened on answering a unix request: {error!r}")
+
+                task.add_done_callback(_done)
+        except (asyncio.CancelledError, ConnectionError):
+            pass
+        except FrameError as e:
+            logger.warn(f"unix connection closed by malformed frame: {e}")
+        finally:
+            if len(dispatching) > 0:
+                await asyncio.gather(*dispatching, return_exceptions=True)
+            self.__connections.discard(connection)
+            if channel is None:
+                writer.close()
+            else:
+                channel.close()
+
+    async def __dispatch(self, request_id: int, payload: Buffer, channel: FrameChannel):
+        try:
+            await self.__answer(request_id, payload, channel)
+        finally:
+            # the arguments decoded without copying refer to the payload until the request is answered.
+            channel.commit(payload)
+
+    async def __answer(self, request_id: int, payload: Buffer, channel: FrameChannel):
+        try:
+            path, request = self.__codec.loads_request(payload)
+            match = self.match_action(path)
+            if match is None:
+                raise LookupError(f"No action for {path}.")
+            request.arguments = with_params(request.arguments, match.params)
+            response = await match.action.receive(request)
+            if isinstance(response, StreamingResponse):
+                await self.__send_stream(request_id, response, channel)
+                return
+            frame_type, buffers = FrameType.RESPONSE, self.__codec.dumps_buffers(response.value)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            frame_type, buffers = FrameType.ERROR, [self.__codec.dumps_error(e)]
+        await channel.send(frame_type, request_id, buffers)
+
+    async def __send_stream(self, request_id: int, response: StreamingResponse, channel: FrameChannel):
+        try:
+            async for chunk in response:
+                await channel.send(FrameType.CHUNK, request_id, self.__codec.dumps_buffers(chunk))
+            frame_type, buffers = FrameType.END, []
+        except (asyncio.CancelledError, ConnectionError):
+            raise
+        except Exception as e:
+            frame_type, buffers = FrameType.ERROR, [self.__codec.dumps_error(e)]
+        finally:
+            await response.aclose()
+        await channel.send(frame_type, request_id, buffers)
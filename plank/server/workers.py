@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import gc
+import os
+import signal
+import socket
+import threading
+import time
+from typing import Dict, List, Optional
+
+from plank import logger
+from plank.app.executor import ExecutorManager
+from plank.app.runner import LoopRunner
+from plank.server.http import HTTPServer
+
+
+class WorkerSupervisor:
+    """
+    Pre-fork workers of an `HTTPServer`, e.g. `plank server run --workers 4`.
+    The application is launched and its plugins are loaded once in the parent, the forked workers share them
+    by copy-on-write and accept on the inherited listening socket, or on their own sockets with `reuse_port`.
+    A crashed worker is restarted with backoff, SIGTERM or SIGINT drains the workers gracefully.
+    """
+
+    class Worker:
+        __slots__ = ("index", "pid", "started_at")
+
+        def __init__(self, index: int, pid: int, started_at: float):
+            self.index = index
+            self.pid = pid
+            self.started_at = started_at
+
+    @property
+    def server(self) -> HTTPServer:
+        return self.__server
+
+    @property
+    def workers(self) -> int:
+        return self.__workers
+
+    @property
+    def restarts(self) -> int:
+        return self.__restarts
+
+    def __init__(self, server: HTTPServer, workers: int, reuse_port: bool = False, backlog: int = 1024,
+                 restart_delay: float = 0.5, max_restart_delay: float = 30.0, healthy_after: float = 10.0,
+                 drain_timeout: float = 30.0):
+        assert workers > 0, f"The number of workers should be positive, but {workers} given."
+        assert not reuse_port or hasattr(socket, "SO_REUSEPORT"), "SO_REUSEPORT is unsupported on this platform."
+        self.__server = server
+        self.__workers = workers
+        self.__reuse_port = reuse_port
+        self.__backlog = backlog
+        self.__restart_delay = restart_delay
+        self.__max_restart_delay = max_restart_delay
+        self.__healthy_after = healthy_after
+        self.__drain_timeout = drain_timeout
+        self.__running: Dict[int, WorkerSupervisor.Worker] = {}
+        # the delay before restarting a worker by index, doubled while it keeps crashing soon after start.
+        self.__delays: Dict[int, float] = {}
+        self.__restarts = 0
+        self.__stopping = threading.Event()
+
+    def bind(self) -> socket.socket:
+        address = self.__server.bind_address
+        assert address is not None, "The server should listen on an address before running workers."
+        family = socket.AF_INET6 if address.host and ":" in address.host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if self.__reuse_port:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind((address.host, address.port))
+        sock.listen(self.__backlog)
+        sock.setblocking(False)
+        return sock
+
+    def run(self):
+        # with `reuse_port` the workers bind their own sockets, a listening socket in the parent would be given
+        # a share of the connections by the kernel without ever accepting them.
+        sock = None if self.__reuse_port else self.bind()
+        previous_handlers = {
+            signum: signal.signal(signum, lambda signum, frame: self.__stopping.set())
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+        self.__stop_threads()
+        # the objects created so far are never collected in the workers, so their pages stay shared.
+        gc.freeze()
+        try:
+            for index in range(self.__workers):
+                self.__spawn(index, sock)
+            logger.info(f"workers did start: {', '.join(str(pid) for pid in self.__running.keys())}")
+            pending_restarts: Dict[int, float] = {}
+            while not self.__stopping.wait(0.2):
+                for worker in self.__reap():
+                    delay = self.__next_delay(worker)
+                    logger.warn(f"worker {worker.index} (pid {worker.pid}) exited, restarting in {delay:.1f} s.")
+                    pending_restarts[worker.index] = time.monotonic() + delay
+                now = time.monotonic()
+                for index, restart_at in list(pending_restarts.items()):
+                    if restart_at <= now:
+                        del pending_restarts[index]
+                        self.__spawn(index, sock)
+                        self.__restarts += 1
+        finally:
+            self.__stop_workers()
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+            if sock is not None:
+                sock.close()
+            gc.unfreeze()
+
+    def stop(self):
+        self.__stopping.set()
+
+    @staticmethod
+    def __stop_threads():
+        # the threads of the parent, e.g. the loops of runners and the pools of executors, don't survive the fork
+        # and might hold locks the workers need, so they're stopped before and started again in a worker on use.
+        LoopRunner.stop_all()
+        ExecutorManager.shutdown_all()
+        threads = [thread.name for thread in threading.enumerate() if thread is not threading.current_thread()]
+        if len(threads) > 0:
+            logger.warn(f"workers are forked while other threads are running: {', '.join(threads)}.")
+
+    def __spawn(self, index: int, sock: Optional[socket.socket]):
+        pid = os.fork()
+        if pid == 0:
+            self.__run_worker(sock)
+        self.__running[pid] = WorkerSupervisor.Worker(index=index, pid=pid, started_at=time.monotonic())
+
+    def __run_worker(self, sock: Optional[socket.socket]):
+        code = 0
+        try:
+            # the parent forwards SIGTERM on Ctrl-C, the worker drains on SIGTERM only.
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            if sock is None:
+                sock = self.bind()
+            self.__server.run(sock=sock)
+        except BaseException as e:
+            logger.error(f"worker {os.getpid()} failed: {e!r}")
+            code = 1
+        finally:
+            os._exit(code)
+
+    def __reap(self) -> List[WorkerSupervisor.Worker]:
+        exited = []
+        while len(self.__running) > 0:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            worker = self.__running.pop(pid, None)
+            if worker is not None:
+                exited.append(worker)
+        return exited
+
+    def __next_delay(self, worker: WorkerSupervisor.Worker) -> float:
+        if time.monotonic() - worker.started_at < self.__healthy_after:
+            delay = min(self.__delays.get(worker.index, self.__restart_delay / 2) * 2, self.__max_restart_delay)
+        else:
+            delay = self.__restart_delay
+        self.__delays[worker.index] = delay
+        return delay
+
+    def __stop_workers(self):
+        for pid in list(self.__running.keys()):
+            self.__signal(pid, signal.SIGTERM)
+        deadline = time.monotonic() + self.__drain_timeout + 5.0
+        while len(self.__running) > 0 and time.monotonic() < deadline:
+            self.__reap()
+            time.sleep(0.05)
+        for pid in list(self.__running.keys()):
+            logger.warn(f"worker pid {pid} didn't drain in time, killing it.")
+            self.__signal(pid, signal.SIGKILL)
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+            self.__running.pop(pid, None)
+        logger.info("workers did stop.")
+
+    @staticmethod
+    def __signal(pid: int, signum: int):
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+    def running(self) -> Dict[int, int]:
+        """
+        The indices of running workers by pid.
+        """
+        return {pid: worker.index for pid, worker in self.__running.items()}
@@ -1,14 +1,21 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, List, Optional
 
 if TYPE_CHECKING:
     from plank.serving.service import Service
+    from plank.plugin import Plugin
 
 
 class ServiceManagerable:
+    def _service_plugin(self) -> Optional[Plugin]:
+        """
+        The plugin which the services are registered by, None for the services registered without a plugin.
+        """
+        return None
+
     def add_service(self, service: Service):
         from plank.serving.service import Service
-        Service.register(service, name=service.name())
+        Service.register(service, name=service.name(), plugin=self._service_plugin())
 
     def add_services(self, *services: Service):
         for service in services:
@@ -16,8 +23,8 @@ class ServiceManagerable:
 
     def services(self) -> List[Service]:
         from plank.serving.service import Service
-        return Service.registered()
+        return Service.registered(plugin=self._service_plugin())
 
     def service(self, name: str) -> Service:
         from plank.serving.service import Service
-        return Service.from_name(name=name)
+        return Service.from_name(name=name, plugin=self._service_plugin())
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import threading
+from typing import Dict, Optional, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from plank.serving import Serving
+
+_ServiceRegistry__default_key = "__default"
+
+
+class ServiceRegistry:
+    """
+    Registered services bucketed by plugin name, with an index by service name.
+    The services registered without a plugin are in the bucket of `None`.
+    A name registered by several plugins is ambiguous without the plugin, `get` raises LookupError for it.
+    """
+
+    @classmethod
+    def default(cls) -> ServiceRegistry:
+        if not hasattr(cls, _ServiceRegistry__default_key):
+            setattr(cls, _ServiceRegistry__default_key, cls())
+        return getattr(cls, _ServiceRegistry__default_key)
+
+    def __init__(self):
+        self.__buckets: Dict[Optional[str], Dict[str, Serving]] = {}
+        self.__names: Dict[str, Dict[Optional[str], Serving]] = {}
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self.__buckets.values())
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.__names
+
+    def plugins(self) -> List[Optional[str]]:
+        return list(self.__buckets.keys())
+
+    def add(self, serving: Serving, name: str, plugin: Optional[str] = None):
+        with self.__lock:
+            self.__buckets.setdefault(plugin, {})[name] = serving
+            self.__names.setdefault(name, {})[plugin] = serving
+
+    def remove(self, name: str, plugin: Optional[str] = None) -> Serving:
+        with self.__lock:
+            bucket = self.__buckets[plugin]
+            serving = bucket.pop(name)
+            if len(bucket) == 0:
+                del self.__buckets[plugin]
+            self.__remove_name(name, plugin)
+            return serving
+
+    def remove_plugin(self, plugin: str) -> List[Serving]:
+        with self.__lock:
+            bucket = self.__buckets.pop(plugin, {})
+            for name in bucket.keys():
+                self.__remove_name(name, plugin)
+            return list(bucket.values())
+
+    def __remove_name(self, name: str, plugin: Optional[str]):
+        plugins = self.__names[name]
+        del plugins[plugin]
+        if len(plugins) == 0:
+            del self.__names[name]
+
+    def get(self, name: str, plugin: Optional[str] = None) -> Optional[Serving]:
+        if plugin is not None:
+            return self.__buckets.get(plugin, {}).get(name)
+        plugins = self.__names.get(name)
+        if plugins is None:
+            return None
+        # prefer the service registered without a plugin, otherwise the only plugin registering the name.
+        serving = plugins.get(None)
+        if serving is not None:
+            return serving
+        if len(plugins) > 1:
+            names = ", ".join(sorted(plugins.keys()))
+            raise LookupError(f"The service {name} is registered by the plugins {names}, please give the plugin.")
+        return next(iter(plugins.values()))
+
+    def services(self, plugin: Optional[str] = None) -> List[Serving]:
+        if plugin is not None:
+            return list(self.__buckets.get(plugin, {}).values())
+        return [serving for bucket in list(self.__buckets.values()) for serving in list(bucket.values())]
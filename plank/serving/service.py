@@ -1,44 +1,70 @@
 from __future__ import annotations
 
-import inspect
 from typing import List, Dict, Any, Optional, Union, TYPE_CHECKING, NoReturn
 
 from pydantic import BaseModel
 
 from plank.context import Context
 from plank.serving import Serving
+from plank.serving.registry import ServiceRegistry
 
 if TYPE_CHECKING:
     from plank.server.action.wrapper import WrapperAction
+    from plank.descriptor.action import ActionDescriptor
     from plank.plugin import Plugin
 
 
+def _plugin_name(plugin: Optional[Union[str, Plugin]]) -> Optional[str]:
+    if plugin is None or isinstance(plugin, str):
+        return plugin
+    return plugin.name
+
+
 class Service(Serving):
+    # The action descriptors of the class by attribute name, collected when the class is created.
+    __action_manifest__: Dict[str, ActionDescriptor] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        from plank.descriptor.action import ActionDescriptor
+        manifest = {}
+        for klass in reversed(cls.__mro__):
+            for name, member in vars(klass).items():
+                if isinstance(member, ActionDescriptor):
+                    manifest[name] = member
+                elif name in manifest:
+                    # overridden by a plain attribute in the subclass.
+                    del manifest[name]
+        cls.__action_manifest__ = manifest
+
+    @classmethod
+    def registry(cls) -> ServiceRegistry:
+        return ServiceRegistry.default()
+
     @classmethod
     def from_name(cls, name: str, plugin: Optional[Union[str, Plugin]] = None) -> Service:
-        context = Context.standard(namespace=Serving.__qualname__)
-        if plugin is not None:
-            plugin_name = plugin.name if isinstance(plugin, Plugin) else plugin
-            name = f"{plugin_name}.{name}"
-        return context.get(key=name)
+        """
+        Without the plugin, the service registered without a plugin is preferred, otherwise the only plugin's one.
+        Raises LookupError if several plugins registered the name.
+        """
+        return cls.registry().get(name=name, plugin=_plugin_name(plugin))
 
     @classmethod
     def register(cls, serving: Serving, name: Optional[str] = None,
                  plugin: Optional[Union[str, Plugin]] = None) -> NoReturn:
-        name = name or serving.name() or id(serving)
-        name = name if plugin is None else f"{plugin}.{name}"
-        context = Context.standard(namespace=Serving.__qualname__)
-        context.set(key=name, value=serving)
+        name = name or serving.name() or str(id(serving))
+        cls.registry().add(serving, name=name, plugin=_plugin_name(plugin))
+
+    @classmethod
+    def unregister(cls, name: str, plugin: Optional[Union[str, Plugin]] = None) -> Serving:
+        return cls.registry().remove(name=name, plugin=_plugin_name(plugin))
 
     @classmethod
     def registered(cls, plugin: Optional[Union[str, Plugin]] = None) -> List[Service]:
-        plugin = plugin or ""
-        context = Context.standard(namespace=Serving.__qualname__)
-        return [
-            service
-            for key, service in context.items()
-            if key.startswith(plugin)
-        ]
+        return cls.registry().services(plugin=_plugin_name(plugin))
+
+    def plugin(self) -> Optional[Plugin]:
+        return self.__plugin
 
     def in_plugin(self) -> Plugin:
         assert self.__plugin is not None, "The property of service should be set when did `add_service` to a plugin."
@@ -59,9 +85,20 @@ class Service(Serving):
         raise NotImplementedError()
 
     def get_actions(self) -> Dict[str, WrapperAction]:
-        from plank.server.action.wrapper import WrapperAction
-        member_items = inspect.getmembers(self, predicate=lambda member: isinstance(member, WrapperAction))
-        return dict(member_items)
+        return {
+            name: getattr(self, name)
+            for name in type(self).__action_manifest__.keys()
+        }
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        The state sent to a process pool, without the actions cached on the instance and the plugin,
+        so `plugin()` is None in the worker processes.
+        """
+        from plank.server.action import Action
+        state = {key: value for key, value in self.__dict__.items() if not isinstance(value, Action)}
+        state["_Service__plugin"] = None
+        return state
 
     def __did_add_to_plugin__(self, plugin: Plugin):
         self.__plugin = plugin
\ No newline at end of file
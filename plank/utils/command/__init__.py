@@ -1,3 +1,6 @@
+from pathlib import Path
+
+from plank.app import Application
 from plank.configuration import Configuration
 from plank.utils.command.base import *
 
@@ -27,22 +30,22 @@ class ServerRunCommand(BaseCommand):
         print("configuration.plugin.prefix:", configuration.plugin.prefix)
         app.launch(program=application_program, **options)
 
-        # server: FastAPIServer = FastAPIServer.build(name=configuration.app.name, version=configuration.app.version,
-        #                                             build_version=configuration.app.build_version,
-        #                                             delegate=AppDelegate(), workspace=workspace, path_prefix="irian")
-
-        # package_namespace, delegate_class_name = application_delegate.split(":")
-
-        # workspace_path = Path(application_workspace)
-        # module = importlib.import_module(package_namespace)
-        # delegate_type = getattr(module, delegate_class_name)
-
-        # app = Application.construct(name=application_name, version=application_version, delegate_type=delegate_type, workspace_path=workspace_path)
-        # app.launch(program=application_program, store_id="s002_001")
-        # print("app:", app)
-        # server = FastAPIServer(binding=BindAddress(host="0.0.0.0", port=8080), application=app,
-        #                        build_version="2022-07-25.000001",
-        #                        path_prefix="irian", swagger_secrets_username="awoo", swagger_secrets_password="iamai")
+        server_type = parameters["server_type"]
+        if server_type != "http":
+            raise click.ClickException(f"The {server_type} server is unavailable, please use `--server-type http`.")
+        from plank.server import BindAddress
+        from plank.server.http import HTTPServer
+        server = HTTPServer(application=app, path_prefix=parameters.get("path_prefix"))
+        server.listen(address=BindAddress(parameters["host"], parameters["port"]))
+        try:
+            if parameters["workers"] > 1:
+                from plank.server.workers import WorkerSupervisor
+                WorkerSupervisor(server=server, workers=parameters["workers"],
+                                 reuse_port=parameters["reuse_port"]).run()
+            else:
+                server.run()
+        finally:
+            app.unload()
 
     def __arguments__(self) -> List[click.Argument]:
         return [click.Argument(["launch_options"], nargs=-1, default=None)]
@@ -52,7 +55,12 @@ class ServerRunCommand(BaseCommand):
             click.Option(["-t", "--server-type"], default="http", type=click.Choice(["http", "grpc"]),
                          show_choices=True),
             click.Option(["-c", "--configuration"], required=True),
-            click.Option(["-p", "--program"], default="debug")
+            click.Option(["-p", "--program"], default="debug"),
+            click.Option(["--host"], default="0.0.0.0"),
+            click.Option(["--port"], default=8080, type=int),
+            click.Option(["--path-prefix"], default=None),
+            click.Option(["-w", "--workers"], default=1, type=int),
+            click.Option(["--reuse-port"], is_flag=True, default=False)
             # click.Option(["--instance-type"], default="application", type=click.Choice(["application", "plugin"]), show_choices=True)
         ]
 
@@ -66,6 +74,41 @@ class ServerRunCommand(BaseCommand):
 #         print("name:", name, ctx.parent, ctx.info_name, ctx.params, ctx.meta)
 #         return click.Command(name=name, callback=lambda *args, **kwargs: print("hello run:", args, kwargs))
 
+class PluginIndexCommand(BaseCommand):
+    def __invoke__(self, parameters: Dict[str, Any]) -> NoReturn:
+        from plank.plugin.module import ModulePlugin
+
+        configuration_path = Path(parameters["configuration"])
+        application_program: str = parameters.get("program", "debug")
+
+        Configuration.preload(path=configuration_path)
+        configuration = Configuration.from_program(program_name=application_program)
+        configuration.set_default()
+
+        index = ModulePlugin.index()
+        if index is None:
+            raise click.ClickException("The path of data folder is not configured, the plugin index is unavailable.")
+
+        for prefix in configuration.plugin.prefix:
+            if parameters["rebuild"]:
+                records = ModulePlugin.index_records(plugin_prefix=prefix, rebuild=True)
+            else:
+                records = index.records(prefix)
+                if index.is_stale(prefix):
+                    click.echo(f"[{prefix}] stale, it would be rebuilt on next launch or with --rebuild.")
+            click.echo(f"[{prefix}] {len(records)} plugin(s) in {index.path}")
+            for record in records:
+                click.echo(f"  {record.module_name}: name={record.name}, delegate={record.delegate}, "
+                           f"origin={record.origin}, fingerprint={record.fingerprint}")
+
+    def __options__(self) -> List[click.Option]:
+        return [
+            click.Option(["-c", "--configuration"], required=True),
+            click.Option(["-p", "--program"], default="debug"),
+            click.Option(["--rebuild"], is_flag=True, default=False)
+        ]
+
+
 class PolymathServerCommand(click.MultiCommand):
 
     def list_commands(self, ctx):
@@ -93,10 +136,20 @@ class PolymathConfigCommand(click.MultiCommand):
         return ProjectCreateCommand(name=name).make_command()
 
 
+class PolymathPluginCommand(click.MultiCommand):
+
+    def list_commands(self, ctx):
+        return ["index"]
+
+    def get_command(self, ctx: click.Context, name: str):
+        return PluginIndexCommand(name=name).make_command()
+
+
 root_cmd = click.Group()
 root_cmd.add_command(PolymathServerCommand(help=''), name="server")
 root_cmd.add_command(PolymathProjectCommand(help=''), name="project")
 root_cmd.add_command(PolymathConfigCommand(help=''), name="config")
+root_cmd.add_command(PolymathPluginCommand(help=''), name="plugin")
 
 # root_cmd.add_command( PolymathServerCommand(help=''), name="application")
 # root_cmd.add_command( PolymathServerCommand(help=''), name="plugin")
@@ -0,0 +1,107 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from plank.server.action.batching import BatchPolicy, Batcher
+from plank.server.action.binder import BindingError
+from plank.server.action.execution import ExecutionPolicy
+
+
+def batcher(end_point, max_size: int = 4, max_wait: float = 0.01) -> Batcher:
+    return Batcher(path="/batch", end_point=end_point, policy=BatchPolicy(max_size=max_size, max_wait=max_wait),
+                   execution=ExecutionPolicy.inline())
+
+
+def test_full_batch_flushed_at_once():
+    calls = []
+
+    def double(x: List[int]):
+        calls.append(list(x))
+        return [value * 2 for value in x]
+
+    async def main():
+        subject = batcher(double, max_size=3, max_wait=10)
+        return await asyncio.wait_for(
+            asyncio.gather(*(subject.submit((), {"x": value}) for value in range(6))), timeout=1)
+
+    assert asyncio.run(main()) == [0, 2, 4, 6, 8, 10]
+    assert calls == [[0, 1, 2], [3, 4, 5]]
+
+
+def test_partial_batch_flushed_after_max_wait():
+    calls = []
+
+    def total(x: List[int], y: List[int]):
+        calls.append((list(x), list(y)))
+        return [a + b for a, b in zip(x, y)]
+
+    async def main():
+        subject = batcher(total, max_size=8, max_wait=0.01)
+        return await asyncio.gather(subject.submit((), {"x": 1, "y": 2}), subject.submit((), {"x": 3, "y": 4}))
+
+    assert asyncio.run(main()) == [3, 7]
+    assert calls == [([1, 3], [2, 4])]
+
+
+def test_request_with_other_keys_fails_alone():
+    calls = []
+
+    def scale(x: List[int], factor: List[int] = 2):
+        calls.append((list(x), list(factor)))
+        return [a * b for a, b in zip(x, factor)]
+
+    async def main():
+        subject = batcher(scale, max_size=8, max_wait=0.01)
+        return await asyncio.gather(
+            subject.submit((), {"x": 1, "factor": 3}),
+            subject.submit((), {"x": 2}),
+            subject.submit((), {"x": 3, "unknown": 1}),
+            subject.submit((), {"factor": 3}),
+            return_exceptions=True)
+
+    first, defaulted, unknown, missing = asyncio.run(main())
+    assert (first, defaulted) == (3, 4)
+    assert isinstance(unknown, BindingError) and "unknown" in str(unknown)
+    assert isinstance(missing, BindingError) and "x" in str(missing)
+    assert calls == [([1, 2], [3, 2])]
+
+
+def test_request_not_fitting_var_keyword_batch_fails_alone():
+    def count(**kwargs):
+        return [len(kwargs)] * len(next(iter(kwargs.values())))
+
+    async def main():
+        subject = batcher(count, max_size=8, max_wait=0.01)
+        return await asyncio.gather(
+            subject.submit((), {"a": 1}), subject.submit((), {"b": 1}), subject.submit((), {"a": 2}),
+            return_exceptions=True)
+
+    first, other, third = asyncio.run(main())
+    assert (first, third) == (1, 1)
+    assert isinstance(other, BindingError)
+
+
+def test_errors_fail_whole_batch():
+    def broken(x: List[int]):
+        raise KeyError("broken")
+
+    def short(x: List[int]):
+        return x[:1]
+
+    async def main(end_point):
+        subject = batcher(end_point, max_size=2, max_wait=10)
+        return await asyncio.gather(subject.submit((), {"x": 1}), subject.submit((), {"x": 2}),
+                                    return_exceptions=True)
+
+    assert all(isinstance(result, KeyError) for result in asyncio.run(main(broken)))
+    assert all(isinstance(result, ValueError) for result in asyncio.run(main(short)))
+
+
+def test_batch_policy_from_action_args():
+    assert BatchPolicy.from_action_args({}) is None
+    assert BatchPolicy.from_action_args({"batch": 8}).max_size == 8
+    policy = BatchPolicy.from_action_args({"batch": {"max_size": 2, "max_wait": 0.5}})
+    assert (policy.max_size, policy.max_wait) == (2, 0.5)
+    with pytest.raises(AssertionError):
+        BatchPolicy(max_size=0)
@@ -0,0 +1,83 @@
+from typing import List
+
+import pytest
+from pydantic import BaseModel
+
+from plank.server.action.binder import ArgumentBinder, BindingError
+
+
+class Item(BaseModel):
+    name: str
+    count: int = 1
+
+
+def pair(a: int, b: int = 2):
+    return a, b
+
+
+def item(item: Item):
+    return item
+
+
+def single(value):
+    return value
+
+
+def items(items: List[Item]):
+    return items
+
+
+def variadic(a: int, *args, **kwargs):
+    return a
+
+
+def test_strategies():
+    assert ArgumentBinder.compile(pair).strategy is ArgumentBinder.Strategy.PARAMETERS
+    assert ArgumentBinder.compile(item).strategy is ArgumentBinder.Strategy.MODEL
+    assert ArgumentBinder.compile(single).strategy is ArgumentBinder.Strategy.KEYWORDS
+    # a batched end point is bound by the element types of its parameters.
+    assert ArgumentBinder.compile(items, batched=True).strategy is ArgumentBinder.Strategy.MODEL
+    assert ArgumentBinder.compile(items).strategy is ArgumentBinder.Strategy.KEYWORDS
+
+
+def test_none_mode_skips_parameters_with_defaults():
+    binder = ArgumentBinder.compile(pair)
+    assert binder.bind({"a": 1, "b": 3}) == ((), {"a": 1, "b": 3})
+    args, kwargs = binder.bind({"a": 1})
+    assert kwargs == {"a": 1}
+    assert pair(*args, **kwargs) == (1, 2)
+    with pytest.raises(BindingError, match="The argument a is missing."):
+        binder.bind({"b": 3})
+
+
+def test_none_mode_constructs_models():
+    binder = ArgumentBinder.compile(item)
+    (flat,), _ = binder.bind({"name": "x", "count": 3})
+    assert isinstance(flat, Item) and (flat.name, flat.count) == ("x", 3)
+    (nested,), _ = binder.bind({"item": {"name": "y"}})
+    assert nested.name == "y"
+    # not validated in the `none` mode.
+    (unchecked,), _ = binder.bind({"count": "many"})
+    assert unchecked.count == "many"
+    with pytest.raises(BindingError, match="unknown keys: other"):
+        binder.bind({"name": "x", "other": 1})
+
+
+def test_validate_mode():
+    binder = ArgumentBinder.compile(pair, mode=ArgumentBinder.Mode.VALIDATE)
+    assert binder.bind({"a": "1"}) == ((), {"a": 1, "b": 2})
+    with pytest.raises(BindingError):
+        binder.bind({"a": "x"})
+    with pytest.raises(BindingError, match="unknown keys: c"):
+        binder.bind({"a": 1, "c": 1})
+    model_binder = ArgumentBinder.compile(item, mode=ArgumentBinder.Mode.VALIDATE)
+    (model,), _ = model_binder.bind({"item": {"name": "x", "count": "2"}})
+    assert model.count == 2
+    with pytest.raises(BindingError):
+        model_binder.bind({"count": 2})
+
+
+def test_validate_mode_rejects_variadic_parameters():
+    with pytest.raises(TypeError):
+        ArgumentBinder.compile(variadic, mode=ArgumentBinder.Mode.VALIDATE)
+    assert ArgumentBinder.compile(variadic).mode is ArgumentBinder.Mode.NONE
@@ -0,0 +1,80 @@
+import asyncio
+
+from pydantic import BaseModel
+
+from plank.server.action import caching
+from plank.server.action.caching import CachePolicy, ResultCache, canonical, canonical_arguments
+from plank.server.action.wrapper import WrapperAction
+from plank.server.message import SlottedRequest
+
+
+class Point(BaseModel):
+    x: int
+    y: int
+
+
+def test_canonical_keys():
+    assert canonical({"a": 1, "b": [1, 2]}) == canonical({"b": [1, 2], "a": 1})
+    assert canonical(Point(x=1, y=2)) == canonical(Point(y=2, x=1))
+    assert canonical(1) != canonical(True)
+    assert canonical_arguments((object(),), {}) is None
+
+
+def test_lru_eviction():
+    cache = ResultCache(path="/lru", policy=CachePolicy(max_entries=2))
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == (True, 1)
+    cache.put("c", 3)
+    # "b" is the least recently used one.
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.get("c") == (True, 3)
+    assert len(cache) == 2
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(caching.time, "monotonic", lambda: now[0])
+    cache = ResultCache(path="/ttl", policy=CachePolicy(ttl=10))
+    cache.put("a", 1)
+    now[0] = 109.0
+    assert cache.get("a") == (True, 1)
+    now[0] = 110.0
+    assert cache.get("a") == (False, None)
+    assert len(cache) == 0
+
+
+def test_max_bytes():
+    value = "x" * 100
+    limit = caching._sizeof(value) * 2
+    cache = ResultCache(path="/bytes", policy=CachePolicy(max_bytes=limit))
+    cache.put("a", value)
+    cache.put("b", value)
+    assert cache.size <= limit
+    cache.put("c", value)
+    assert cache.get("a") == (False, None)
+    assert cache.size <= limit
+    # a value larger than the whole cache isn't stored.
+    cache.put("d", "x" * limit)
+    assert cache.get("d") == (False, None)
+    cache.clear()
+    assert cache.size == 0 and len(cache) == 0
+
+
+def test_action_result_cached():
+    calls = []
+
+    def square(x: int):
+        calls.append(x)
+        return x * x
+
+    action = WrapperAction(path="/square", end_point=square, cache=CachePolicy())
+
+    async def receive(x):
+        return (await action.receive(SlottedRequest(method="call", arguments={"x": x}))).value
+
+    assert asyncio.run(receive(3)) == 9
+    assert asyncio.run(receive(3)) == 9
+    assert asyncio.run(receive(4)) == 16
+    assert calls == [3, 4]
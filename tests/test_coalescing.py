@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from plank.server.action.coalescing import Coalescer
+
+
+def test_concurrent_calls_share_execution():
+    coalescer = Coalescer(path="/coalesce")
+    calls = []
+
+    def perform(x):
+        async def run():
+            calls.append(x)
+            await asyncio.sleep(0.01)
+            return x * 2
+        return run
+
+    async def main():
+        results = await asyncio.gather(*(coalescer.run(x % 2, perform(x % 2)) for x in range(6)))
+        assert coalescer.in_flight() == 0
+        return results
+
+    assert asyncio.run(main()) == [0, 2, 0, 2, 0, 2]
+    assert sorted(calls) == [0, 1]
+
+
+def test_exception_shared_and_not_kept():
+    coalescer = Coalescer(path="/coalesce-error")
+    calls = []
+
+    async def fail():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("bad")
+
+    async def main():
+        results = await asyncio.gather(*(coalescer.run("key", fail) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(result, ValueError) for result in results)
+        # the failed execution isn't reused by later calls.
+        with pytest.raises(ValueError):
+            await coalescer.run("key", fail)
+
+    asyncio.run(main())
+    assert len(calls) == 2
+
+
+def test_cancelled_caller_doesnt_cancel_others():
+    coalescer = Coalescer(path="/coalesce-cancel")
+
+    async def perform():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def main():
+        first = asyncio.ensure_future(coalescer.run("key", perform))
+        second = asyncio.ensure_future(coalescer.run("key", perform))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == "done"
+        assert first.cancelled()
+
+    asyncio.run(main())
@@ -0,0 +1,101 @@
+import datetime
+import enum
+from typing import List, Optional
+
+import pytest
+from pydantic import BaseModel
+
+from plank.server.codec import Codec, CodecError
+from plank.server.codec.binary import BinaryCodec, OUT_OF_LINE_SIZE
+from plank.server.message import SlottedRequest
+
+
+class Color(str, enum.Enum):
+    red = "red"
+
+
+class Item(BaseModel):
+    name: str
+    tags: List[str] = []
+    color: Optional[Color] = None
+    created: Optional[datetime.datetime] = None
+    child: Optional["Item"] = None
+
+
+Item.update_forward_refs()
+
+
+@pytest.mark.parametrize("value", [
+    None, True, False, 0, 127, 128, 255, 256, 65535, 65536, 2 ** 32, 2 ** 64 - 1,
+    -1, -32, -33, -128, -129, -2 ** 15 - 1, -2 ** 31 - 1, -2 ** 63,
+    0.5, -1e300, "", "a" * 31, "b" * 32, "c" * 255, "d" * 256, "é" * 40000,
+    b"", b"x" * 300, b"y" * 70000, list(range(20)), {str(i): i for i in range(20)}, [[1, [2, {"a": None}]]],
+    {1: "int key"}
+])
+def test_round_trip(value):
+    codec = Codec.named("binary")
+    assert codec.loads(codec.dumps(value)) == value
+
+
+def test_model_round_trip():
+    codec = BinaryCodec()
+    item = Item(name="a", tags=["x"], color=Color.red, created=datetime.datetime(2024, 1, 2, 3, 4, 5),
+                child=Item(name="b"))
+    decoded = codec.loads(codec.dumps({"item": item}))["item"]
+    assert decoded == item
+    assert isinstance(decoded.child, Item)
+    assert decoded.color is Color.red
+    assert isinstance(decoded.created, datetime.datetime)
+    # the field names aren't repeated in the payload.
+    assert len(codec.dumps(item)) < len(Codec.named("json").dumps(item))
+
+
+def test_unknown_model():
+    codec = BinaryCodec()
+    payload = bytes(codec.dumps(Item(name="a"))).replace(b":Item", b":Itex")
+    with pytest.raises(CodecError):
+        codec.loads(payload)
+
+
+def test_zero_copy_bytes():
+    payload = bytes(BinaryCodec().dumps({"data": b"q" * 1000}))
+    data = BinaryCodec(zero_copy=True).loads(payload)["data"]
+    assert isinstance(data, memoryview)
+    assert data.readonly
+    assert data.obj is payload
+    assert data == b"q" * 1000
+    assert isinstance(BinaryCodec().loads(payload)["data"], bytes)
+
+
+def test_dumps_buffers_refers_large_bytes():
+    codec = BinaryCodec()
+    data = b"z" * OUT_OF_LINE_SIZE
+    value = {"data": data, "item": Item(name="a")}
+    buffers = codec.dumps_buffers(value)
+    assert any(buffer is data for buffer in buffers)
+    joined = b"".join(bytes(buffer) for buffer in buffers)
+    assert joined == bytes(codec.dumps(value))
+    assert codec.loads(joined) == value
+
+
+@pytest.mark.parametrize("payload", [b"\x92\x01", b"\x01\x02", b"\xc1", b"\xa3ab", b"\xa2\xff\xfe"])
+def test_malformed_payload(payload):
+    with pytest.raises(CodecError):
+        BinaryCodec().loads(payload)
+
+
+def test_unencodable_values():
+    codec = BinaryCodec()
+    with pytest.raises(CodecError):
+        codec.dumps(object())
+    with pytest.raises(CodecError):
+        codec.dumps(2 ** 70)
+
+
+def test_request_and_error():
+    codec = BinaryCodec()
+    path, request = codec.loads_request(codec.dumps_request("/p", SlottedRequest(method="m", arguments={"a": 1})))
+    assert path == "/p"
+    assert (request.method, request.arguments) == ("m", {"a": 1})
+    error = codec.loads_error(codec.dumps_error(KeyError("k")))
+    assert error.type_name == "KeyError"
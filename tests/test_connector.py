@@ -0,0 +1,37 @@
+from plank.app import Application
+from plank.server import BindAddress
+from plank.server.action.wrapper import WrapperAction
+from plank.server.connector import Connector
+from plank.server.inline import InlineServer
+from plank.server.message import Request
+
+
+def inner(x: int):
+    return x + 1
+
+
+async def inner_async(x: int):
+    return x * 10
+
+
+def outer(x: int):
+    # a synchronous end point sending on the loop it runs on.
+    sent = Connector.connect("inline://nested/inner").send(Request(method="get", arguments={"x": x}))
+    awaited = Connector.connect("inline://nested/inner_async").send(Request(method="get", arguments={"x": x}))
+    many = Connector.connect("inline://nested/inner_async").send_many(
+        [Request(method="get", arguments={"x": i}) for i in range(3)])
+    return sent.value, awaited.value, [response.value for response in many]
+
+
+def test_nested_send_from_action():
+    app = Application(delegate=Application.Delegate(), configuration=None)
+    try:
+        server = InlineServer(application=app)
+        server.add_action(WrapperAction(path="/inner", end_point=inner))
+        server.add_action(WrapperAction(path="/inner_async", end_point=inner_async))
+        server.add_action(WrapperAction(path="/outer", end_point=outer))
+        server.listen(address=BindAddress("nested", None))
+        response = Connector.connect("inline://nested/outer").send(Request(method="get", arguments={"x": 4}))
+        assert response.value == (5, 40, [0, 10, 20])
+    finally:
+        app.runner.stop()
@@ -0,0 +1,51 @@
+import asyncio
+import weakref
+
+import pytest
+
+from plank.decorator.action import action
+from plank.server.action.binder import ArgumentBinder
+from plank.server.message import Request
+from plank.serving.service import Service
+
+
+class Greeter(Service):
+
+    @action("hello")
+    def hello(self, name: str):
+        return f"{self.name()}: hello {name}"
+
+    @action("later")
+    async def later(self, name: str):
+        return f"{self.name()}: later {name}"
+
+
+def receive(action, arguments):
+    return asyncio.run(action.receive(Request(method="get", arguments=arguments))).value
+
+
+def test_action_cached_on_instance():
+    greeter = Greeter(name="greeter")
+    assert greeter.hello is greeter.hello
+    assert greeter.hello.routing_path() == "/hello"
+    assert greeter.hello.binder.strategy is ArgumentBinder.Strategy.KEYWORDS
+    assert receive(greeter.hello, {"name": "a"}) == "greeter: hello a"
+    assert receive(greeter.later, {"name": "b"}) == "greeter: later b"
+
+
+def test_instance_released_without_collecting_cycles():
+    greeter = Greeter(name="greeter")
+    assert receive(greeter.hello, {"name": "a"}) == "greeter: hello a"
+    assert receive(greeter.later, {"name": "b"}) == "greeter: later b"
+    reference = weakref.ref(greeter)
+    del greeter
+    # released by reference counting, so the actions don't refer to the instance back.
+    assert reference() is None
+
+
+def test_action_outliving_instance_raises():
+    greeter = Greeter(name="greeter")
+    hello = greeter.hello
+    del greeter
+    with pytest.raises(ReferenceError):
+        receive(hello, {"name": "a"})
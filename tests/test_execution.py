@@ -0,0 +1,29 @@
+import os
+
+from plank.app import Application
+from plank.decorator.action import action
+from plank.server.message import SlottedRequest
+from plank.serving.service import Service
+
+
+class Calculator(Service):
+
+    @action("double", execution="process", executor="test-process", max_workers=1)
+    def double(self, x: int):
+        return os.getpid(), x * 2, self.serving_path()
+
+
+def test_service_action_runs_in_process_pool():
+    app = Application(delegate=Application.Delegate(), configuration=None)
+    try:
+        service = Calculator(name="calculator", serving_path="calculator")
+        action = service.double
+        for x in range(3):
+            response = app.runner.run_sync(action.receive(SlottedRequest(method="call", arguments={"x": x})))
+            pid, doubled, serving_path = response.value
+            assert pid != os.getpid()
+            assert doubled == x * 2
+            assert serving_path == "calculator"
+    finally:
+        app.executors.shutdown()
+        app.runner.stop()
@@ -0,0 +1,154 @@
+import json
+import socket
+from typing import List, Tuple
+
+import pytest
+
+from plank.app import Application
+from plank.server import BindAddress
+from plank.server.action.binder import ArgumentBinder
+from plank.server.action.wrapper import WrapperAction
+from plank.server.http import HTTPServer
+
+
+def add(a: int, b: int):
+    return a + b
+
+
+def echo(body: bytes):
+    return len(body)
+
+
+def count(n: int):
+    for i in range(int(n)):
+        yield {"i": i}
+
+
+def fail():
+    raise ValueError("the secret of server")
+
+
+@pytest.fixture(scope="module")
+def port():
+    app = Application(delegate=Application.Delegate(), configuration=None)
+    server = HTTPServer(application=app, max_header_size=1024, max_body_size=100)
+    server.add_action(WrapperAction(path="/add", end_point=add))
+    # the path parameters are strings, validated into the annotated types.
+    server.add_action(WrapperAction(path="/items/{a}/{b}", end_point=add, binding=ArgumentBinder.Mode.VALIDATE))
+    server.add_action(WrapperAction(path="/echo", end_point=echo))
+    server.add_action(WrapperAction(path="/count", end_point=count))
+    server.add_action(WrapperAction(path="/fail", end_point=fail))
+    server.listen(address=BindAddress("127.0.0.1", 0))
+    app.runner.run_sync(server.start())
+    try:
+        yield server.bound_address.port
+    finally:
+        app.runner.run_sync(server.stop())
+        app.runner.stop()
+
+
+def _exchange(port: int, data: bytes) -> bytes:
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+        sock.sendall(data)
+        received = b""
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                return received
+            received += chunk
+
+
+def _responses(data: bytes) -> List[Tuple[int, dict, bytes]]:
+    responses = []
+    while len(data) > 0:
+        head, data = data.split(b"\r\n\r\n", 1)
+        lines = head.decode("latin-1").split("\r\n")
+        status = int(lines[0].split(" ")[1])
+        headers = dict((name.lower(), value.strip()) for name, value in (line.split(":", 1) for line in lines[1:]))
+        if headers.get("transfer-encoding") == "chunked":
+            body = b""
+            while True:
+                size_line, data = data.split(b"\r\n", 1)
+                size = int(size_line, 16)
+                body, data = body + data[:size], data[size + 2:]
+                if size == 0:
+                    break
+        else:
+            length = int(headers["content-length"])
+            body, data = data[:length], data[length:]
+        responses.append((status, headers, body))
+    return responses
+
+
+def _post(path: str, value: dict, close: bool = False) -> bytes:
+    body = json.dumps(value).encode("utf-8")
+    connection = b"Connection: close\r\n" if close else b""
+    return b"POST %s HTTP/1.1\r\nHost: test\r\n%sContent-Length: %d\r\n\r\n%s" % (
+        path.encode("latin-1"), connection, len(body), body)
+
+
+def test_pipelined_requests_answered_in_order(port):
+    data = _post("/add", {"a": 1, "b": 2}) + b"GET /items/3/4 HTTP/1.1\r\n\r\n" + \
+        b"GET /missing HTTP/1.1\r\n\r\n" + _post("/add", {"a": 5, "b": 6}, close=True)
+    responses = _responses(_exchange(port, data))
+    assert [status for status, _, _ in responses] == [200, 200, 404, 200]
+    assert json.loads(responses[0][2]) == {"value": 3}
+    assert json.loads(responses[1][2]) == {"value": 7}
+    assert json.loads(responses[3][2]) == {"value": 11}
+    assert [headers["connection"] for _, headers, _ in responses] == ["keep-alive"] * 3 + ["close"]
+
+
+def test_http10_closes_without_keep_alive(port):
+    responses = _responses(_exchange(port, b"GET /items/1/2?b=5 HTTP/1.0\r\n\r\n"))
+    assert len(responses) == 1
+    assert responses[0][1]["connection"] == "close"
+    assert json.loads(responses[0][2]) == {"value": 3}
+
+
+def test_chunked_body(port):
+    data = b"POST /add HTTP/1.1\r\nTransfer-Encoding: chunked\r\nConnection: close\r\n\r\n" \
+           b"6\r\n{\"a\": \r\n9;ext=1\r\n2, \"b\": 3\r\n1\r\n}\r\n0\r\nX-Trailer: 1\r\n\r\n"
+    status, _, body = _responses(_exchange(port, data))[0]
+    assert status == 200
+    assert json.loads(body) == {"value": 5}
+
+
+def test_streaming_response(port):
+    status, headers, body = _responses(_exchange(port, b"GET /count?n=3 HTTP/1.1\r\nConnection: close\r\n\r\n"))[0]
+    assert status == 200
+    assert headers["transfer-encoding"] == "chunked"
+    assert [json.loads(line) for line in body.splitlines()] == [{"i": 0}, {"i": 1}, {"i": 2}]
+
+
+def test_non_json_body_passed_as_bytes(port):
+    data = b"POST /echo HTTP/1.1\r\nContent-Type: text/plain\r\nContent-Length: 5\r\nConnection: close\r\n\r\nhello"
+    assert json.loads(_responses(_exchange(port, data))[0][2]) == {"value": 5}
+
+
+@pytest.mark.parametrize("data, status", [
+    (b"POST /add HTTP/1.1\r\nContent-Length: 1000\r\n\r\n", 413),
+    (b"POST /add HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n80\r\n" + b"x" * 128 + b"\r\n0\r\n\r\n", 413),
+    (b"GET /add HTTP/1.1\r\nX-Large: " + b"x" * 2048 + b"\r\n\r\n", 431),
+    (b"POST /add HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n0\r\nX-Large: " + b"x" * 2048 + b"\r\n\r\n", 431),
+    (b"POST /add HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n2\r\n{}XX0\r\n\r\n", 400),
+    (b"POST /add HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\nzz\r\n", 400),
+    (b"POST /add HTTP/1.1\r\nTransfer-Encoding: gzip\r\n\r\n", 501),
+    (b"POST /add HTTP/1.1\r\nContent-Length: 3\r\nConnection: close\r\n\r\n[1]", 400),
+    (b"GET /add HTTP/2.0\r\n\r\n", 505),
+    (b"GARBAGE\r\n\r\n", 400),
+], ids=["body-too-large", "chunked-too-large", "header-too-large", "trailer-too-large", "chunk-without-crlf",
+        "malformed-chunk-size", "unsupported-encoding", "non-object-body", "unsupported-version", "malformed-line"])
+def test_malformed_requests(port, data, status):
+    responses = _responses(_exchange(port, data))
+    assert [response[0] for response in responses] == [status]
+
+
+def test_invalid_arguments(port):
+    status, _, _ = _responses(_exchange(port, _post("/add", {"a": 1}, close=True)))[0]
+    assert status == 400
+
+
+def test_internal_error_not_leaked(port):
+    status, _, body = _responses(_exchange(port, b"GET /fail HTTP/1.1\r\nConnection: close\r\n\r\n"))[0]
+    assert status == 500
+    assert json.loads(body) == {"error": "Internal Server Error"}
@@ -0,0 +1,109 @@
+import threading
+
+from plank.metrics import Metrics
+from plank.metrics.histogram import Histogram, bucket_index, bucket_bounds
+
+
+def test_bucket_bounds_contain_value():
+    for value in list(range(64)) + [100, 1000, 12345, 10 ** 9, 2 ** 40 + 7]:
+        lower, upper = bucket_bounds(bucket_index(value))
+        assert lower <= value <= upper
+        assert upper - lower <= max(1, value // 8)
+
+
+def test_histogram_percentiles():
+    histogram = Histogram()
+    for value in range(1, 1001):
+        histogram.record(value)
+    assert histogram.count == 1000
+    assert histogram.min == 1 and histogram.max == 1000
+    assert abs(histogram.percentile(50) - 500) <= 500 / 8
+    assert abs(histogram.percentile(99) - 990) <= 990 / 8
+    assert Histogram().percentile(50) is None
+
+
+def test_histogram_merge():
+    first, second = Histogram(), Histogram()
+    first.record(5)
+    second.record(500)
+    second.record(7)
+    merged = Histogram.merged([first, second])
+    assert merged.count == 3
+    assert merged.total == 512
+    assert (merged.min, merged.max) == (5, 500)
+    assert sum(count for _, count in merged.buckets()) == 3
+
+
+def test_shards_merged_across_threads():
+    metrics = Metrics()
+
+    def record():
+        for _ in range(1000):
+            metrics.end("/path", metrics.begin("/path"))
+        metrics.increase("hits", "/path", 2)
+        metrics.observe("size", "/path", 10)
+
+    threads = [threading.Thread(target=record) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    snapshot = metrics.snapshot()
+    stats = snapshot["actions"]["/path"]
+    assert stats["count"] == 4000
+    assert stats["in_flight"] == 0
+    assert stats["latency_ns"]["count"] == 4000
+    assert snapshot["counters"]["hits"]["/path"] == 8
+    assert snapshot["histograms"]["size"]["/path"]["count"] == 4
+
+
+def test_errors_and_in_flight():
+    metrics = Metrics()
+    metrics.end("/path", metrics.begin("/path"), error=True)
+    metrics.begin("/path")
+    stats = metrics.snapshot()["actions"]["/path"]
+    assert (stats["count"], stats["errors"], stats["in_flight"]) == (1, 1, 1)
+
+
+def test_detach_keeps_every_sample():
+    metrics = Metrics()
+    stop = threading.Event()
+    recorded = [0]
+
+    def record():
+        while not stop.is_set():
+            metrics.increase("samples", "/path")
+            recorded[0] += 1
+
+    thread = threading.Thread(target=record)
+    thread.start()
+    total = 0
+    for _ in range(50):
+        total += metrics.snapshot(metrics.detach())["counters"].get("samples", {}).get("/path", 0)
+    stop.set()
+    thread.join()
+    total += metrics.snapshot()["counters"].get("samples", {}).get("/path", 0)
+    assert total == recorded[0]
+
+
+def test_disabled_and_reset():
+    metrics = Metrics(enabled=False)
+    metrics.end("/path", metrics.begin("/path"))
+    assert metrics.snapshot()["actions"] == {}
+    metrics.enabled = True
+    metrics.increase("hits", "/path")
+    metrics.reset()
+    assert metrics.snapshot()["counters"] == {}
+
+
+def test_exposition():
+    metrics = Metrics()
+    metrics.end("/a", metrics.begin("/a"))
+    metrics.increase("action_cache_hits_total", "/a")
+    text = metrics.exposition()
+    assert '# TYPE plank_action_requests_total counter' in text
+    assert 'plank_action_requests_total{path="/a"} 1' in text
+    assert 'plank_action_latency_seconds_count{path="/a"} 1' in text
+    assert 'plank_action_latency_seconds_bucket{path="/a",le="+Inf"} 1' in text
+    assert 'plank_action_cache_hits_total{path="/a"} 1' in text
@@ -0,0 +1,102 @@
+import threading
+from typing import List
+
+import pytest
+
+from plank.app import Application
+from plank.configuration import Configuration
+from plank.plugin import Plugin
+
+events = []
+
+
+class StubPlugin(Plugin):
+    @classmethod
+    def discover(cls, plugin_prefix: str) -> List[Plugin]:
+        return [cls("c", ["b"]), cls("b", ["a"]), cls("a", []), cls("d", [])]
+
+    def __init__(self, name: str, dependencies: List[str]):
+        self.__name = name
+        self.__dependencies = dependencies
+        self.__delegate = Plugin.Delegate()
+
+    def _name(self) -> str:
+        return self.__name
+
+    def _dependencies(self) -> List[str]:
+        return self.__dependencies
+
+    def _delegate(self) -> Plugin.Delegate:
+        return self.__delegate
+
+    def did_install(self):
+        events.append(("install", self.name, threading.current_thread().name))
+
+    def preload(self):
+        events.append(("preload", self.name, threading.current_thread().name))
+
+    def load(self):
+        events.append(("load", self.name, threading.current_thread().name))
+
+
+class StubDelegate(Application.Delegate):
+    def __init__(self, skipped: List[str]):
+        self.skipped = skipped
+
+    def application_using_plugin_type(self, app, prefix):
+        return StubPlugin
+
+    def application_should_install_plugin(self, app, plugin) -> bool:
+        events.append(("should_install", plugin.name, threading.current_thread().name))
+        return plugin.name not in self.skipped
+
+    def application_did_load_plugin(self, app, plugin):
+        events.append(("did_load", plugin.name, threading.current_thread().name))
+
+
+def _boot(tmp_path, skipped: List[str]) -> Application:
+    events.clear()
+    configuration = Configuration.build(name="test", config_dict={
+        "app": {"app.name": "test", "app.version": "0", "app.build_version": "0", "app.debug": True},
+        "path": {"path.workspace": str(tmp_path), "path.data": "${path.workspace}/data",
+                 "path.plugin": "${path.data}/${PLUGIN}"},
+        "plugin": {"plugin.prefix": "tboot_"},
+        "logger": {}, "extra": {}, "service": {},
+    })
+    app = Application(delegate=StubDelegate(skipped), configuration=configuration, plugin_workers=2)
+    try:
+        app._load_plugin()
+    finally:
+        app.runner.stop()
+    return app
+
+
+def test_sort_by_dependencies():
+    plugins = StubPlugin.discover("tboot_")
+    assert [plugin.name for plugin in Plugin.sort_by_dependencies(plugins)] == ["a", "b", "c", "d"]
+    with pytest.raises(ValueError):
+        Plugin.sort_by_dependencies([StubPlugin("x", ["y"]), StubPlugin("y", ["x"])])
+    with pytest.raises(KeyError):
+        Plugin.sort_by_dependencies([StubPlugin("x", ["missing"])])
+
+
+def test_hooks_run_on_calling_thread(tmp_path):
+    app = _boot(tmp_path, skipped=[])
+    assert [plugin.name for plugin in app.plugins] == ["a", "b", "c", "d"]
+    calling_thread = threading.current_thread().name
+    for event, _, thread_name in events:
+        if event == "preload":
+            assert thread_name.startswith("plank-plugin")
+        else:
+            assert thread_name == calling_thread
+    loads = [name for event, name, _ in events if event == "load"]
+    assert loads == ["a", "b", "c", "d"]
+    assert set(app.plugin_timings.keys()) == {"a", "b", "c", "d"}
+
+
+def test_dependents_of_skipped_plugin_skipped(tmp_path):
+    app = _boot(tmp_path, skipped=["a"])
+    assert [plugin.name for plugin in app.plugins] == ["d"]
+    asked = [name for event, name, _ in events if event == "should_install"]
+    assert asked == ["a", "d"]
+    assert [name for event, name, _ in events if event == "load"] == ["d"]
@@ -0,0 +1,81 @@
+import os
+import sys
+
+from plank.plugin.index import PluginIndex
+
+
+def _discover(index, search_dir, scans, reads):
+    def scan():
+        scans.append(1)
+        return {
+            name[:-3]: str(search_dir / name)
+            for name in sorted(os.listdir(search_dir)) if name.startswith("demo_") and name.endswith(".py")
+        }
+
+    def read(path):
+        reads.append(path.name)
+        return {"name": path.stem, "delegate": "Delegate"}
+
+    return index.discover("demo_", scan=scan, read=read)
+
+
+def test_index_reused_until_sources_change(tmp_path, monkeypatch):
+    search_dir = tmp_path / "search"
+    search_dir.mkdir()
+    monkeypatch.setattr(sys, "path", [str(search_dir)])
+    (search_dir / "demo_a.py").write_text("__plugin__ = {}\n")
+    index_path = tmp_path / "data" / "index.json"
+
+    scans, reads = [], []
+    index = PluginIndex(index_path)
+    records = _discover(index, search_dir, scans, reads)
+    assert [record.name for record in records] == ["demo_a"]
+    assert (len(scans), reads) == (1, ["demo_a.py"])
+    index.save()
+    assert not index.is_dirty
+
+    scans, reads = [], []
+    index = PluginIndex(index_path)
+    assert not index.is_stale("demo_")
+    assert [record.delegate for record in _discover(index, search_dir, scans, reads)] == ["Delegate"]
+    assert (scans, reads, index.is_dirty) == ([], [], False)
+
+    # a changed source is read again without scanning.
+    (search_dir / "demo_a.py").write_text("__plugin__ = {'name': 'a'}\n")
+    _discover(index, search_dir, scans, reads)
+    assert (scans, reads) == ([], ["demo_a.py"])
+
+    # a new module changes the fingerprint of its search path.
+    scans, reads = [], []
+    os.utime(search_dir, ns=(0, 0))
+    (search_dir / "demo_b.py").write_text("__plugin__ = {}\n")
+    records = _discover(index, search_dir, scans, reads)
+    assert [record.module_name for record in records] == ["demo_a", "demo_b"]
+    assert (len(scans), reads) == (1, ["demo_b.py"])
+
+
+def test_search_paths_compared_normalized(tmp_path, monkeypatch):
+    search_dir = tmp_path / "search"
+    search_dir.mkdir()
+    monkeypatch.chdir(search_dir)
+    monkeypatch.setattr(sys, "path", [str(search_dir)])
+    index = PluginIndex(tmp_path / "index.json")
+    _discover(index, search_dir, [], [])
+    # the working directory, given as `''`, and duplicates are the same search paths.
+    monkeypatch.setattr(sys, "path", ["", str(search_dir)])
+    assert not index.is_stale("demo_")
+    monkeypatch.setattr(sys, "path", [str(search_dir), str(tmp_path)])
+    assert index.is_stale("demo_")
+
+
+def test_unreadable_index_rebuilt(tmp_path, monkeypatch):
+    search_dir = tmp_path / "search"
+    search_dir.mkdir()
+    monkeypatch.setattr(sys, "path", [str(search_dir)])
+    index_path = tmp_path / "index.json"
+    index_path.write_text("{not json")
+    index = PluginIndex(index_path)
+    assert index.is_stale("demo_")
+    scans = []
+    _discover(index, search_dir, scans, [])
+    assert len(scans) == 1
@@ -0,0 +1,75 @@
+import sys
+import textwrap
+
+import pytest
+
+from plank.configuration import Configuration
+from plank.plugin.module import ModulePlugin
+
+
+@pytest.fixture
+def plugin_path(tmp_path, monkeypatch):
+    search_dir = tmp_path / "search"
+    package_dir = search_dir / "tplug_lazy"
+    package_dir.mkdir(parents=True)
+    (package_dir / "__init__.py").write_text('__plugin__ = {"name": "lazy", "delegate": "hooks_tplug:Delegate"}\n')
+    (search_dir / "hooks_tplug.py").write_text(textwrap.dedent("""
+        from plank.plugin import Plugin
+
+        hooks = []
+
+
+        class Delegate(Plugin.Delegate):
+            def plugin_did_discover(self, plugin):
+                hooks.append("plugin_did_discover")
+
+            def plugin_did_install(self, plugin):
+                hooks.append("plugin_did_install")
+
+            def application_did_launch(self, plugin, launch_options):
+                hooks.append("application_did_launch")
+    """))
+    monkeypatch.syspath_prepend(str(search_dir))
+    configuration = Configuration.build(name="test", config_dict={
+        "app": {"app.name": "test", "app.version": "0", "app.build_version": "0", "app.debug": True},
+        "path": {"path.workspace": str(tmp_path / "workspace"), "path.data": "${path.workspace}/data",
+                 "path.plugin": "${path.data}/${PLUGIN}"},
+        "plugin": {"plugin.prefix": "tplug_"},
+        "logger": {}, "extra": {}, "service": {},
+    })
+    configuration.set_default()
+    yield search_dir
+    for module_name in ["tplug_lazy", "hooks_tplug"]:
+        sys.modules.pop(module_name, None)
+
+
+def test_read_plugin_info(tmp_path):
+    literal = tmp_path / "literal.py"
+    literal.write_text('import os\n__plugin__: dict = {"name": "a", "dependencies": ["b"]}\n')
+    assert ModulePlugin.read_plugin_info(literal) == {"name": "a", "dependencies": ["b"]}
+    computed = tmp_path / "computed.py"
+    computed.write_text('__plugin__ = dict(name="a")\n')
+    assert ModulePlugin.read_plugin_info(computed) is None
+    broken = tmp_path / "broken.py"
+    broken.write_text("__plugin__ = {\n")
+    assert ModulePlugin.read_plugin_info(broken) is None
+
+
+def test_discover_without_importing_plugin(plugin_path):
+    plugins = [plugin for plugin in ModulePlugin.discover(plugin_prefix="tplug_") if plugin.name == "lazy"]
+    assert len(plugins) == 1
+    plugin = plugins[0]
+    hooks = sys.modules["hooks_tplug"].hooks
+    # the delegate is imported by the first hook, but the plugin module isn't.
+    assert hooks == ["plugin_did_discover"]
+    assert not plugin.is_imported
+    assert "tplug_lazy" not in sys.modules
+
+    plugin.did_install()
+    plugin.notify("application_did_launch", launch_options={})
+    assert hooks == ["plugin_did_discover", "plugin_did_install", "application_did_launch"]
+    assert not plugin.is_imported
+
+    plugin.load()
+    assert plugin.is_imported
+    assert plugin.module is sys.modules["tplug_lazy"]
@@ -0,0 +1,89 @@
+from typing import List
+
+import pytest
+
+from plank.plugin import Plugin
+from plank.serving.interface import ServiceManagerable
+from plank.serving.registry import ServiceRegistry
+from plank.serving.service import Service
+
+
+class NamedPlugin(Plugin):
+    def __init__(self, name: str):
+        self.__name = name
+
+    def _name(self) -> str:
+        return self.__name
+
+    def _delegate(self) -> Plugin.Delegate:
+        return Plugin.Delegate()
+
+    def _dependencies(self) -> List[str]:
+        return []
+
+
+def test_buckets_and_name_index():
+    registry = ServiceRegistry()
+    registry.add("a", name="echo", plugin="p1")
+    registry.add("b", name="echo", plugin="p10")
+    registry.add("c", name="other", plugin="p1")
+    assert registry.get("echo", plugin="p1") == "a"
+    assert registry.get("echo", plugin="p10") == "b"
+    assert registry.get("echo", plugin="p2") is None
+    # the plugins sharing a prefix aren't mixed up.
+    assert sorted(registry.services(plugin="p1")) == ["a", "c"]
+    assert registry.services(plugin="p10") == ["b"]
+    assert sorted(registry.services()) == ["a", "b", "c"]
+    assert len(registry) == 3
+    assert "echo" in registry and "missing" not in registry
+
+
+def test_ambiguous_name():
+    registry = ServiceRegistry()
+    registry.add("a", name="echo", plugin="p1")
+    assert registry.get("echo") == "a"
+    registry.add("b", name="echo", plugin="p2")
+    with pytest.raises(LookupError):
+        registry.get("echo")
+    # the service registered without a plugin is preferred.
+    registry.add("c", name="echo")
+    assert registry.get("echo") == "c"
+    assert registry.get("missing") is None
+
+
+def test_remove_and_remove_plugin():
+    registry = ServiceRegistry()
+    registry.add("a", name="echo", plugin="p1")
+    registry.add("b", name="other", plugin="p1")
+    registry.add("c", name="echo", plugin="p2")
+    assert registry.remove("echo", plugin="p2") == "c"
+    assert registry.get("echo") == "a"
+    assert sorted(registry.remove_plugin("p1")) == ["a", "b"]
+    assert len(registry) == 0
+    assert registry.plugins() == []
+    assert "echo" not in registry
+    with pytest.raises(KeyError):
+        registry.remove("echo", plugin="p1")
+
+
+def test_add_service_paths():
+    plugin = NamedPlugin("registry-test-plugin")
+    owner = ServiceManagerable()
+    plugged = Service(name="registry-test-plugged")
+    unplugged = Service(name="registry-test-unplugged")
+    try:
+        plugin.add_service(plugged)
+        owner.add_service(unplugged)
+        assert plugged.in_plugin() is plugin
+        assert plugin.services() == [plugged]
+        assert plugin.service("registry-test-plugged") is plugged
+        assert plugin.service("registry-test-unplugged") is None
+        # the services of every plugin without a plugin given.
+        services = owner.services()
+        assert plugged in services and unplugged in services
+        assert owner.service("registry-test-plugged") is plugged
+        assert Service.from_name("registry-test-unplugged") is unplugged
+        assert Service.registered(plugin="registry-test-plugin") == [plugged]
+    finally:
+        Service.registry().remove_plugin("registry-test-plugin")
+        Service.unregister("registry-test-unplugged")
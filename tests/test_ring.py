@@ -0,0 +1,118 @@
+import asyncio
+import socket
+
+import pytest
+
+from plank.server.framing import FrameType
+from plank.server.ring import SharedRing, RingChannel, RECORD
+
+
+@pytest.fixture
+def ring():
+    ring = SharedRing.create(capacity=256)
+    try:
+        yield ring
+    finally:
+        ring.close()
+
+
+def write(ring: SharedRing, request_id: int, payload: bytes) -> bool:
+    return ring.try_write(FrameType.REQUEST, request_id, 0, [memoryview(payload)], len(payload))
+
+
+def read(ring: SharedRing):
+    frame_type, request_id, flags, view, end = ring.read()
+    payload = bytes(view)
+    view.release()
+    return request_id, payload, end
+
+
+def test_records_wrap_around_end_of_ring(ring):
+    # records of 48 bytes leave 16 bytes at the end of ring, skipped by a wrap record.
+    size = 48 - RECORD.size
+    for request_id in range(12):
+        assert write(ring, request_id, bytes([request_id]) * size)
+        got, payload, end = read(ring)
+        assert got == request_id
+        assert payload == bytes([request_id]) * size
+        ring.release(end)
+        assert ring.read() is None
+    assert ring.used == 0
+
+
+def test_full_ring_refuses_write(ring):
+    size = 64 - RECORD.size
+    for request_id in range(4):
+        assert write(ring, request_id, b"x" * size)
+    assert not write(ring, 4, b"x")
+    _, _, end = read(ring)
+    ring.release(end)
+    assert write(ring, 4, b"x" * size)
+
+
+def test_tail_moves_after_earlier_records_released(ring):
+    for request_id in range(3):
+        assert write(ring, request_id, b"abc")
+    ends = [read(ring)[2] for _ in range(3)]
+    assert ring.read() is None
+    used = ring.used
+    ring.release(ends[1])
+    ring.release(ends[2])
+    assert ring.used == used
+    ring.release(ends[0])
+    assert ring.used == 0
+
+
+async def channels(capacity: int):
+    a, b = socket.socketpair()
+    reader_a, writer_a = await asyncio.open_unix_connection(sock=a)
+    reader_b, writer_b = await asyncio.open_unix_connection(sock=b)
+    requests, responses = SharedRing.create(capacity), SharedRing.create(capacity)
+    # the receiving side attaches its own views, as another process would.
+    sender = RingChannel(outbound=requests, inbound=responses, reader=reader_a, writer=writer_a)
+    receiver = RingChannel(outbound=SharedRing.attach(responses.name), inbound=SharedRing.attach(requests.name),
+                           reader=reader_b, writer=writer_b)
+    return sender, receiver
+
+
+def test_channel_payload_is_view_until_commit():
+    async def main():
+        sender, receiver = await channels(capacity=4096)
+        try:
+            await sender.send(FrameType.REQUEST, 1, [b"hello"])
+            frame_type, request_id, payload = await receiver.receive()
+            assert (frame_type, request_id) == (FrameType.REQUEST, 1)
+            assert isinstance(payload, memoryview)
+            assert bytes(payload) == b"hello"
+            assert sender.outbound.used > 0
+            receiver.commit(payload)
+            assert sender.outbound.used == 0
+            with pytest.raises(ValueError):
+                bytes(payload)
+        finally:
+            receiver.close()
+            sender.close()
+
+    asyncio.run(main())
+
+
+def test_channel_fragmented_frame_wraps_ring():
+    async def main():
+        sender, receiver = await channels(capacity=4096)
+        try:
+            big = bytes(range(256)) * 80
+            received = asyncio.ensure_future(receiver.receive())
+            await sender.send(FrameType.REQUEST, 1, [big[:100], big[100:]])
+            await sender.send(FrameType.REQUEST, 2, [b"after"])
+            frame_type, request_id, payload = await received
+            assert request_id == 1
+            assert bytes(payload) == big
+            receiver.commit(payload)
+            _, request_id, payload = await receiver.receive()
+            assert (request_id, bytes(payload)) == (2, b"after")
+            receiver.commit(payload)
+        finally:
+            receiver.close()
+            sender.close()
+
+    asyncio.run(main())
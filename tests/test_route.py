@@ -0,0 +1,67 @@
+import pytest
+
+from plank.server.route import RouteTable, with_params
+
+
+def test_static_route_matches_normalized_path():
+    table = RouteTable()
+    table.add("users/list/", "list")
+    match = table.match("/users/list")
+    assert match.action == "list"
+    assert match.params == {}
+    assert table.get("users/list") == "list"
+    assert table.get("/users") is None
+
+
+def test_param_route_matches_segments():
+    table = RouteTable()
+    table.add("/users/{id}", "user")
+    table.add("/users/{id}/posts/{post}", "post")
+    table.add("/users/me", "me")
+    assert table.match("/users/42").params == {"id": "42"}
+    assert table.match("/users/42/posts/7").params == {"id": "42", "post": "7"}
+    assert table.match("/users/42/posts/7").template == "/users/{id}/posts/{post}"
+    # the static segment is preferred to the parameter.
+    assert table.match("/users/me").action == "me"
+    assert table.match("/users/42/posts") is None
+    assert len(table) == 3
+
+
+def test_static_child_falls_back_to_param():
+    table = RouteTable()
+    table.add("/files/{name}/raw", "raw")
+    table.add("/files/readme/meta", "meta")
+    assert table.match("/files/readme/raw").params == {"name": "readme"}
+
+
+def test_conflicting_param_names():
+    table = RouteTable()
+    table.add("/users/{id}", "user")
+    with pytest.raises(ValueError):
+        table.add("/users/{name}/posts", "posts")
+
+
+def test_remove_prunes_empty_branches():
+    table = RouteTable()
+    table.add("/users/{id}/posts", "posts")
+    table.add("/users/{id}/likes", "likes")
+    assert table.remove("/users/{id}/posts") == "posts"
+    assert table.match("/users/1/posts") is None
+    assert table.match("/users/1/likes").action == "likes"
+    table.remove("/users/{id}/likes")
+    assert len(table) == 0
+    # the pruned parameter doesn't conflict anymore.
+    table.add("/users/{name}", "user")
+    assert table.match("/users/bob").params == {"name": "bob"}
+
+
+def test_remove_unknown_route():
+    table = RouteTable()
+    with pytest.raises(KeyError):
+        table.remove("/missing/{id}")
+
+
+def test_path_params_override_arguments():
+    assert with_params({"id": "1", "x": 2}, {"id": "7"}) == {"id": "7", "x": 2}
+    arguments = {"x": 1}
+    assert with_params(arguments, {}) is arguments
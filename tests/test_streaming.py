@@ -0,0 +1,76 @@
+import asyncio
+import time
+
+import pytest
+
+from plank.metrics import Metrics
+from plank.plugin import Plugin
+from plank.server.action.wrapper import WrapperAction
+from plank.server.message import Request
+from plank.server.message.streaming import StreamingResponse
+
+# stands for a plugin, only compared by identity.
+plugin = object()
+
+
+def slow_chunks(n: int):
+    for index in range(n):
+        time.sleep(0.02)
+        yield index, Plugin.current() is plugin
+
+
+async def failing_chunks():
+    yield 1
+    raise KeyError("failed")
+
+
+def stats(path: str):
+    return Metrics.default().merged().actions[path]
+
+
+def test_stream_measured_until_consumed_and_produced_in_plugin():
+    action = WrapperAction(path="/stream/slow", end_point=slow_chunks, plugin_provider=lambda: plugin)
+
+    async def main():
+        response = await action.receive(Request(method="get", arguments={"n": 3}))
+        assert isinstance(response, StreamingResponse)
+        assert stats("/stream/slow").in_flight == 1
+        try:
+            return [chunk async for chunk in response]
+        finally:
+            await response.aclose()
+
+    assert asyncio.run(main()) == [(0, True), (1, True), (2, True)]
+    measured = stats("/stream/slow")
+    assert (measured.count, measured.errors, measured.in_flight) == (1, 0, 0)
+    assert measured.latency.min >= 0.06 * 1e9
+
+
+def test_failed_stream_measured_as_error():
+    action = WrapperAction(path="/stream/failing", end_point=failing_chunks)
+
+    async def main():
+        response = await action.receive(Request(method="get", arguments={}))
+        try:
+            with pytest.raises(KeyError):
+                async for _ in response:
+                    pass
+        finally:
+            await response.aclose()
+
+    asyncio.run(main())
+    measured = stats("/stream/failing")
+    assert (measured.count, measured.errors, measured.in_flight) == (1, 1, 0)
+
+
+def test_stream_closed_before_iteration_measured_once():
+    action = WrapperAction(path="/stream/closed", end_point=slow_chunks)
+
+    async def main():
+        response = await action.receive(Request(method="get", arguments={"n": 3}))
+        await response.aclose()
+        await response.aclose()
+
+    asyncio.run(main())
+    measured = stats("/stream/closed")
+    assert (measured.count, measured.errors, measured.in_flight) == (1, 0, 0)
@@ -0,0 +1,86 @@
+import json
+import os
+import socket
+import threading
+import time
+import urllib.request
+
+from plank.app import Application
+from plank.app.executor import ExecutorManager
+from plank.app.runner import LoopRunner
+from plank.server import BindAddress
+from plank.server.action.wrapper import WrapperAction
+from plank.server.http import HTTPServer
+from plank.server.workers import WorkerSupervisor
+
+
+def pid():
+    return os.getpid()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_stop_all_restarts_on_use():
+    runner = LoopRunner(name="test-stop-all")
+    executors = ExecutorManager()
+    try:
+        executors.get(ExecutorManager.THREAD, "test-stop-all").submit(lambda: None).result()
+        assert runner.run_sync(_answer()) == 42
+        LoopRunner.stop_all()
+        ExecutorManager.shutdown_all()
+        assert not runner.is_started
+        assert executors.executors() == {}
+        assert runner.run_sync(_answer()) == 42
+        assert runner.loops_created == 2
+    finally:
+        runner.stop()
+        executors.shutdown()
+
+
+async def _answer():
+    return 42
+
+
+def test_workers_forked_without_runner_threads():
+    app = Application(delegate=Application.Delegate(), configuration=None)
+    app.runner.start()
+    port = _free_port()
+    server = HTTPServer(application=app)
+    server.add_action(WrapperAction(path="/pid", end_point=pid))
+    server.listen(address=BindAddress("127.0.0.1", port))
+    supervisor = WorkerSupervisor(server=server, workers=2, drain_timeout=5.0)
+    results = {}
+
+    def client():
+        try:
+            deadline = time.monotonic() + 10.0
+            while len(supervisor.running()) < 2 and time.monotonic() < deadline:
+                time.sleep(0.05)
+            results["runner_started"] = app.runner.is_started
+            pids = set()
+            while len(pids) < 1 and time.monotonic() < deadline:
+                try:
+                    with urllib.request.urlopen(f"http://127.0.0.1:{port}/pid", timeout=5) as response:
+                        pids.add(json.loads(response.read())["value"])
+                except OSError:
+                    time.sleep(0.05)
+            results["pids"] = pids
+        finally:
+            supervisor.stop()
+
+    thread = threading.Thread(target=client)
+    thread.start()
+    try:
+        supervisor.run()
+    finally:
+        thread.join()
+        app.runner.stop()
+
+    assert results["runner_started"] is False
+    assert len(results["pids"]) == 1
+    assert os.getpid() not in results["pids"]
+    assert supervisor.running() == {}